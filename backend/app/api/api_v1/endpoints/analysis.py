@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
+from fastapi.responses import StreamingResponse
 from typing import Optional, List, Dict, Any
 import os
 import sys
 import json
 import uuid
+import asyncio
+import threading
 from datetime import datetime
 
 # Add the project root to path
@@ -14,6 +17,11 @@ from vulgate_analyzer import VulgateAnalyzer, VerseAnalysisResult
 from backend.app.models import AnalysisHistory, EditSession, FieldEdit, AnalysisQueue
 from sqlalchemy.orm import Session
 from backend.app.api.deps import get_db
+from backend.app.core.config import settings
+from backend.app.schemas.macronize import MacronizeStreamRequest
+from backend.app.services.latin_macronizer import LatinMacronizer, make_cache
+from backend.app.services.cache_manager import get_cache_manager
+from backend.app.services.rate_limiter import openai_priority
 
 router = APIRouter()
 
@@ -24,7 +32,7 @@ def get_analyzer():
     global _analyzer
     if _analyzer is None:
         openai_api_key = os.getenv('OPENAI_API_KEY')
-        database_path = os.path.join(project_root, "vulgate_analysis.db")
+        database_path = get_cache_manager().analysis_db_path
         
         print(f"Analysis DB path: {database_path}")
         print(f"Project root: {project_root}")
@@ -35,6 +43,22 @@ def get_analyzer():
         )
     return _analyzer
 
+# Initialize the macronizer (singleton pattern)
+_macronizer = None
+
+_macronizer_lock = threading.Lock()
+
+def get_macronizer():
+    global _macronizer
+    with _macronizer_lock:
+        if _macronizer is None:
+            _macronizer = LatinMacronizer(
+                pool_size=settings.MACRONIZER_POOL_SIZE,
+                executor=settings.MACRONIZER_EXECUTOR,
+                cache=make_cache(settings.MACRONIZATION_CACHE_DB, settings.MACRONIZATION_CACHE_SIZE)
+            )
+    return _macronizer
+
 async def log_analysis_history(
     db: Session,
     verse_id: int,
@@ -90,7 +114,8 @@ async def analyze_verse(
 
         # Run analysis in background to avoid timeout
         def run_analysis():
-            result = analyzer.analyze_verse_complete(book, chapter, verse, verse_text)
+            with openai_priority("analysis"):
+                result = analyzer.analyze_verse_complete(book, chapter, verse, verse_text)
             print(f"Completed analysis for {book} {chapter}:{verse}")
 
         background_tasks.add_task(run_analysis)
@@ -289,12 +314,14 @@ async def analyze_verses_batch(
         def run_batch_analysis():
             for verse_data in verses:
                 try:
-                    result = analyzer.analyze_verse_complete(
-                        verse_data["book"],
-                        verse_data["chapter"], 
-                        verse_data["verse"],
-                        verse_data["text"]
-                    )
+                    # Queue behind interactive requests for the shared OpenAI budget
+                    with openai_priority("batch"):
+                        result = analyzer.analyze_verse_complete(
+                            verse_data["book"],
+                            verse_data["chapter"], 
+                            verse_data["verse"],
+                            verse_data["text"]
+                        )
                     print(f"Completed batch analysis for {verse_data['book']} {verse_data['chapter']}:{verse_data['verse']}")
                 except Exception as e:
                     print(f"Failed to analyze {verse_data['book']} {verse_data['chapter']}:{verse_data['verse']}: {e}")
@@ -310,6 +337,79 @@ async def analyze_verses_batch(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch analysis failed: {str(e)}")
 
+@router.post("/macronize")
+async def macronize_text(text: str, meter_hint: Optional[str] = None,
+                         perform_utov: bool = False, perform_itoj: bool = False):
+    """
+    Macronize a Latin text (typically one verse), marking long vowels
+    """
+    try:
+        macronizer = await asyncio.to_thread(get_macronizer)
+        macronized = await macronizer.macronize_text_async(
+            text,
+            perform_utov=perform_utov,
+            perform_itoj=perform_itoj,
+            scan_meter=macronizer.scan_type_for_hint(meter_hint)
+        )
+        return {
+            "original_text": text,
+            "macronized_text": macronized,
+            "changed": macronized != text.strip(),
+            "macronizer_available": macronizer.is_available()
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Macronization failed: {str(e)}")
+
+@router.get("/macronize/stats")
+async def macronizer_stats():
+    """
+    Macronizer pool metrics (size, cores in use, wait times, utilization) and result cache statistics
+    """
+    macronizer = await asyncio.to_thread(get_macronizer)
+    return macronizer.get_stats()
+
+@router.post("/macronize/stream")
+async def macronize_stream(request: MacronizeStreamRequest):
+    """
+    Macronize many verses (e.g. a whole chapter or book), streaming the results as they complete.
+    The response is newline-delimited JSON: one object per verse in input order, then a summary line.
+    """
+    macronizer = await asyncio.to_thread(get_macronizer)
+    scan_meter = macronizer.scan_type_for_hint(request.meter_hint)
+
+    def generate():
+        count = 0
+        try:
+            results = macronizer.macronize_stream(
+                (verse.text for verse in request.verses),
+                perform_utov=request.perform_utov,
+                perform_itoj=request.perform_itoj,
+                scan_meter=scan_meter,
+                chunk_size=request.chunk_size
+            )
+            for verse, macronized in zip(request.verses, results):
+                yield json.dumps({
+                    "index": count,
+                    "reference": verse.reference,
+                    "original_text": verse.text,
+                    "macronized_text": macronized,
+                    "changed": macronized != verse.text.strip()
+                }, ensure_ascii=False) + "\n"
+                count += 1
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            yield json.dumps({"error": f"Macronization failed: {str(e)}", "completed": count}) + "\n"
+            return
+        yield json.dumps({
+            "done": True,
+            "completed": count,
+            "macronizer_available": macronizer.is_available()
+        }) + "\n"
+
+    # A plain generator: Starlette iterates it in its thread pool, so the event loop is not blocked
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @router.get("/languages/supported")
 async def get_supported_languages():
     """
@@ -533,6 +633,7 @@ async def health_check():
             "status": "healthy",
             "openai_enabled": analyzer.openai_enabled,
             "database_connected": True,
+            "macronizer_available": _macronizer is not None and _macronizer.is_available(),
             "version": "1.0"
         }
         
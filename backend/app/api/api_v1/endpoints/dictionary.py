@@ -2,72 +2,71 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
 from typing import Optional
 import os
 import sys
-import time
 import asyncio
 from functools import wraps
-import sqlite3
 import json
 
 # Add the project root to path so we can import enhanced_dictionary
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
 sys.path.append(project_root)
 
-# Fix: Use the correct path for the main word_cache.db (not the backend subdirectory one)
-# Hardcode the correct path since path resolution is tricky
-CACHE_DB_PATH = "/Users/guillermomolina/dev/vulgate/word_cache.db"
-
 from backend.app.services.enhanced_dictionary import EnhancedDictionary  # noqa
 from backend.app.api.api_v1.endpoints.books import BOOK_ABBREVIATIONS  # Import book abbreviations
 from backend.app.services.word_alignment import get_word_aligner
+from backend.app.services.rate_limiter import estimate_tokens, get_rate_limiter, openai_priority
+from backend.app.services.cache_manager import cache_counters, get_cache_manager
+from backend.app.services.embedding_cache import get_embedding_cache
+from backend.app.services.verse_cache_store import TRANSLATION_KINDS, ALIGNMENT_KINDS
 WordInfo = None  # Placeholder to avoid unresolved import
 
 router = APIRouter()
 
-# Rate limiting state
-last_openai_call = 0
-min_time_between_calls = 1.0  # Minimum 1 second between OpenAI API calls
-
-# Determine analysis DB path relative to project root
-ANALYSIS_DB_PATH = os.path.join(project_root, "vulgate_analysis.db")
+# Batch lookups
+MAX_BATCH_WORDS = 5000  # Words per /lookup/batch request
+BATCH_MISS_CONCURRENCY = 8  # Cache misses looked up at once, each in a worker thread
 
 # Word alignment caching functions
+def _alignment_response(language_code: str, word_alignments: dict, method, confidence, translations: dict) -> dict:
+    return {
+        "word_alignments": word_alignments,
+        "alignment_method": method,
+        "alignment_confidence": confidence,
+        "translations": {language_code: translations.get("dynamic", "")},  # Frontend format
+        "literal_translation": translations.get("literal", ""),
+        "dynamic_translation": translations.get("dynamic", ""),
+        "detailed_translations": {
+            language_code: {
+                "literal": translations.get("literal", ""),
+                "dynamic": translations.get("dynamic", "")
+            }
+        }
+    }
+
 def get_cached_word_alignments(verse_reference: str, language_code: str) -> Optional[dict]:
     """Get cached word alignments from database"""
     try:
-        cache_db_path = CACHE_DB_PATH
-        conn = sqlite3.connect(cache_db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT word_alignments_json, alignment_method, alignment_confidence,
-                   translations_json, verse_text
+        cache = get_cache_manager()
+        store = cache.verse_store
+        word_alignments = store.get_frontend_alignments(verse_reference, language_code)
+        cache_counters.record("alignment", bool(word_alignments))
+        if word_alignments:
+            translations = store.get_translations(verse_reference, language_code, ("literal", "dynamic")) or {}
+            return _alignment_response(language_code, word_alignments, word_alignments["method"],
+                                       word_alignments["average_confidence"], translations)
+        
+        # Rows cached before the normalized tables existed (see scripts/migrate_verse_cache_tables.py)
+        result = store.db.fetchone('''
+            SELECT word_alignments_json, alignment_method, alignment_confidence, translations_json
             FROM verse_analysis_cache 
             WHERE verse_reference = ? AND language_code = ?
         ''', (verse_reference, language_code))
         
-        result = cursor.fetchone()
-        conn.close()
-        
         if result and result[0]:  # word_alignments_json exists
-            word_alignments = json.loads(result[0])
-            translations = json.loads(result[3]) if result[3] else {}  # translations_json is at index 3
-            
-            return {
-                "word_alignments": word_alignments,
-                "alignment_method": result[1],
-                "alignment_confidence": result[2],
-                "translations": {language_code: translations.get("dynamic", "")},  # Frontend format
-                "literal_translation": translations.get("literal", ""),
-                "dynamic_translation": translations.get("dynamic", ""),
-                "detailed_translations": {
-                    language_code: {
-                        "literal": translations.get("literal", ""),
-                        "dynamic": translations.get("dynamic", "")
-                    }
-                }
-            }
+            translations = cache.codec.decode(result[3], {})
+            return _alignment_response(language_code, cache.codec.decode(result[0]), result[1], result[2], translations)
         return None
     except Exception as e:
+        cache_counters.error("alignment")
         print(f"Error getting cached word alignments: {e}")
         return None
 
@@ -76,54 +75,17 @@ def cache_word_alignments(verse_reference: str, language_code: str,
                          word_alignments: dict):
     """Cache word alignments to database"""
     try:
-        cache_db_path = CACHE_DB_PATH
-        conn = sqlite3.connect(cache_db_path)
-        cursor = conn.cursor()
-        
-        # Prepare data for caching
-        word_alignments_json = json.dumps(word_alignments)
-        translations_data = {
-            "literal": literal_translation,
-            "dynamic": dynamic_translation
-        }
-        translations_json = json.dumps(translations_data)
-        
-        # Insert or update cache
-        cursor.execute('''
-            INSERT OR REPLACE INTO verse_analysis_cache 
-            (verse_reference, language_code, verse_text, word_alignments_json, alignment_method, 
-             alignment_confidence, translations_json, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (
-            verse_reference, 
-            language_code,
-            "",  # verse_text - we'll add this parameter later
-            word_alignments_json,
-            word_alignments.get("method", "unknown"),
-            word_alignments.get("average_confidence", 0.0),
-            translations_json
-        ))
-        
-        conn.commit()
-        conn.close()
+        store = get_cache_manager().verse_store
+        with store.db.transaction() as cursor:
+            store.save_translations(verse_reference, language_code,
+                                    {"literal": literal_translation, "dynamic": dynamic_translation}, cursor=cursor)
+            store.save_frontend_alignments(verse_reference, language_code, word_alignments, cursor=cursor)
         print(f"💾 Cached word alignments for {verse_reference} ({language_code})")
         
     except Exception as e:
+        cache_counters.error("alignment")
         print(f"Error caching word alignments: {e}")
 
-def rate_limit_openai():
-    """Rate limit OpenAI API calls to avoid 429 errors"""
-    global last_openai_call
-    now = time.time()
-    time_since_last = now - last_openai_call
-    
-    if time_since_last < min_time_between_calls:
-        sleep_time = min_time_between_calls - time_since_last
-        print(f"Rate limiting: sleeping {sleep_time:.2f}s before next OpenAI call")
-        time.sleep(sleep_time)
-    
-    last_openai_call = time.time()
-
 def retry_on_rate_limit(max_retries=3, base_delay=1.0):
     """Decorator to add exponential backoff retry logic for rate limited functions"""
     def decorator(func):
@@ -131,8 +93,7 @@ def retry_on_rate_limit(max_retries=3, base_delay=1.0):
         async def wrapper(*args, **kwargs):
             for attempt in range(max_retries + 1):
                 try:
-                    if 'openai' in str(func.__name__).lower() or attempt > 0:
-                        rate_limit_openai()
+                    # OpenAI calls themselves wait on the shared limiter (services/rate_limiter.py)
                     if asyncio.iscoroutinefunction(func):
                         return await func(*args, **kwargs)
                     # run sync functions in a thread to avoid blocking
@@ -202,8 +163,8 @@ async def lookup_words_batch(request: Request):
         if not words:
             raise HTTPException(status_code=422, detail="'words' array cannot be empty")
         
-        if len(words) > 50:  # Reasonable limit
-            raise HTTPException(status_code=422, detail="Too many words. Maximum 50 words per batch.")
+        if len(words) > MAX_BATCH_WORDS:
+            raise HTTPException(status_code=422, detail=f"Too many words. Maximum {MAX_BATCH_WORDS} words per batch.")
         
         # Validate each word
         for i, word in enumerate(words):
@@ -217,14 +178,25 @@ async def lookup_words_batch(request: Request):
         include_theological = body.get("include_theological", False)
         
         enhanced_dict = get_enhanced_dictionary(request)
-        results = []
         
-        # Add small delay between words to avoid rate limiting
-        for i, word in enumerate(words):
-            if i > 0:  # Don't delay before first word
-                await asyncio.sleep(0.1)  # 100ms delay between lookups
-                
-            result = enhanced_dict.lookup_word(word.strip())
+        # Resolve every distinct word the cache knows with one query per chunk
+        unique_words = list(dict.fromkeys(word.strip() for word in words))
+        resolved = await asyncio.to_thread(enhanced_dict.get_many_from_cache, unique_words)
+        
+        # Only real misses take the slow path, a few at a time off the event loop
+        misses = [word for word in unique_words if word not in resolved]
+        if misses:
+            semaphore = asyncio.Semaphore(BATCH_MISS_CONCURRENCY)
+            
+            async def lookup_miss(word):
+                async with semaphore:
+                    resolved[word] = await asyncio.to_thread(enhanced_dict.lookup_word, word)
+            
+            await asyncio.gather(*(lookup_miss(word) for word in misses))
+        
+        results = []
+        for word in words:
+            result = resolved[word.strip()]
             results.append({
                 "word": word,
                 "found": result.source != "not_found",
@@ -253,17 +225,16 @@ async def health_check():
     """
     Health check endpoint with rate limiting info
     """
-    global last_openai_call
-    now = time.time()
-    time_since_last = now - last_openai_call
-    
+    limiter_stats = get_rate_limiter().stats()
+    cache_check = get_cache_manager().last_check
     return {
-        "status": "healthy",
+        "alignment_model": get_word_aligner(wait=False).status(),
+        "status": "healthy" if not cache_check or cache_check["ok"] else "degraded",
         "rate_limiting": {
-            "min_time_between_calls": min_time_between_calls,
-            "time_since_last_call": time_since_last,
-            "ready_for_next_call": time_since_last >= min_time_between_calls
-        }
+            **limiter_stats,
+            "ready_for_next_call": limiter_stats["available_requests"] >= 1 and limiter_stats["queue_depth"] == 0
+        },
+        "cache_self_check": cache_check
     }
 
 @router.get("/stats")
@@ -287,7 +258,11 @@ async def get_dictionary_stats(request: Request):
             "total_available": main_dict_count + cached_count,
             "openai_enabled": enhanced_dict.openai_enabled,
             "cache_file": cache_stats['cache_file'],
-            "cache_breakdown_by_source": cache_stats['source_breakdown']
+            "cache_breakdown_by_source": cache_stats['source_breakdown'],
+            "memory_cache": cache_stats['memory_cache'],
+            "coalesced_openai_calls": enhanced_dict.inflight.stats(),
+            "caches": get_cache_manager().stats(),
+            "source_embeddings": get_embedding_cache().stats() if get_embedding_cache() else None
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get dictionary stats: {str(e)}")
@@ -300,7 +275,7 @@ async def regenerate_word(word: str, request: Request):
     try:
         enhanced_dict = get_enhanced_dictionary(request)
         
-        # Clear the word from cache
+        # Clear the word from cache (SQLite and the in-memory tier)
         was_cached = enhanced_dict.clear_word_cache(word)
         
         # Perform fresh lookup
@@ -331,17 +306,15 @@ async def clear_entire_cache(request: Request):
     try:
         enhanced_dict = get_enhanced_dictionary(request)
         
-        conn = sqlite3.connect(enhanced_dict.cache_db)
-        cursor = conn.cursor()
-        
-        # Count before clearing
-        cursor.execute('SELECT COUNT(*) FROM word_cache')
-        count_before = cursor.fetchone()[0]
-        
-        # Clear cache
-        cursor.execute('DELETE FROM word_cache')
-        conn.commit()
-        conn.close()
+        enhanced_dict.flush_writes()
+        with enhanced_dict.db.transaction() as cursor:
+            # Count before clearing
+            cursor.execute('SELECT COUNT(*) FROM word_cache')
+            count_before = cursor.fetchone()[0]
+            
+            # Clear cache
+            cursor.execute('DELETE FROM word_cache')
+        enhanced_dict.clear_memory_cache()
         
         return {
             "cache_cleared": True,
@@ -380,12 +353,9 @@ async def analyze_verse(request: Request):
                 "error": "OpenAI not enabled on server"
             }
 
-        # Rate limit before making the call
-        rate_limit_openai()
-
         # Analyze verse
         try:
-            analysis_data = dictionary.analyze_verse(verse_text, verse_reference)
+            analysis_data = await asyncio.to_thread(dictionary.analyze_verse, verse_text, verse_reference)
         except Exception as e:
             error_msg = str(e)
             if "rate limit" in error_msg.lower() or "429" in error_msg or "quota" in error_msg.lower():
@@ -492,8 +462,7 @@ async def analyze_verse_complete(request: Request):
         
         for attempt in range(max_retries + 1):
             try:
-                rate_limit_openai()
-                analysis_data = dictionary.analyze_verse(verse_text, verse_reference)
+                analysis_data = await asyncio.to_thread(dictionary.analyze_verse, verse_text, verse_reference)
                 break  # Success, exit retry loop
             except Exception as e:
                 error_msg = str(e)
@@ -579,7 +548,7 @@ async def translate_verse_endpoint(request: Request):
             }
 
         # Check cache first
-        cache_key = f"{verse_reference}_{dictionary.detect_source_language(verse_text)}_{target_language}"
+        cache_key = dictionary.translation_cache_key(verse_reference, target_language)
         if verse_reference:
             cached_translation = dictionary.get_translation_from_cache(cache_key)
             if cached_translation:
@@ -595,7 +564,8 @@ async def translate_verse_endpoint(request: Request):
                 # Add analysis if requested and not already included
                 if include_analysis and "analysis" not in result:
                     try:
-                        analysis_data = dictionary.analyze_verse_with_openai(
+                        analysis_data = await asyncio.to_thread(
+                            dictionary.analyze_verse_with_openai,
                             verse_text, 
                             verse_reference, 
                             target_analysis_language=target_language
@@ -614,12 +584,9 @@ async def translate_verse_endpoint(request: Request):
                 
                 return result
 
-        # Rate limit before making the call
-        rate_limit_openai()
-
-        # Translate verse
+        # Translate verse (waits on the shared OpenAI limiter in a worker thread)
         try:
-            translation_result = dictionary.translate_verse(verse_text, target_language)
+            translation_result = await asyncio.to_thread(dictionary.translate_verse, verse_text, target_language)
             
             # Parse translation result
             if isinstance(translation_result, str):
@@ -662,8 +629,9 @@ async def translate_verse_endpoint(request: Request):
                 # Default to transliteration (literal for now, but could be enhanced)
                 final_translation = translation_data.get("literal", translation_data.get("dynamic", ""))
 
-            # Generate word alignments
-            word_aligner = get_word_aligner()
+            # Generate word alignments (fallback aligner while the model is still loading)
+            word_aligner = get_word_aligner(wait=False)
+            still_loading = word_aligner.is_loading
             source_language = translation_data.get("source_language", "unknown")
             
             # Create alignments for both literal and dynamic translations
@@ -673,19 +641,14 @@ async def translate_verse_endpoint(request: Request):
             literal_translation = translation_data.get("literal", "")
             dynamic_translation = translation_data.get("dynamic", "")
             
-            if literal_translation:
-                literal_alignments_data = word_aligner.align_words(
-                    verse_text, 
-                    literal_translation, 
-                    source_language
-                )
-            
-            if dynamic_translation:
-                dynamic_alignments_data = word_aligner.align_words(
-                    verse_text, 
-                    dynamic_translation, 
-                    source_language
-                )
+            # Both translations against the source in one batched forward pass, off the event loop
+            targets = [text for text in (literal_translation, dynamic_translation) if text]
+            if targets:
+                aligned = await asyncio.to_thread(word_aligner.align_many, verse_text, targets, source_language)
+                if literal_translation:
+                    literal_alignments_data = aligned.pop(0)
+                if dynamic_translation:
+                    dynamic_alignments_data = aligned.pop(0)
 
             # Format alignments for response
             literal_formatted = word_aligner.format_alignment_response(literal_alignments_data) if literal_alignments_data else {"alignments": [], "method": "none", "average_confidence": 0.0}
@@ -721,7 +684,8 @@ async def translate_verse_endpoint(request: Request):
             # Add analysis if requested
             if include_analysis:
                 try:
-                    analysis_data = dictionary.analyze_verse_with_openai(
+                    analysis_data = await asyncio.to_thread(
+                        dictionary.analyze_verse_with_openai,
                         verse_text, 
                         verse_reference, 
                         target_analysis_language=target_language
@@ -739,8 +703,8 @@ async def translate_verse_endpoint(request: Request):
                     print(f"Failed to add analysis to translation: {e}")
                     result["analysis_error"] = str(e)
 
-            # Cache the result
-            if verse_reference:
+            # Cache the result (not alignments made while the model was loading: they would stick)
+            if verse_reference and not (still_loading and targets):
                 cache_data = {
                     "translation": final_translation,
                     "literal": literal_translation,
@@ -770,6 +734,43 @@ async def translate_verse_endpoint(request: Request):
             raise HTTPException(status_code=429, detail="API quota exceeded. Please try again later.")
         raise HTTPException(status_code=500, detail=f"Internal server error: {error_msg}")
 
+@router.get("/cache/translation")
+async def get_cached_translation_fields(reference: str, language: str = "en", fields: str = "dynamic"):
+    """
+    Read only the requested parts of a cached verse translation.
+    fields is a comma-separated subset of: translation, literal, dynamic, alignments,
+    literal_alignments, dynamic_alignments
+    """
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(TRANSLATION_KINDS) - {"alignments", "literal_alignments", "dynamic_alignments"}
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    
+    store = get_cache_manager().verse_store
+    result = {"verse_reference": reference, "language": language}
+    kinds = [kind for kind in TRANSLATION_KINDS if kind in requested]
+    if kinds:
+        try:
+            translations = await asyncio.to_thread(store.get_translations, reference, language, kinds)
+        except Exception as e:
+            cache_counters.error("translation")
+            raise HTTPException(status_code=500, detail=f"Failed to read cached translation: {str(e)}")
+        cache_counters.record("translation", bool(translations))
+        result.update(translations or {})
+    alignment_kinds = [kind for kind in ALIGNMENT_KINDS
+                       if "alignments" in requested or f"{kind}_alignments" in requested]
+    if alignment_kinds:
+        try:
+            alignments = await asyncio.to_thread(store.get_alignments, reference, language, alignment_kinds)
+        except Exception as e:
+            cache_counters.error("alignment")
+            raise HTTPException(status_code=500, detail=f"Failed to read cached alignments: {str(e)}")
+        cache_counters.record("alignment", bool(alignments))
+        for kind, entry in (alignments or {}).items():
+            result[f"{kind}_alignments"] = entry
+    result["found"] = len(result) > 2
+    return result
+
 @router.get("/cache/verse-stats")
 async def get_verse_cache_stats(request: Request):
     """
@@ -778,23 +779,16 @@ async def get_verse_cache_stats(request: Request):
     try:
         enhanced_dict = get_enhanced_dictionary(request)
         
-        conn = sqlite3.connect(enhanced_dict.cache_db)
-        cursor = conn.cursor()
-        
         # Count total cached verses
-        cursor.execute('SELECT COUNT(*) FROM verse_analysis_cache')
-        total_verses = cursor.fetchone()[0]
+        total_verses = enhanced_dict.db.fetchone('SELECT COUNT(*) FROM verse_analysis_cache')[0]
         
         # Get recent verses
-        cursor.execute('''
+        recent_verses = [{"reference": row[0], "cached_at": row[1]} for row in enhanced_dict.db.fetchall('''
             SELECT verse_reference, created_at 
             FROM verse_analysis_cache 
             ORDER BY created_at DESC 
             LIMIT 10
-        ''')
-        recent_verses = [{"reference": row[0], "cached_at": row[1]} for row in cursor.fetchall()]
-        
-        conn.close()
+        ''')]
         
         return {
             "total_cached_verses": total_verses,
@@ -808,10 +802,7 @@ async def get_verse_cache_stats(request: Request):
 async def get_verses_for_word(word: str):
     """Return all verses that contain the given word (case-sensitive match in stored grammar breakdown)."""
     try:
-        conn = sqlite3.connect(ANALYSIS_DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute(
+        rows = get_cache_manager().pool("analysis").fetchall(
             '''SELECT v.book_abbreviation, v.chapter_number, v.verse_number, v.latin_text, g.word_index
                FROM grammar_breakdowns g
                JOIN verse_analyses v ON v.id = g.verse_analysis_id
@@ -819,8 +810,6 @@ async def get_verses_for_word(word: str):
                ORDER BY v.book_abbreviation, v.chapter_number, v.verse_number''',
             (word,)
         )
-        rows = cursor.fetchall()
-        conn.close()
 
         verses = [
             {
@@ -882,12 +871,14 @@ async def analyze_verse_openai(request: Request):
             raise HTTPException(status_code=400, detail="Verse text is required")
         
         enhanced_dict = get_enhanced_dictionary(request)
-        analysis_data = enhanced_dict.analyze_verse_with_openai(
-            verse_text, 
-            verse_reference, 
-            language_code='la',  # Force Latin as source language
-            target_analysis_language=target_analysis_language
-        )
+        with openai_priority("analysis"):
+            analysis_data = await asyncio.to_thread(
+                enhanced_dict.analyze_verse_with_openai,
+                verse_text, 
+                verse_reference, 
+                language_code='la',  # Force Latin as source language
+                target_analysis_language=target_analysis_language
+            )
         
         if not analysis_data.get("success", False):
             error_msg = analysis_data.get("error", "Analysis failed")
@@ -928,7 +919,7 @@ async def analyze_verse_openai(request: Request):
                     for lang in target_languages:
                         if lang not in response["translations"]:
                             try:
-                                lang_result = enhanced_dict.translate_verse(verse_text, lang)
+                                lang_result = await asyncio.to_thread(enhanced_dict.translate_verse, verse_text, lang)
                                 if isinstance(lang_result, str):
                                     lang_data = json.loads(lang_result)
                                     response["translations"][lang] = lang_data.get("dynamic", "")
@@ -941,7 +932,7 @@ async def analyze_verse_openai(request: Request):
                     print(f"🔄 Generating new word alignments for {verse_reference} ({target_analysis_language})")
                     
                     # Get translations for the verse
-                    translation_result = enhanced_dict.translate_verse(verse_text, target_analysis_language)
+                    translation_result = await asyncio.to_thread(enhanced_dict.translate_verse, verse_text, target_analysis_language)
                     
                     if isinstance(translation_result, str):
                         try:
@@ -967,11 +958,13 @@ async def analyze_verse_openai(request: Request):
                         response["word_alignments_error"] = "Missing translation data"
                     
                     if literal_translation and dynamic_translation:
-                        word_aligner = get_word_aligner()
+                        word_aligner = get_word_aligner(wait=False)
+                        still_loading = word_aligner.is_loading
                         
-                        # Create alignments for both translations
-                        literal_alignments_data = word_aligner.align_words(verse_text, literal_translation, source_language)
-                        dynamic_alignments_data = word_aligner.align_words(verse_text, dynamic_translation, source_language)
+                        # Create alignments for both translations (one batched forward pass)
+                        literal_alignments_data, dynamic_alignments_data = await asyncio.to_thread(
+                            word_aligner.align_many, verse_text, [literal_translation, dynamic_translation], source_language
+                        )
                         
                         # Format alignments for internal use
                         literal_formatted = word_aligner.format_alignment_response(literal_alignments_data)
@@ -998,7 +991,7 @@ async def analyze_verse_openai(request: Request):
                         for lang in target_languages:
                             if lang != target_analysis_language and lang not in response["translations"]:
                                 try:
-                                    lang_result = enhanced_dict.translate_verse(verse_text, lang)
+                                    lang_result = await asyncio.to_thread(enhanced_dict.translate_verse, verse_text, lang)
                                     if isinstance(lang_result, str):
                                         lang_data = json.loads(lang_result)
                                         response["translations"][lang] = lang_data.get("dynamic", "")
@@ -1016,14 +1009,15 @@ async def analyze_verse_openai(request: Request):
                             }
                         }
                         
-                        # Cache the results for future use
-                        cache_word_alignments(
-                            verse_reference, 
-                            target_analysis_language,
-                            literal_translation,
-                            dynamic_translation,
-                            frontend_alignments
-                        )
+                        # Cache the results for future use (unless the model was still loading)
+                        if not still_loading:
+                            cache_word_alignments(
+                                verse_reference, 
+                                target_analysis_language,
+                                literal_translation,
+                                dynamic_translation,
+                                frontend_alignments
+                            )
                 
             except Exception as e:
                 print(f"Failed to add word alignments to analysis: {e}")
@@ -1061,11 +1055,10 @@ async def analyze_grammatical_relationships(request: Request):
         # Get dictionary instance
         enhanced_dict = get_enhanced_dictionary(request)
         
-        # Rate limit before OpenAI call
-        rate_limit_openai()
-        
-        # Analyze grammatical relationships
-        analysis_data = enhanced_dict.analyze_grammatical_relationships(sentence, verse_reference)
+        # Analyze grammatical relationships (waits on the shared OpenAI limiter in a worker thread)
+        with openai_priority("analysis"):
+            analysis_data = await asyncio.to_thread(enhanced_dict.analyze_grammatical_relationships,
+                                                    sentence, verse_reference)
         
         if not analysis_data.get("success", False):
             error_msg = analysis_data.get("error", "Grammatical analysis failed")
@@ -1147,9 +1140,6 @@ async def get_book_info(book_abbr: str, request: Request):
                 "confidence": 0.3
             }
         
-        # Rate limit before OpenAI call
-        rate_limit_openai()
-        
         # Make OpenAI call to generate comprehensive book information
         import openai
         openai.api_key = enhanced_dict.openai_api_key
@@ -1182,12 +1172,15 @@ Return ONLY valid JSON in this exact format:
   "language_notes": "..."
 }}"""
 
-        response = openai.ChatCompletion.create(
+        messages = [
+            {"role": "system", "content": "You are a biblical scholar expert in the Latin Vulgate Bible. Provide accurate, scholarly information."},
+            {"role": "user", "content": prompt}
+        ]
+        await get_rate_limiter().acquire(estimate_tokens(messages, 1000))
+        response = await asyncio.to_thread(
+            openai.ChatCompletion.create,
             model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a biblical scholar expert in the Latin Vulgate Bible. Provide accurate, scholarly information."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             max_tokens=1000,
             temperature=0.7
         )
@@ -1309,8 +1302,6 @@ async def lookup_translation_word(request: Request):
         # If not in cache, try to get translation/definition using OpenAI
         if enhanced_dict.openai_enabled:
             try:
-                rate_limit_openai()
-                
                 # Create a prompt to get word information in the target language
                 import openai
                 openai.api_key = enhanced_dict.openai_api_key
@@ -1333,12 +1324,15 @@ Return ONLY valid JSON:
     "examples": ["example 1", "example 2"]
 }}"""
 
-                response = openai.ChatCompletion.create(
+                messages = [
+                    {"role": "system", "content": f"You are a {language} language expert providing detailed word information."},
+                    {"role": "user", "content": prompt}
+                ]
+                await get_rate_limiter().acquire(estimate_tokens(messages, 400))
+                response = await asyncio.to_thread(
+                    openai.ChatCompletion.create,
                     model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": f"You are a {language} language expert providing detailed word information."},
-                        {"role": "user", "content": prompt}
-                    ],
+                    messages=messages,
                     max_tokens=400,
                     temperature=0.3
                 )
@@ -16,6 +16,34 @@ class Settings(BaseSettings):
     
     # OpenAI
     OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None  # OpenAI-compatible server (e.g. a local stub for testing)
+    OPENAI_REQUESTS_PER_MINUTE: float = 60  # Shared budget for all OpenAI calls in the process
+    OPENAI_TOKENS_PER_MINUTE: float = 90000
+    OPENAI_RATE_BURST_SECONDS: float = 10  # Bucket capacity, in seconds' worth of budget
+    
+    # Cache databases (opened and checked by services/cache_manager.py)
+    WORD_CACHE_DB: str = str(Path(__file__).parent.parent.parent.parent / "word_cache.db")  # Words, translations, alignments
+    ANALYSIS_DB: str = str(Path(__file__).parent.parent.parent.parent / "vulgate_analysis.db")  # VulgateAnalyzer analyses
+    ALIGNMENT_EMBEDDING_CACHE_DB: str = str(Path(__file__).parent.parent.parent.parent / "alignment_embeddings.db")
+    ALIGNMENT_EMBEDDING_CACHE_MB: int = 512  # Source-verse embeddings kept on disk (0 disables the cache)
+    
+    # Word alignment inference (services/alignment_backends.py)
+    ALIGNMENT_BACKEND: str = "torch"  # Word alignment encoder on CPU: torch, torch_int8, onnx or onnx_int8
+    ALIGNMENT_ONNX_DIR: str = str(Path(__file__).parent.parent.parent.parent / "models" / "alignment")  # Exported ONNX encoders
+    ALIGNMENT_LEXICON_PATH: str = str(Path(__file__).parent.parent.parent.parent / "alignment_lexicon.json")  # Fallback aligner glosses
+    
+    # Dictionary cache writes (buffered and flushed in batches)
+    DICTIONARY_WRITE_BATCH_SIZE: int = 500  # Flush once this many rows are pending
+    DICTIONARY_WRITE_FLUSH_INTERVAL: float = 0.5  # ...or when the oldest is this many seconds old
+    DICTIONARY_MEMORY_CACHE_SIZE: int = 20000  # WordInfo entries kept in memory in front of word_cache
+    DICTIONARY_NEGATIVE_CACHE_TTL: float = 300.0  # Seconds a not_found entry is trusted from memory
+    CACHE_COMPACT_PAYLOADS: bool = False  # Write cached analyses as msgpack+zstd BLOBs (readers accept both)
+    
+    # Latin macronizer
+    MACRONIZER_POOL_SIZE: int = 2  # Pre-warmed macronizer instances (concurrent requests)
+    MACRONIZER_EXECUTOR: str = "thread"  # "thread" or "process"
+    MACRONIZATION_CACHE_DB: str = str(Path(__file__).parent.parent.parent.parent / "macronization_cache.db")
+    MACRONIZATION_CACHE_SIZE: int = 5000  # In-memory entries in front of the SQLite cache
     
     # RapidAPI for Bhagavad Gita
     RAPIDAPI_KEY: Optional[str] = None
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cache Payload Codec
+Encodes the JSON payloads of the cache tables (verse analyses, translation extras, legacy
+alignment blobs) either as plain JSON text, as before, or - when CACHE_COMPACT_PAYLOADS is on -
+as a compact BLOB: msgpack (compact JSON without it) compressed with zstd against a dictionary
+trained on the cache's own payloads (zlib without zstandard).
+
+decode() reads both forms, so readers never care which one a row holds and a database can be
+converted (scripts/compact_cache_payloads.py) while the API keeps running.
+
+BLOB layout: MAGIC, format byte, compression byte, dictionary id (4 bytes, 0 = none), body.
+"""
+
+import json
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Dict, Iterable, Optional
+
+from backend.app.core.config import settings
+from backend.app.db.sqlite_pool import SQLitePool, get_pool
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    zstandard = None
+
+MAGIC = b"PC"
+HEADER = struct.Struct(">2sccI")
+
+FORMAT_JSON = b"j"
+FORMAT_MSGPACK = b"m"
+COMPRESSION_NONE = b"-"
+COMPRESSION_ZLIB = b"z"
+COMPRESSION_ZSTD = b"s"
+
+# Payloads shorter than this are stored uncompressed (the frame would outweigh the savings)
+MIN_COMPRESS_BYTES = 64
+ZSTD_LEVEL = 9
+DEFAULT_DICTIONARY_SIZE = 64 * 1024
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS payload_dictionaries (
+        dict_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        data BLOB NOT NULL,
+        sample_count INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+class PayloadCodec:
+    """Encodes/decodes cache payloads for one database (dictionaries live in that database)"""
+
+    def __init__(self, pool: SQLitePool, compact: bool = False):
+        """
+        Args:
+            pool: Connection pool of the cache database
+            compact: Write the compact BLOB form; when False, encode() writes JSON text
+        """
+        self.pool = pool
+        self.compact = compact
+        self._lock = threading.Lock()
+        self._dictionaries: Dict[int, Any] = {}
+        self.pool.execute(SCHEMA)
+        self.dict_id = 0
+        if ZSTD_AVAILABLE:
+            row = self.pool.fetchone('SELECT MAX(dict_id) FROM payload_dictionaries')
+            self.dict_id = (row[0] if row else None) or 0
+
+    # Serialization
+
+    @staticmethod
+    def _serialize(value: Any):
+        if MSGPACK_AVAILABLE:
+            return FORMAT_MSGPACK, msgpack.packb(value, use_bin_type=True)
+        return FORMAT_JSON, json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def _deserialize(fmt: bytes, body: bytes) -> Any:
+        if fmt == FORMAT_MSGPACK:
+            if not MSGPACK_AVAILABLE:
+                raise RuntimeError("Cache payload is msgpack-encoded; install msgpack to read it")
+            return msgpack.unpackb(body, raw=False, strict_map_key=False)
+        return json.loads(body.decode("utf-8"))
+
+    def _dictionary(self, dict_id: int):
+        with self._lock:
+            dictionary = self._dictionaries.get(dict_id)
+            if dictionary is None:
+                row = self.pool.fetchone('SELECT data FROM payload_dictionaries WHERE dict_id = ?', (dict_id,))
+                if not row:
+                    raise RuntimeError(f"Cache payload needs compression dictionary {dict_id}, which is missing")
+                dictionary = self._dictionaries[dict_id] = zstandard.ZstdCompressionDict(bytes(row[0]))
+            return dictionary
+
+    # Public API
+
+    def encode(self, value: Any, compact: Optional[bool] = None):
+        """JSON text, or the compact BLOB form when compact (default: the codec's setting)"""
+        if not (self.compact if compact is None else compact):
+            return json.dumps(value)
+        fmt, body = self._serialize(value)
+        compression, dict_id = COMPRESSION_NONE, 0
+        if len(body) >= MIN_COMPRESS_BYTES:
+            if ZSTD_AVAILABLE:
+                dictionary = self._dictionary(self.dict_id) if self.dict_id else None
+                compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dictionary) if dictionary \
+                    else zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+                compression, dict_id, body = COMPRESSION_ZSTD, self.dict_id, compressor.compress(body)
+            else:
+                compression, body = COMPRESSION_ZLIB, zlib.compress(body, 9)
+        return HEADER.pack(MAGIC, fmt, compression, dict_id) + body
+
+    def decode(self, stored: Any, default: Any = None) -> Any:
+        """The value of a stored payload in either form; default for NULL/empty"""
+        if stored is None or stored == "" or stored == b"":
+            return default
+        if isinstance(stored, str):
+            return json.loads(stored)
+        stored = bytes(stored)
+        if not stored.startswith(MAGIC):
+            return json.loads(stored.decode("utf-8"))
+        _, fmt, compression, dict_id = HEADER.unpack_from(stored)
+        body = stored[HEADER.size:]
+        if compression == COMPRESSION_ZLIB:
+            body = zlib.decompress(body)
+        elif compression == COMPRESSION_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("Cache payload is zstd-compressed; install zstandard to read it")
+            decompressor = zstandard.ZstdDecompressor(dict_data=self._dictionary(dict_id)) if dict_id \
+                else zstandard.ZstdDecompressor()
+            body = decompressor.decompress(body)
+        return self._deserialize(fmt, body)
+
+    @staticmethod
+    def is_compact(stored: Any) -> bool:
+        return isinstance(stored, (bytes, memoryview)) and bytes(stored[:len(MAGIC)]) == MAGIC
+
+    def train_dictionary(self, samples: Iterable[Any], size: int = DEFAULT_DICTIONARY_SIZE) -> int:
+        """
+        Train a zstd dictionary on sample payloads (decoded values) and use it for new encodes;
+        returns its id. Rows compressed with older dictionaries stay readable.
+        """
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Training a compression dictionary needs zstandard (pip install zstandard)")
+        serialized = [self._serialize(sample)[1] for sample in samples]
+        dictionary = zstandard.train_dictionary(size, serialized)
+        with self.pool.transaction() as cursor:
+            cursor.execute('INSERT INTO payload_dictionaries (data, sample_count) VALUES (?, ?)',
+                           (dictionary.as_bytes(), len(serialized)))
+            dict_id = cursor.lastrowid
+        with self._lock:
+            self._dictionaries[dict_id] = dictionary
+            self.dict_id = dict_id
+        return dict_id
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "compact": self.compact,
+            "serialization": "msgpack" if MSGPACK_AVAILABLE else "json",
+            "compression": "zstd" if ZSTD_AVAILABLE else "zlib",
+            "dictionary_id": self.dict_id or None
+        }
+
+
+_codecs: Dict[str, PayloadCodec] = {}
+_codecs_lock = threading.Lock()
+
+
+def get_payload_codec(database_path: str) -> PayloadCodec:
+    """The shared codec for a cache database, writing compact payloads if CACHE_COMPACT_PAYLOADS is set"""
+    key = os.path.abspath(database_path)
+    with _codecs_lock:
+        codec = _codecs.get(key)
+        if codec is None:
+            codec = _codecs[key] = PayloadCodec(get_pool(database_path), compact=settings.CACHE_COMPACT_PAYLOADS)
+        return codec
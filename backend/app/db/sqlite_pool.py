@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+SQLite Connection Pool
+Per-thread SQLite connections in WAL mode for the raw sqlite3 caches (word_cache.db and
+friends), so lookups do not pay for a connect, schema load and fsync on every call.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Pragmas applied to every new connection
+MMAP_SIZE = 256 * 1024 * 1024   # bytes of the file mapped into memory
+CACHE_SIZE_KIB = 32 * 1024      # page cache per connection
+BUSY_TIMEOUT_MS = 5000          # wait this long on a locked database before failing
+CACHED_STATEMENTS = 256         # prepared statements kept per connection
+
+
+class SQLitePool:
+    """
+    One connection per thread for a single database file
+
+    Connections are opened lazily, put in WAL mode with synchronous=NORMAL (a commit no longer
+    waits for an fsync, only checkpoints do) and keep their prepared statements around, so
+    callers should pass the same SQL string every time and bind parameters with "?".
+    """
+
+    def __init__(self, database_path: str):
+        self.database_path = database_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self.opened = 0
+
+    def connection(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        # check_same_thread=False only so close_all() may close it from another thread;
+        # each connection is otherwise used by the thread that opened it
+        conn = sqlite3.connect(self.database_path, timeout=BUSY_TIMEOUT_MS / 1000,
+                               check_same_thread=False, cached_statements=CACHED_STATEMENTS)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA mmap_size={MMAP_SIZE}')
+        conn.execute(f'PRAGMA cache_size=-{CACHE_SIZE_KIB}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+        with self._lock:
+            self._connections.append(conn)
+            self.opened += 1
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Cursor whose statements are committed together, or rolled back on error"""
+        conn = self.connection()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[tuple]:
+        return self.connection().execute(sql, params).fetchone()
+
+    def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        return self.connection().execute(sql, params).fetchall()
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Run one write statement in its own transaction; returns the affected row count"""
+        with self.transaction() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    def executemany(self, sql: str, rows: Iterable[Sequence[Any]]) -> int:
+        """Run one write statement for many rows in a single transaction"""
+        with self.transaction() as cursor:
+            cursor.executemany(sql, rows)
+            return cursor.rowcount
+
+    def close_all(self):
+        """Close every connection handed out so far (on shutdown)"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "database": self.database_path,
+                "open_connections": len(self._connections),
+                "connections_opened": self.opened
+            }
+
+
+_pools: Dict[str, SQLitePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database_path: str) -> SQLitePool:
+    """The shared pool for a database file (one per path, across all users of that file)"""
+    key = os.path.abspath(database_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = SQLitePool(database_path)
+        return pool
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Write-Behind Buffer
+Collects cache inserts in memory and writes them to SQLite in batches (one executemany per
+statement, one transaction per flush), so a verse analysis costs one commit instead of one
+per word. A flush that fails (e.g. the database is locked) puts its rows back and is retried
+with a growing delay; after max_retries failed attempts in a row the rows are dropped and
+logged as errors.
+"""
+
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence
+
+from backend.app.db.sqlite_pool import SQLitePool, get_pool
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Buffered writes against one database, flushed by a background thread
+
+    A flush happens when max_rows rows are pending or the oldest pending row is max_delay
+    seconds old, and on flush()/close(). Rows added with a key replace an earlier pending
+    row with the same statement and key (the INSERT OR REPLACE semantics of the caches), and
+    can be read back with pending() until they are committed.
+    """
+
+    def __init__(self, pool: SQLitePool, max_rows: int = 500, max_delay: float = 0.5, max_retries: int = 3):
+        self.pool = pool
+        self.max_rows = max(1, max_rows)
+        self.max_delay = max_delay
+        self.max_retries = max_retries
+        self._failures = 0
+        self._retry_at = 0.0
+        self._pending: Dict[str, "OrderedDict[Hashable, Sequence[Any]]"] = {}
+        self._flushing: Dict[str, "OrderedDict[Hashable, Sequence[Any]]"] = {}
+        self._count = 0
+        self._oldest: Optional[float] = None
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+        self.flushes = 0
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.flush_retries = 0
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def add(self, sql: str, row: Sequence[Any], key: Optional[Hashable] = None):
+        """Queue one row for the statement sql"""
+        with self._lock:
+            if not self._closed:
+                rows = self._pending.setdefault(sql, OrderedDict())
+                if key is None:
+                    key = ("_row", next(self._ids))
+                if key not in rows:
+                    self._count += 1
+                rows[key] = row
+                if self._oldest is None:
+                    self._oldest = time.monotonic()
+                if self._count >= self.max_rows:
+                    self._wakeup.notify()
+                return
+        # After shutdown, write through
+        self.pool.execute(sql, row)
+
+    def pending(self, sql: str, key: Hashable) -> Optional[Sequence[Any]]:
+        """A row queued (or being flushed) for sql under key, if not yet committed"""
+        with self._lock:
+            for rows in (self._pending.get(sql), self._flushing.get(sql)):
+                if rows and key in rows:
+                    return rows[key]
+        return None
+
+    def discard(self, sql: str, key: Hashable) -> bool:
+        """Drop a queued row that has not started flushing"""
+        with self._lock:
+            rows = self._pending.get(sql)
+            if rows and rows.pop(key, None) is not None:
+                self._count -= 1
+                return True
+        return False
+
+    def flush(self) -> int:
+        """Write everything pending in one transaction; returns the number of rows written"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._count:
+                    return 0
+                batch, self._pending = self._pending, {}
+                self._flushing = batch
+                count, self._count, self._oldest = self._count, 0, None
+            try:
+                with self.pool.transaction() as cursor:
+                    for sql, rows in batch.items():
+                        cursor.executemany(sql, list(rows.values()))
+                self.flushes += 1
+                self.rows_written += count
+                self._failures = 0
+            except Exception as e:
+                self._failures += 1
+                if self._failures <= self.max_retries and not self._closed:
+                    self.flush_retries += 1
+                    logger.warning(f"Write-behind flush of {count} rows to {self.pool.database_path} failed "
+                                   f"(attempt {self._failures}/{self.max_retries + 1}), retrying: {e}")
+                    self._requeue(batch)
+                else:
+                    self.rows_failed += count
+                    self._failures = 0
+                    logger.error(f"Write-behind flush of {count} rows to {self.pool.database_path} failed, "
+                                 f"rows dropped: {e}")
+                count = 0
+            finally:
+                with self._lock:
+                    self._flushing = {}
+            return count
+
+    def _requeue(self, batch: Dict[str, "OrderedDict[Hashable, Sequence[Any]]"]):
+        """Put a failed batch back; rows queued meanwhile under the same key are newer and win"""
+        with self._lock:
+            for sql, rows in batch.items():
+                newer = self._pending.get(sql, OrderedDict())
+                merged = OrderedDict((key, row) for key, row in rows.items() if key not in newer)
+                self._count += len(merged)
+                merged.update(newer)
+                self._pending[sql] = merged
+            self._oldest = self._oldest or time.monotonic()
+            self._retry_at = time.monotonic() + self.max_delay * self._failures
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._closed:
+                    backoff = self._retry_at - time.monotonic()
+                    if backoff > 0:
+                        self._wakeup.wait(backoff)
+                        continue
+                    if self._count >= self.max_rows:
+                        break
+                    if self._oldest is not None:
+                        remaining = self._oldest + self.max_delay - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._wakeup.wait(remaining)
+                    else:
+                        self._wakeup.wait()
+                if self._closed:
+                    return
+            self.flush()
+
+    def close(self):
+        """Stop the flusher thread and write whatever is still pending"""
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        self._thread.join()
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pending_rows": self._count,
+                "max_rows": self.max_rows,
+                "max_delay": self.max_delay,
+                "flushes": self.flushes,
+                "rows_written": self.rows_written,
+                "rows_failed": self.rows_failed,
+                "flush_retries": self.flush_retries
+            }
+
+
+_buffers: Dict[str, WriteBehindBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def get_write_buffer(database_path: str, max_rows: int = 500, max_delay: float = 0.5) -> WriteBehindBuffer:
+    """The shared write-behind buffer for a database file (a new one after the last was closed)"""
+    key = os.path.abspath(database_path)
+    with _buffers_lock:
+        buffer = _buffers.get(key)
+        if buffer is None or buffer.closed:
+            buffer = _buffers[key] = WriteBehindBuffer(get_pool(database_path), max_rows, max_delay)
+        return buffer
@@ -2,6 +2,7 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
+import asyncio
 from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
@@ -9,6 +10,9 @@ from dotenv import load_dotenv
 from backend.app.core.config import settings
 from backend.app.api.api_v1.api import api_router
 from backend.app.services.enhanced_dictionary import EnhancedDictionary  # noqa
+from backend.app.services.cache_manager import get_cache_manager
+from backend.app.api.api_v1.endpoints.analysis import get_macronizer
+from backend.app.services.word_alignment import start_word_aligner_loading
 
 load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
 
@@ -16,19 +20,34 @@ load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
 async def lifespan(app: FastAPI):
     # Load the ML model
     print("Starting up and loading dictionary...")
+    # Load the word alignment model in the background; /translate uses the fallback aligner
+    # until it is ready and /dictionary/health reports its state
+    start_word_aligner_loading()
     openai_api_key = os.getenv('OPENAI_API_KEY')
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
     dictionary_path = os.path.join(project_root, "frontend/public/dictionary.json")
     if not os.path.exists(dictionary_path):
         # Fallback to repository root dictionary
         dictionary_path = os.path.join(project_root, "latin_dictionary.json")
-    cache_db = os.path.join(project_root, "word_cache.db")
+    cache_manager = get_cache_manager()
+    app.state.cache_manager = cache_manager
 
-    app.state.enhanced_dictionary = EnhancedDictionary(database_path=cache_db)
+    app.state.enhanced_dictionary = EnhancedDictionary(database_path=cache_manager.word_cache_path)
     print("Dictionary loaded.")
+    # Fail loudly (in the log and /dictionary/health) if a cache cannot be read or written
+    cache_manager.self_check()
+    # Pre-warm the macronizer pool so the first request does not pay for it
+    macronizer = await asyncio.to_thread(get_macronizer)
+    print(f"Macronizer pool ready: {macronizer.get_stats()}")
     yield
     # Clean up the ML models and release the resources
     print("Shutting down.")
+    macronizer.close()
+    # Write out buffered word cache inserts before the connections go away
+    flushed = app.state.enhanced_dictionary.flush_writes()
+    print(f"Flushed {flushed} buffered dictionary writes.")
+    app.state.enhanced_dictionary.close()
+    cache_manager.close()
 
 app = FastAPI(
     title="Vulgate API",
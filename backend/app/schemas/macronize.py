@@ -0,0 +1,14 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+# Macronization Schemas
+class MacronizeStreamVerse(BaseModel):
+    text: str
+    reference: Optional[str] = None  # e.g. "Gn 1:1"; echoed back so the client can match results
+
+class MacronizeStreamRequest(BaseModel):
+    verses: List[MacronizeStreamVerse]
+    meter_hint: Optional[str] = None
+    perform_utov: bool = False
+    perform_itoj: bool = False
+    chunk_size: Optional[int] = None
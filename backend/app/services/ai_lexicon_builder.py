@@ -16,6 +16,7 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from backend.app.core.config import settings
+from backend.app.services.rate_limiter import achat_completion
 import hashlib
 import re
 import os
@@ -336,7 +337,9 @@ Ancient World\t[…]\t[…]\t[…]
     async def _call_openai(self, prompt: str) -> str:
         """Make OpenAI API call with rate limiting"""
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await achat_completion(
+                self.openai_client,
+                priority="batch",
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are a Latin scholar and lexicographer. Provide accurate, detailed word analysis in the requested JSON format."},
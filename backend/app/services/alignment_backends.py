@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Alignment Inference Backends
+CPU inference options for the multilingual BERT encoder behind AdvancedWordAligner (ALIGNMENT_BACKEND):
+
+    torch       SimAlign's full-precision PyTorch model (default)
+    torch_int8  the same model with its Linear layers dynamically quantized to int8
+    onnx        the encoder exported to ONNX (truncated at the alignment layer), run by onnxruntime
+    onnx_int8   the exported encoder with int8 dynamically quantized weights, run by onnxruntime
+
+Every backend replaces only SentenceAligner.embed_loader, so tokenization, similarity and
+matching - and with them align_words() / format_alignment_response() - stay unchanged.
+The ONNX files are exported on first use into ALIGNMENT_ONNX_DIR and reused afterwards.
+"""
+
+import copy
+import logging
+import os
+import tempfile
+from typing import Any, List
+
+try:
+    import onnxruntime
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+    onnxruntime = None
+
+BACKENDS = ("torch", "torch_int8", "onnx", "onnx_int8")
+
+logger = logging.getLogger(__name__)
+
+
+class OnnxEmbeddingLoader:
+    """Drop-in for simalign's EmbeddingLoader that runs the encoder with onnxruntime"""
+
+    def __init__(self, tokenizer, session, layer: int):
+        self.tokenizer = tokenizer
+        self.session = session
+        self.layer = layer
+        self.input_names = [model_input.name for model_input in session.get_inputs()]
+
+    def get_embed_list(self, sent_batch: List[Any]):
+        """Same output as EmbeddingLoader.get_embed_list: layer states without the first and last position"""
+        import torch
+        inputs = self.tokenizer(sent_batch, is_split_into_words=not isinstance(sent_batch[0], str),
+                                padding=True, truncation=True, return_tensors="np")
+        feed = {name: inputs[name].astype("int64") for name in self.input_names}
+        hidden = self.session.run(None, feed)[0]
+        return torch.from_numpy(hidden[:, 1:-1, :])
+
+
+def onnx_model_path(model_dir: str, model_name: str, layer: int, quantized: bool) -> str:
+    name = f"{model_name.replace('/', '_')}-layer{layer}{'-int8' if quantized else ''}.onnx"
+    return os.path.join(model_dir, name)
+
+
+def export_onnx_encoder(embed_loader, path: str):
+    """Export the encoder, cut after the alignment layer, with dynamic batch and sequence axes"""
+    import torch
+
+    model = copy.deepcopy(embed_loader.emb_model).cpu().eval()
+    # hidden_states[layer] is the output of the first `layer` transformer blocks: drop the rest
+    model.encoder.layer = model.encoder.layer[:embed_loader.layer]
+    model.config.output_hidden_states = False
+
+    class Encoder(torch.nn.Module):
+        def __init__(self, bert):
+            super().__init__()
+            self.bert = bert
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.bert(input_ids=input_ids, attention_mask=attention_mask,
+                             token_type_ids=token_type_ids).last_hidden_state
+
+    sample = embed_loader.tokenizer([["In", "principio", "creavit", "Deus"]], is_split_into_words=True,
+                                    return_tensors="pt")
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names + ["hidden"]}
+    with torch.no_grad():
+        torch.onnx.export(Encoder(model), tuple(sample[name] for name in input_names), path,
+                          input_names=input_names, output_names=["hidden"], dynamic_axes=dynamic_axes,
+                          opset_version=14)
+
+
+def write_model_file(path: str, write):
+    """
+    Call write(temporary_path) in the directory of path and move the result to path once it succeeded,
+    so a failed or interrupted export never leaves a partial model that later runs would load
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    handle, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    os.close(handle)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_onnx_session(embed_loader, model_dir: str, model_name: str, quantized: bool):
+    """Inference session for the exported encoder, exporting (and quantizing) it first if needed"""
+    fp32_path = onnx_model_path(model_dir, model_name, embed_loader.layer, quantized=False)
+    if not os.path.exists(fp32_path):
+        logger.info(f"Exporting alignment encoder to {fp32_path}")
+        write_model_file(fp32_path, lambda tmp_path: export_onnx_encoder(embed_loader, tmp_path))
+    path = fp32_path
+    if quantized:
+        path = onnx_model_path(model_dir, model_name, embed_loader.layer, quantized=True)
+        if not os.path.exists(path):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            logger.info(f"Quantizing alignment encoder to {path}")
+            write_model_file(path, lambda tmp_path: quantize_dynamic(fp32_path, tmp_path, weight_type=QuantType.QInt8))
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return onnxruntime.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+
+def apply_inference_backend(sentence_aligner, backend: str, model_dir: str, model_name: str) -> str:
+    """
+    Switch a loaded SentenceAligner to the requested inference backend
+
+    Returns:
+        The backend actually in use ("torch" when the requested one is unknown or fails to load)
+    """
+    if backend not in BACKENDS:
+        logger.warning(f"Unknown alignment backend {backend!r}, using torch (choose from {', '.join(BACKENDS)})")
+        return "torch"
+    if backend == "torch":
+        return backend
+
+    embed_loader = sentence_aligner.embed_loader
+    try:
+        if backend == "torch_int8":
+            import torch
+            embed_loader.emb_model = torch.quantization.quantize_dynamic(
+                embed_loader.emb_model.cpu(), {torch.nn.Linear}, dtype=torch.qint8
+            )
+            embed_loader.device = torch.device("cpu")
+            return backend
+
+        if not ONNXRUNTIME_AVAILABLE:
+            logger.warning("onnxruntime not available, using torch. Install with: pip install -r requirements_onnx.txt")
+            return "torch"
+        session = load_onnx_session(embed_loader, model_dir, model_name, quantized=backend == "onnx_int8")
+        sentence_aligner.embed_loader = OnnxEmbeddingLoader(embed_loader.tokenizer, session, embed_loader.layer)
+        return backend
+    except Exception as e:
+        logger.error(f"Failed to set up the {backend} alignment backend, using torch: {e}")
+        return "torch"
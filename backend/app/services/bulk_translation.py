@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Bulk Verse Translation
+Translates whole chapters or books by packing many verses into one chat prompt (up to a token
+budget), parsing the per-verse results and writing each batch to the verse cache tables in a
+single transaction. Progress is checkpointed to a JSON file so an interrupted run picks up where it
+stopped; verses already in translation_cache are skipped as well.
+
+The rows use the same cache keys and tables as /dictionary/translate (translations and
+alignments in the normalized verse tables, a translation_cache row marking the key), so the
+endpoint answers bulk-translated verses from the cache.
+"""
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend.app.db.payload_codec import get_payload_codec
+from backend.app.db.sqlite_pool import get_pool
+from backend.app.services.enhanced_dictionary import INSERT_TRANSLATION_SQL, EnhancedDictionary
+from backend.app.services.rate_limiter import chat_completion, estimate_tokens
+from backend.app.services.verse_cache_store import get_verse_cache_store
+
+LANGUAGE_NAMES = {
+    "en": "English",
+    "es": "Spanish",
+    "fr": "French",
+    "it": "Italian",
+    "pt": "Portuguese",
+    "de": "German",
+    "la": "Latin",
+    "sa": "Sanskrit",
+    "hi": "Hindi"
+}
+
+# Prompt tokens per batch (verses are added until the estimate would pass this)
+DEFAULT_TOKEN_BUDGET = 3000
+# Completion tokens allowed per verse (two translations of one verse)
+COMPLETION_TOKENS_PER_VERSE = 160
+MAX_VERSES_PER_BATCH = 40
+
+Verse = Tuple[str, str]  # (reference, text)
+
+
+def translation_cache_key(reference: str, target_language: str) -> str:
+    """Key used by /dictionary/translate for translation_cache rows"""
+    return EnhancedDictionary.translation_cache_key(reference, target_language)
+
+
+def build_messages(batch: Sequence[Verse], target_language: str, source_language: str = "latin") -> List[Dict[str, str]]:
+    """Chat messages asking for literal and dynamic translations of every verse in the batch"""
+    target_name = LANGUAGE_NAMES.get(target_language, target_language)
+    source_name = "Sanskrit" if source_language == "sanskrit" else "Latin"
+    verses = [{"id": index, "text": text} for index, (_, text) in enumerate(batch)]
+    prompt = f"""Translate each {source_name} verse below to {target_name}.
+
+For every verse give:
+1. literal: word-for-word translation
+2. dynamic: natural, flowing translation
+
+Verses (JSON):
+{json.dumps(verses, ensure_ascii=False)}
+
+Return ONLY valid JSON (no explanations), one entry per verse id:
+{{"translations": [{{"id": 0, "literal": "...", "dynamic": "..."}}]}}"""
+    return [
+        {"role": "system", "content": f"You are a precise translator. Return ONLY valid JSON with translations in {target_name}. No explanations, no extra text."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def pack_batches(verses: Sequence[Verse], target_language: str, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 max_verses: int = MAX_VERSES_PER_BATCH) -> List[List[Verse]]:
+    """Greedily group consecutive verses so each prompt stays within token_budget"""
+    overhead = estimate_tokens(build_messages([], target_language))
+    batches: List[List[Verse]] = []
+    batch: List[Verse] = []
+    used = overhead
+    for verse in verses:
+        cost = len(verse[1]) // 4 + 12  # text plus its JSON wrapping
+        if batch and (used + cost > token_budget or len(batch) >= max_verses):
+            batches.append(batch)
+            batch, used = [], overhead
+        batch.append(verse)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def parse_batch_response(content: str, batch: Sequence[Verse]) -> Dict[str, Dict[str, str]]:
+    """Map reference -> {"literal", "dynamic"} for the verses the model answered"""
+    content = content.strip()
+    if content.startswith('```'):
+        content = content.strip('`')
+        if content.startswith('json'):
+            content = content[4:]
+    data = json.loads(content)
+    entries = data.get("translations", []) if isinstance(data, dict) else data
+    results = {}
+    for entry in entries:
+        try:
+            index = int(entry["id"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        literal, dynamic = entry.get("literal"), entry.get("dynamic")
+        if 0 <= index < len(batch) and literal and dynamic:
+            results[batch[index][0]] = {"literal": literal, "dynamic": dynamic}
+    return results
+
+
+class BulkTranslator:
+    """Translates lists of verses into translation_cache, batch by batch"""
+
+    def __init__(self, client, database_path: str, target_language: str = "en", model: str = "gpt-4",
+                 token_budget: int = DEFAULT_TOKEN_BUDGET, checkpoint_path: Optional[str] = None,
+                 detect_source_language: Optional[Callable[[str], str]] = None,
+                 aligner=None):
+        """
+        Args:
+            client: OpenAI-compatible client (anything with chat.completions.create)
+            database_path: Database holding translation_cache (the EnhancedDictionary cache DB)
+            checkpoint_path: JSON file recording finished verses, for resuming
+            detect_source_language: Returns "latin" or "sanskrit" for a verse text
+            aligner: Optional WordAligner; when given, word alignments are cached too
+        """
+        self.client = client
+        self.db = get_pool(database_path)
+        self.store = get_verse_cache_store(database_path)
+        self.codec = get_payload_codec(database_path)
+        self.target_language = target_language
+        self.model = model
+        self.token_budget = token_budget
+        self.checkpoint_path = checkpoint_path
+        self.detect_source_language = detect_source_language or (lambda text: "latin")
+        self.aligner = aligner
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS translation_cache (
+                cache_key TEXT PRIMARY KEY,
+                translation_data TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        self.done = self._load_checkpoint()
+        self.stats = {"batches": 0, "upstream_calls": 0, "translated": 0, "skipped": 0, "failed": 0}
+
+    def _load_checkpoint(self) -> set:
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            if checkpoint.get("target_language") == self.target_language:
+                return set(checkpoint.get("done", []))
+        return set()
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"target_language": self.target_language, "done": sorted(self.done),
+                       "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")}, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def pending(self, verses: Sequence[Verse]) -> List[Verse]:
+        """Verses neither checkpointed nor already in translation_cache"""
+        pending = []
+        for reference, text in verses:
+            if not text or not text.strip() or reference in self.done:
+                continue
+            key = translation_cache_key(reference, self.target_language)
+            if self.db.fetchone('SELECT 1 FROM translation_cache WHERE cache_key = ?', (key,)):
+                self.done.add(reference)
+                continue
+            pending.append((reference, text))
+        self.stats["skipped"] += len(verses) - len(pending)
+        return pending
+
+    def translate_batch(self, batch: Sequence[Verse]) -> Dict[str, Dict[str, str]]:
+        """One upstream call for the batch; verses the model dropped are retried in halves"""
+        source_language = self.detect_source_language(batch[0][1])
+        messages = build_messages(batch, self.target_language, source_language)
+        self.stats["upstream_calls"] += 1
+        try:
+            response = chat_completion(
+                self.client,
+                priority="batch",
+                model=self.model,
+                messages=messages,
+                max_tokens=COMPLETION_TOKENS_PER_VERSE * len(batch),
+                temperature=0.2
+            )
+            results = parse_batch_response(response.choices[0].message.content, batch)
+        except (json.JSONDecodeError, AttributeError, IndexError) as e:
+            print(f"Unparseable response for a batch of {len(batch)} verses: {e}")
+            results = {}
+
+        missing = [verse for verse in batch if verse[0] not in results]
+        if missing and len(batch) > 1:
+            middle = len(missing) // 2 or 1
+            for part in (missing[:middle], missing[middle:]):
+                if part:
+                    results.update(self.translate_batch(part))
+        return results
+
+    def _align_batch(self, batch: Sequence[Verse], results: Dict[str, Dict[str, str]]) -> Dict[str, Tuple[Dict, Dict]]:
+        """reference -> formatted (literal, dynamic) alignments; the whole batch shares forward passes"""
+        by_language: Dict[str, List[Verse]] = {}
+        for reference, text in batch:
+            if reference in results:
+                by_language.setdefault(self.detect_source_language(text), []).append((reference, text))
+        aligned = {}
+        for source_language, verses in by_language.items():
+            pairs = [(text, results[reference][kind]) for reference, text in verses for kind in ("literal", "dynamic")]
+            formatted = [self.aligner.format_alignment_response(result)
+                         for result in self.aligner.align_pairs(pairs, source_language)]
+            for index, (reference, _) in enumerate(verses):
+                aligned[reference] = (formatted[2 * index], formatted[2 * index + 1])
+        return aligned
+
+    def _cache_rows(self, batch: Sequence[Verse], results: Dict[str, Dict[str, str]]) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """(cache_key, reference, payload) for every translated verse of the batch"""
+        alignments = self._align_batch(batch, results) if self.aligner is not None else {}
+        rows = []
+        for reference, text in batch:
+            translation = results.get(reference)
+            if not translation:
+                continue
+            source_language = self.detect_source_language(text)
+            data = {
+                "translation": translation["literal"],
+                "literal": translation["literal"],
+                "dynamic": translation["dynamic"],
+                "source_language": source_language
+            }
+            if reference in alignments:
+                literal, dynamic = alignments[reference]
+                data["word_alignments"] = {
+                    "literal": literal["alignments"],
+                    "dynamic": dynamic["alignments"],
+                    "method": literal.get("method", "fallback"),
+                    "literal_confidence": literal.get("average_confidence", 0.0),
+                    "dynamic_confidence": dynamic.get("average_confidence", 0.0),
+                    "average_confidence": (literal.get("average_confidence", 0.0) +
+                                           dynamic.get("average_confidence", 0.0)) / 2
+                }
+            key = translation_cache_key(reference, self.target_language)
+            rows.append((key, reference, data))
+        return rows
+
+    def run(self, verses: Sequence[Verse], progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Translate every pending verse; returns counters"""
+        start = time.perf_counter()
+        for batch in pack_batches(self.pending(verses), self.target_language, self.token_budget):
+            results = self.translate_batch(batch)
+            rows = self._cache_rows(batch, results)
+            if rows:
+                with self.db.transaction() as cursor:
+                    for key, reference, data in rows:
+                        extras = self.store.save_translation_payload(reference, self.target_language, data, cursor=cursor)
+                        cursor.execute(INSERT_TRANSLATION_SQL, (key, self.codec.encode(extras)))
+            self.done.update(reference for reference, _ in batch if reference in results)
+            self._save_checkpoint()
+            self.stats["batches"] += 1
+            self.stats["translated"] += len(rows)
+            self.stats["failed"] += len(batch) - len(rows)
+            if progress:
+                progress(dict(self.stats, last_reference=batch[-1][0]))
+        self.stats["seconds"] = round(time.perf_counter() - start, 2)
+        return self.stats
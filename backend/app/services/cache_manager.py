@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Cache Manager
+The one place that knows where the cache databases live (from Settings), hands out their shared
+connection pools, checks them at startup and counts hits and misses per cache, so a cache that
+cannot be written shows up at boot and in /dictionary/stats instead of failing silently.
+
+Databases:
+    word_cache      WORD_CACHE_DB: word_cache, word_verse_relationships, translation_cache,
+                    verse_analysis_cache and the verse translation/alignment tables
+    analysis        ANALYSIS_DB: VulgateAnalyzer verse analyses
+    macronization   MACRONIZATION_CACHE_DB: macronized verses
+    embeddings      ALIGNMENT_EMBEDDING_CACHE_DB: source-verse embeddings for word alignment
+"""
+
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Optional
+
+from backend.app.core.config import settings
+from backend.app.db.payload_codec import PayloadCodec, get_payload_codec
+from backend.app.db.sqlite_pool import SQLitePool, get_pool
+from backend.app.services.verse_cache_store import VerseCacheStore, get_verse_cache_store
+
+# Tables the self-check expects once the database has been set up
+REQUIRED_TABLES = {
+    "word_cache": ("word_cache", "translation_cache", "verse_analysis_cache",
+                   "verse_translations", "verse_alignment_sets", "verse_alignments"),
+}
+
+
+class CacheCounters:
+    """Hits, misses and errors per cache name (word, translation, alignment, verse_analysis, ...)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, cache: str, hit: bool, count: int = 1):
+        with self._lock:
+            self._counts[cache]["hits" if hit else "misses"] += count
+
+    def error(self, cache: str):
+        with self._lock:
+            self._counts[cache]["errors"] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for cache, counts in sorted(self._counts.items()):
+                lookups = counts["hits"] + counts["misses"]
+                result[cache] = {
+                    "hits": counts["hits"],
+                    "misses": counts["misses"],
+                    "errors": counts["errors"],
+                    "hit_rate": round(counts["hits"] / lookups, 4) if lookups else 0.0
+                }
+            return result
+
+
+# Process-wide, so services count without needing the manager (or its settings) to exist
+cache_counters = CacheCounters()
+
+
+class CacheManager:
+    """Owns the cache database paths, pools and counters"""
+
+    def __init__(self, word_cache_path: str, analysis_path: str, macronization_path: Optional[str] = None,
+                 embedding_cache_path: Optional[str] = None):
+        self.paths = {"word_cache": os.path.abspath(word_cache_path),
+                      "analysis": os.path.abspath(analysis_path)}
+        if macronization_path:
+            self.paths["macronization"] = os.path.abspath(macronization_path)
+        if embedding_cache_path:
+            self.paths["embeddings"] = os.path.abspath(embedding_cache_path)
+        self.counters = cache_counters
+        self.last_check: Optional[Dict[str, Any]] = None
+
+    @property
+    def word_cache_path(self) -> str:
+        return self.paths["word_cache"]
+
+    @property
+    def analysis_db_path(self) -> str:
+        return self.paths["analysis"]
+
+    @property
+    def embedding_cache_path(self) -> str:
+        return self.paths.get("embeddings") or os.path.join(os.path.dirname(self.word_cache_path), "alignment_embeddings.db")
+
+    def pool(self, name: str) -> SQLitePool:
+        """The shared connection pool of a cache database ("word_cache", "analysis", ...)"""
+        return get_pool(self.paths[name])
+
+    @property
+    def verse_store(self) -> VerseCacheStore:
+        return get_verse_cache_store(self.word_cache_path)
+
+    @property
+    def codec(self) -> PayloadCodec:
+        return get_payload_codec(self.word_cache_path)
+
+    def _check_database(self, name: str, path: str) -> Dict[str, Any]:
+        directory = os.path.dirname(path)
+        result: Dict[str, Any] = {"path": path, "exists": os.path.exists(path), "ok": False}
+        if not result["exists"]:
+            # Created by its owner on first use; that only works if the directory is writable
+            result["ok"] = os.path.isdir(directory) and os.access(directory, os.W_OK)
+            result["detail"] = "not created yet" if result["ok"] else f"directory {directory} is not writable"
+            return result
+        try:
+            pool = self.pool(name)
+            result["integrity"] = pool.fetchone("PRAGMA quick_check")[0]
+            result["journal_mode"] = pool.fetchone("PRAGMA journal_mode")[0]
+            # Take (and release) the write lock: fails for read-only files and directories
+            conn = pool.connection()
+            conn.execute("BEGIN IMMEDIATE")
+            conn.rollback()
+            result["writable"] = True
+            tables = {row[0] for row in pool.fetchall("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            missing = [table for table in REQUIRED_TABLES.get(name, ()) if table not in tables]
+            if missing:
+                result["missing_tables"] = missing
+            result["ok"] = result["integrity"] == "ok" and not missing
+        except Exception as e:
+            result.setdefault("writable", False)
+            result["detail"] = str(e)
+        return result
+
+    def self_check(self) -> Dict[str, Any]:
+        """Check every cache database (integrity, write access, schema); prints and returns the report"""
+        start = time.perf_counter()
+        databases = {name: self._check_database(name, path) for name, path in self.paths.items()}
+        self.last_check = {
+            "ok": all(entry["ok"] for entry in databases.values()),
+            "checked_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seconds": round(time.perf_counter() - start, 3),
+            "databases": databases
+        }
+        for name, entry in databases.items():
+            status = "✅" if entry["ok"] else "❌"
+            detail = entry.get("detail") or ", ".join(
+                f"{key}={entry[key]}" for key in ("integrity", "journal_mode", "missing_tables") if key in entry)
+            print(f"{status} Cache {name}: {entry['path']} ({detail})")
+        return self.last_check
+
+    def stats(self) -> Dict[str, Any]:
+        databases = {}
+        for name, path in self.paths.items():
+            databases[name] = {
+                "path": path,
+                "size_bytes": os.path.getsize(path) if os.path.exists(path) else 0,
+                "pool": self.pool(name).stats() if os.path.exists(path) else None
+            }
+        return {
+            "databases": databases,
+            "hit_rates": self.counters.stats(),
+            "self_check_ok": self.last_check["ok"] if self.last_check else None
+        }
+
+    def close(self):
+        """Close the pooled connections of every cache database"""
+        for name, path in self.paths.items():
+            if os.path.exists(path):
+                self.pool(name).close_all()
+
+
+_manager: Optional[CacheManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_cache_manager() -> CacheManager:
+    """The process-wide cache manager, built from settings on first use"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = CacheManager(settings.WORD_CACHE_DB, settings.ANALYSIS_DB, settings.MACRONIZATION_CACHE_DB,
+                                    settings.ALIGNMENT_EMBEDDING_CACHE_DB)
+        return _manager
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Source Embedding Cache
+Persistent cache of the subword embeddings of tokenized source verses, so aligning a verse
+against one more target language only runs the encoder on the target side.
+
+Entries are keyed by a hash of the tokenized verse and the model name, stored as float16 BLOBs
+in SQLite (about 1.5 KB per subword for 768 dimensions) and evicted least recently used once
+the table grows past its byte budget.
+"""
+
+import hashlib
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.app.core.config import settings
+from backend.app.db.sqlite_pool import get_pool
+from backend.app.services.cache_manager import cache_counters, get_cache_manager
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS source_embeddings (
+        text_hash TEXT NOT NULL,
+        model TEXT NOT NULL,
+        subwords INTEGER NOT NULL,
+        dims INTEGER NOT NULL,
+        vectors BLOB NOT NULL,
+        subword_to_word BLOB NOT NULL,
+        size_bytes INTEGER NOT NULL,
+        last_used REAL NOT NULL,
+        PRIMARY KEY (text_hash, model)
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_source_embeddings_last_used ON source_embeddings(last_used)',
+]
+
+SELECT_EMBEDDINGS_SQL = '''
+    SELECT text_hash, subwords, dims, vectors, subword_to_word FROM source_embeddings
+    WHERE model = ? AND text_hash IN ({placeholders})
+'''
+INSERT_EMBEDDING_SQL = '''
+    INSERT OR REPLACE INTO source_embeddings
+    (text_hash, model, subwords, dims, vectors, subword_to_word, size_bytes, last_used)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+SELECT_SIZES_SQL = '''
+    SELECT COALESCE(SUM(size_bytes), 0) FROM source_embeddings
+    WHERE model = ? AND text_hash IN ({placeholders})
+'''
+TOUCH_EMBEDDING_SQL = 'UPDATE source_embeddings SET last_used = ? WHERE text_hash = ? AND model = ?'
+
+# Eviction trims the table to this fraction of the budget, so it does not run on every insert
+EVICTION_TARGET = 0.9
+LOOKUP_CHUNK = 500
+
+Embedding = Tuple[Any, List[int]]  # (subwords x dims float32 array, subword index -> word index)
+
+
+def sentence_hash(words: Sequence[str]) -> str:
+    """Key of a tokenized sentence (the aligner's tokens, so tokenization changes re-embed)"""
+    return hashlib.sha1("\x1f".join(words).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """float16 subword embeddings in SQLite with a byte budget and LRU eviction"""
+
+    def __init__(self, database_path: str, max_bytes: int):
+        self.database_path = database_path
+        self.max_bytes = max_bytes
+        self.db = get_pool(database_path)
+        self._lock = threading.Lock()
+        with self.db.transaction() as cursor:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+        self.total_bytes = self.db.fetchone('SELECT COALESCE(SUM(size_bytes), 0) FROM source_embeddings')[0]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, keys: Sequence[str], model: str) -> Dict[str, Embedding]:
+        """Cached embeddings for the keys that have one (and mark them as recently used)"""
+        found: Dict[str, Embedding] = {}
+        keys = list(dict.fromkeys(keys))
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[start:start + LOOKUP_CHUNK]
+            sql = SELECT_EMBEDDINGS_SQL.format(placeholders=", ".join("?" * len(chunk)))
+            for key, subwords, dims, vectors, subword_to_word in self.db.fetchall(sql, [model] + chunk):
+                matrix = np.frombuffer(vectors, dtype=np.float16).reshape(subwords, dims).astype(np.float32)
+                found[key] = (matrix, array("I", subword_to_word).tolist())
+        if found:
+            now = time.time()
+            self.db.executemany(TOUCH_EMBEDDING_SQL, [(now, key, model) for key in found])
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        cache_counters.record("source_embedding", True, len(found))
+        cache_counters.record("source_embedding", False, len(keys) - len(found))
+        return found
+
+    def put_many(self, entries: Dict[str, Embedding], model: str):
+        """Store embeddings (float32 arrays are kept as float16), then evict down to the budget"""
+        rows = []
+        added = 0
+        now = time.time()
+        for key, (vectors, subword_to_word) in entries.items():
+            data = np.ascontiguousarray(vectors, dtype=np.float16).tobytes()
+            mapping = array("I", subword_to_word).tobytes()
+            size = len(data) + len(mapping)
+            rows.append((key, model, vectors.shape[0], vectors.shape[1], data, mapping, size, now))
+            added += size
+        if not rows:
+            return
+        keys = [row[0] for row in rows]
+        with self._lock:
+            with self.db.transaction() as cursor:
+                # INSERT OR REPLACE drops the previous row of a key that was stored before
+                replaced = 0
+                for start in range(0, len(keys), LOOKUP_CHUNK):
+                    chunk = keys[start:start + LOOKUP_CHUNK]
+                    cursor.execute(SELECT_SIZES_SQL.format(placeholders=", ".join("?" * len(chunk))), [model] + chunk)
+                    replaced += cursor.fetchone()[0]
+                cursor.executemany(INSERT_EMBEDDING_SQL, rows)
+            self.total_bytes += added - replaced
+            over_budget = self.total_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the table is under EVICTION_TARGET of the budget"""
+        with self._lock:
+            with self.db.transaction() as cursor:
+                # Recount: other processes (the warm-up script) write to the same table
+                cursor.execute('SELECT COALESCE(SUM(size_bytes), 0) FROM source_embeddings')
+                total = cursor.fetchone()[0]
+                excess = total - int(self.max_bytes * EVICTION_TARGET)
+                removed = 0
+                if excess > 0:
+                    cursor.execute('SELECT rowid, size_bytes FROM source_embeddings ORDER BY last_used')
+                    victims = []
+                    for rowid, size in cursor.fetchall():
+                        if excess <= 0:
+                            break
+                        victims.append((rowid,))
+                        excess -= size
+                        total -= size
+                    cursor.executemany('DELETE FROM source_embeddings WHERE rowid = ?', victims)
+                    removed = len(victims)
+            self.total_bytes = total
+            self.evictions += removed
+            return removed
+
+    def clear(self):
+        with self._lock:
+            self.db.execute('DELETE FROM source_embeddings')
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "database": self.database_path,
+                "entries": self.db.fetchone('SELECT COUNT(*) FROM source_embeddings')[0],
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions
+            }
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """The shared source-embedding cache from settings, or None when disabled or numpy is missing"""
+    global _cache
+    if not NUMPY_AVAILABLE or settings.ALIGNMENT_EMBEDDING_CACHE_MB <= 0:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache(get_cache_manager().embedding_cache_path,
+                                    settings.ALIGNMENT_EMBEDDING_CACHE_MB * 1024 * 1024)
+        return _cache
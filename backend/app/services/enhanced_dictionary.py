@@ -1,10 +1,18 @@
 from typing import Optional, Dict, Any, List
 import json
 from datetime import datetime
-import sqlite3
 import os
+import time
 from dataclasses import dataclass
 from backend.app.core.config import settings
+from backend.app.db.payload_codec import get_payload_codec
+from backend.app.db.sqlite_pool import get_pool
+from backend.app.db.write_buffer import get_write_buffer
+from backend.app.services.cache_manager import cache_counters
+from backend.app.services.rate_limiter import chat_completion
+from backend.app.services.single_flight import SingleFlight
+from backend.app.services.verse_cache_store import get_verse_cache_store
+from backend.app.utils.lru_cache import LRUCache
 from backend.app.models.verse_analysis import VerseAnalysis, GrammarBreakdown, InterpretationLayer
 
 # Try to import OpenAI
@@ -15,6 +23,62 @@ except ImportError:
     OPENAI_AVAILABLE = False
     OpenAI = None
 
+# Statements are kept as constants so each pooled connection prepares them once
+SELECT_WORD_SQL = '''
+    SELECT word, latin, definition, etymology, part_of_speech,
+           morphology, pronunciation, source, confidence, theological_interpretation
+    FROM word_cache
+    WHERE word = ? AND language_code = ?
+'''
+INSERT_WORD_SQL = '''
+    INSERT OR REPLACE INTO word_cache
+    (word, latin, definition, etymology, part_of_speech, morphology,
+     pronunciation, source, confidence, theological_interpretation, language_code)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+# Words per "WHERE word IN (...)" query, below SQLite's bound-variable limit
+LOOKUP_IN_CHUNK = 500
+SELECT_WORDS_SQL = '''
+    SELECT word, latin, definition, etymology, part_of_speech,
+           morphology, pronunciation, source, confidence, theological_interpretation
+    FROM word_cache
+    WHERE language_code = ? AND word IN ({placeholders})
+'''
+SELECT_VERSES_FOR_WORD_SQL = '''
+    SELECT verse_reference, verse_text, position
+    FROM word_verse_relationships
+    WHERE word = ? AND language_code = ?
+    ORDER BY verse_reference
+'''
+INSERT_WORD_VERSE_SQL = '''
+    INSERT OR IGNORE INTO word_verse_relationships
+    (word, verse_reference, verse_text, position, language_code)
+    VALUES (?, ?, ?, ?, ?)
+'''
+SELECT_VERSE_ANALYSIS_SQL = '''
+    SELECT verse_text, word_analysis_json, translations_json,
+           theological_layer_json, jungian_layer_json, cosmological_layer_json
+    FROM verse_analysis_cache
+    WHERE verse_reference = ? AND language_code = ?
+'''
+INSERT_VERSE_ANALYSIS_SQL = '''
+    INSERT OR REPLACE INTO verse_analysis_cache
+    (verse_reference, language_code, verse_text, word_analysis_json, translations_json,
+     theological_layer_json, jungian_layer_json, cosmological_layer_json, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+'''
+DELETE_WORD_SQL = 'DELETE FROM word_cache WHERE word = ? AND language_code = ?'
+SELECT_WORDS_FOR_VERSE_SQL = '''
+    SELECT DISTINCT word
+    FROM word_verse_relationships
+    WHERE verse_reference = ? AND language_code = ?
+    ORDER BY position
+'''
+SELECT_TRANSLATION_SQL = 'SELECT translation_data FROM translation_cache WHERE cache_key = ?'
+INSERT_TRANSLATION_SQL = 'INSERT OR REPLACE INTO translation_cache (cache_key, translation_data) VALUES (?, ?)'
+# Values of detect_source_language(); legacy translation_cache keys contain one
+SOURCE_LANGUAGES = ("latin", "sanskrit")
+
 @dataclass
 class WordInfo:
     latin: str
@@ -31,17 +95,32 @@ class EnhancedDictionary:
     """Enhanced dictionary with morphological analysis and OpenAI integration"""
     
     def __init__(self, database_path: str = None, openai_model: str = None):
-        self.database_path = database_path or settings.SQLITE_DB_PATH
+        self.database_path = database_path or settings.WORD_CACHE_DB
         self.cache_db = self.database_path  # For compatibility with existing code
         self.cache_db_path = self.database_path  # For new translation cache methods
         self.dictionary = {}  # Basic dictionary placeholder
+        self.db = get_pool(self.database_path)  # Per-thread WAL connections, shared per file
+        # Word cache and word-verse inserts are written behind, in batches
+        self.writes = get_write_buffer(self.database_path, settings.DICTIONARY_WRITE_BATCH_SIZE,
+                                       settings.DICTIONARY_WRITE_FLUSH_INTERVAL)
+        # (word, language_code) -> (WordInfo, expiry); not_found entries expire so words filled in
+        # by other processes (lexicon builder scripts) show up eventually
+        self.word_memory = LRUCache(settings.DICTIONARY_MEMORY_CACHE_SIZE)
+        self.negative_cache_ttl = settings.DICTIONARY_NEGATIVE_CACHE_TTL
+        self.negative_hits = 0
+        # Identical OpenAI analyses/translations already in flight are awaited, not repeated
+        self.inflight = SingleFlight()
         self.setup_database()
+        # Translations and alignments live in normalized tables next to word_cache
+        self.verse_store = get_verse_cache_store(self.database_path)
+        # JSON text or compact BLOBs for the payload columns (CACHE_COMPACT_PAYLOADS)
+        self.codec = get_payload_codec(self.database_path)
         # Check if OpenAI API key is available
         try:
             api_key = getattr(settings, 'OPENAI_API_KEY', None)
             self.openai_enabled = bool(OPENAI_AVAILABLE and api_key and api_key.strip())
             if self.openai_enabled:
-                self.openai_client = OpenAI(api_key=api_key)
+                self.openai_client = OpenAI(api_key=api_key, base_url=settings.OPENAI_BASE_URL)
             else:
                 self.openai_client = None
             # choose model (default cheap)
@@ -55,7 +134,7 @@ class EnhancedDictionary:
     def setup_database(self):
         """Set up the local cache database"""
         try:
-            conn = sqlite3.connect(self.database_path)
+            conn = self.db.connection()
             cursor = conn.cursor()
             
             # Create word cache table with language support
@@ -112,57 +191,134 @@ class EnhancedDictionary:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_word_verse_language ON word_verse_relationships(language_code)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_verse_analysis_language ON verse_analysis_cache(language_code)')
             
+            # Translation cache table (previously created on every save)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translation_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    translation_data TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
             conn.commit()
-            conn.close()
             print("Cache database initialized successfully")
         except Exception as e:
             print(f"Error setting up cache database: {e}")
     
+    def flush_writes(self) -> int:
+        """Write buffered cache inserts now; returns the number of rows written"""
+        return self.writes.flush()
+    
+    def close(self):
+        """Flush buffered writes and close the pooled database connections (on app shutdown)"""
+        self.writes.close()
+        self.db.close_all()
+    
+    def remember_word(self, word_info: WordInfo, word: str = None, language_code: str = 'la'):
+        """Put a WordInfo in the in-memory tier"""
+        expires = time.monotonic() + self.negative_cache_ttl if word_info.source == "not_found" else None
+        self.word_memory.put((word or word_info.latin, language_code), (word_info, expires))
+    
+    def forget_word(self, word: str, language_code: str = 'la'):
+        """Drop a word from the in-memory tier"""
+        self.word_memory.invalidate((word, language_code))
+    
+    def clear_memory_cache(self):
+        self.word_memory.clear()
+    
+    def get_memory_cache_stats(self) -> Dict[str, Any]:
+        """Hit ratio and size of the in-memory tier"""
+        stats = self.word_memory.stats()
+        stats['negative_hits'] = self.negative_hits
+        return stats
+    
     def get_from_cache(self, word: str, language_code: str = 'la') -> Optional[WordInfo]:
-        """Get word from local cache"""
+        """Get word from local cache (memory first, then SQLite)"""
+        key = (word, language_code)
+        entry = self.word_memory.get(key)
+        if entry is not None:
+            word_info, expires = entry
+            if expires is None:
+                cache_counters.record("word", True)
+                return word_info
+            if time.monotonic() < expires:
+                self.negative_hits += 1
+                cache_counters.record("word", True)
+                return word_info
+            self.word_memory.invalidate(key)
+        
         try:
-            conn = sqlite3.connect(self.database_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT word, latin, definition, etymology, part_of_speech, 
-                       morphology, pronunciation, source, confidence, theological_interpretation 
-                FROM word_cache 
-                WHERE word = ? AND language_code = ?
-            ''', (word, language_code))
-            result = cursor.fetchone()
-            conn.close()
+            # A row still waiting in the write buffer is as good as cached
+            pending = self.writes.pending(INSERT_WORD_SQL, key)
+            if pending is not None:
+                result = pending[:10]
+            else:
+                result = self.db.fetchone(SELECT_WORD_SQL, key)
             
+            cache_counters.record("word", bool(result))
             if result:
-                print(f"Cache HIT for '{word}' in {language_code} - using cached result")
-                return WordInfo(
-                    latin=result[1],
-                    definition=result[2],
-                    etymology=result[3],
-                    part_of_speech=result[4],
-                    morphology=result[5],
-                    pronunciation=result[6],
-                    source=result[7],
-                    confidence=result[8],
-                    theological_interpretation=result[9] or ""
-                )
-            else:
-                print(f"Cache MISS for '{word}' in {language_code} - will lookup and cache")
+                word_info = self._word_info_from_row(result)
+                self.remember_word(word_info, word, language_code)
+                return word_info
             return None
         except Exception as e:
+            cache_counters.error("word")
             print(f"Cache lookup error for '{word}': {e}")
             return None
     
+    def get_many_from_cache(self, words: List[str], language_code: str = 'la') -> Dict[str, WordInfo]:
+        """Get several words from the cache at once: memory first, then one IN query per chunk.
+        Words that are not cached are missing from the result."""
+        found = {}
+        remaining = []
+        for word in dict.fromkeys(words):
+            key = (word, language_code)
+            entry = self.word_memory.get(key)
+            if entry is not None and (entry[1] is None or time.monotonic() < entry[1]):
+                if entry[1] is not None:
+                    self.negative_hits += 1
+                found[word] = entry[0]
+                continue
+            pending = self.writes.pending(INSERT_WORD_SQL, key)
+            if pending is not None:
+                found[word] = self._word_info_from_row(pending)
+            else:
+                remaining.append(word)
+        
+        try:
+            for start in range(0, len(remaining), LOOKUP_IN_CHUNK):
+                chunk = remaining[start:start + LOOKUP_IN_CHUNK]
+                sql = SELECT_WORDS_SQL.format(placeholders=", ".join("?" * len(chunk)))
+                for row in self.db.fetchall(sql, [language_code] + chunk):
+                    found[row[0]] = self._word_info_from_row(row)
+        except Exception as e:
+            cache_counters.error("word")
+            print(f"Batch cache lookup error for {len(remaining)} words: {e}")
+        
+        for word in remaining:
+            if word in found:
+                self.remember_word(found[word], word, language_code)
+        cache_counters.record("word", True, len(found))
+        cache_counters.record("word", False, len(set(words)) - len(found))
+        return found
+    
+    def _word_info_from_row(self, row) -> WordInfo:
+        return WordInfo(
+            latin=row[1],
+            definition=row[2],
+            etymology=row[3],
+            part_of_speech=row[4],
+            morphology=row[5],
+            pronunciation=row[6],
+            source=row[7],
+            confidence=row[8],
+            theological_interpretation=row[9] or ""
+        )
+    
     def save_to_cache(self, word_info: WordInfo, language_code: str = 'la'):
         """Save word to local cache"""
         try:
-            conn = sqlite3.connect(self.database_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO word_cache 
-                (word, latin, definition, etymology, part_of_speech, morphology, 
-                 pronunciation, source, confidence, theological_interpretation, language_code)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            self.writes.add(INSERT_WORD_SQL, (
                 word_info.latin,
                 word_info.latin,
                 word_info.definition or '',
@@ -174,9 +330,8 @@ class EnhancedDictionary:
                 word_info.confidence or 0.0,
                 word_info.theological_interpretation or '',
                 language_code
-            ))
-            conn.commit()
-            conn.close()
+            ), key=(word_info.latin, language_code))
+            self.remember_word(word_info, language_code=language_code)
             print(f"CACHED: '{word_info.latin}' saved to database in {language_code}")
         except Exception as e:
             print(f"Cache save error for '{word_info.latin}': {e}")
@@ -184,16 +339,8 @@ class EnhancedDictionary:
     def get_verses_for_word(self, word: str, language_code: str = 'la') -> List[Dict[str, Any]]:
         """Get all verses where a word appears"""
         try:
-            conn = sqlite3.connect(self.database_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT verse_reference, verse_text, position 
-                FROM word_verse_relationships 
-                WHERE word = ? AND language_code = ?
-                ORDER BY verse_reference
-            ''', (word, language_code))
-            results = cursor.fetchall()
-            conn.close()
+            self.writes.flush()
+            results = self.db.fetchall(SELECT_VERSES_FOR_WORD_SQL, (word, language_code))
             
             return [
                 {
@@ -210,74 +357,47 @@ class EnhancedDictionary:
     def add_word_verse_relationship(self, word: str, verse_reference: str, verse_text: str, position: int = 0, language_code: str = 'la'):
         """Add a word-verse relationship to track where words appear"""
         try:
-            conn = sqlite3.connect(self.database_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR IGNORE INTO word_verse_relationships 
-                (word, verse_reference, verse_text, position, language_code)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (word, verse_reference, verse_text, position, language_code))
-            conn.commit()
-            conn.close()
+            self.writes.add(INSERT_WORD_VERSE_SQL, (word, verse_reference, verse_text, position, language_code))
         except Exception as e:
             print(f"Error adding word-verse relationship for '{word}' in {verse_reference}: {e}")
     
     def get_verse_analysis_from_cache(self, verse_reference: str, language_code: str = 'la') -> Optional[Dict[str, Any]]:
         """Get complete verse analysis from cache"""
         try:
-            conn = sqlite3.connect(self.database_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT verse_text, word_analysis_json, translations_json, 
-                       theological_layer_json, jungian_layer_json, cosmological_layer_json
-                FROM verse_analysis_cache 
-                WHERE verse_reference = ? AND language_code = ?
-            ''', (verse_reference, language_code))
-            
-            result = cursor.fetchone()
-            conn.close()
+            result = self.db.fetchone(SELECT_VERSE_ANALYSIS_SQL, (verse_reference, language_code))
+            cache_counters.record("verse_analysis", bool(result))
             
             if result:
                 return {
                     "success": True,
                     "verse_text": result[0],
-                    "word_analysis": json.loads(result[1]) if result[1] else [],
-                    "translations": json.loads(result[2]) if result[2] else {},
-                    "theological_layer": json.loads(result[3]) if result[3] else [],
-                    "symbolic_layer": json.loads(result[4]) if result[4] else [],
-                    "cosmological_layer": json.loads(result[5]) if result[5] else [],
+                    "word_analysis": self.codec.decode(result[1], []),
+                    "translations": self.codec.decode(result[2], {}),
+                    "theological_layer": self.codec.decode(result[3], []),
+                    "symbolic_layer": self.codec.decode(result[4], []),
+                    "cosmological_layer": self.codec.decode(result[5], []),
                     "source": "cache"
                 }
             return None
         except Exception as e:
+            cache_counters.error("verse_analysis")
             print(f"Error getting verse analysis from cache: {e}")
             return None
     
     def save_verse_analysis_to_cache(self, verse_reference: str, verse_text: str, analysis_data: Dict[str, Any], language_code: str = 'la'):
         """Save complete verse analysis to cache"""
         try:
-            conn = sqlite3.connect(self.database_path)
-            cursor = conn.cursor()
-            
-            word_analysis_json = json.dumps(analysis_data.get("word_analysis", []))
-            translations_json = json.dumps(analysis_data.get("translations", {}))
-            theological_json = json.dumps(analysis_data.get("theological_layer", []))
-            jungian_json = json.dumps(analysis_data.get("symbolic_layer", []))
-            cosmological_json = json.dumps(analysis_data.get("cosmological_layer", []))
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO verse_analysis_cache 
-                (verse_reference, language_code, verse_text, word_analysis_json, translations_json, 
-                 theological_layer_json, jungian_layer_json, cosmological_layer_json, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (verse_reference, language_code, verse_text, word_analysis_json, translations_json, 
-                  theological_json, jungian_json, cosmological_json))
+            word_analysis_json = self.codec.encode(analysis_data.get("word_analysis", []))
+            translations_json = self.codec.encode(analysis_data.get("translations", {}))
+            theological_json = self.codec.encode(analysis_data.get("theological_layer", []))
+            jungian_json = self.codec.encode(analysis_data.get("symbolic_layer", []))
+            cosmological_json = self.codec.encode(analysis_data.get("cosmological_layer", []))
             
-            conn.commit()
-            conn.close()
+            self.db.execute(INSERT_VERSE_ANALYSIS_SQL, (verse_reference, language_code, verse_text, word_analysis_json,
+                                                        translations_json, theological_json, jungian_json, cosmological_json))
             print(f"Verse analysis cached for {verse_reference}")
         except Exception as e:
+            cache_counters.error("verse_analysis")
             print(f"Error saving verse analysis to cache: {e}")
     
     def analyze_verse(self, verse_text: str, verse_reference: str = "", language_code: str = 'la') -> Dict[str, Any]:
@@ -348,41 +468,34 @@ class EnhancedDictionary:
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get statistics about cached words"""
         try:
-            conn = sqlite3.connect(self.database_path)
-            cursor = conn.cursor()
-            
+            self.writes.flush()
             # Count total cached words
-            cursor.execute('SELECT COUNT(*) FROM word_cache')
-            total_cached = cursor.fetchone()[0]
+            total_cached = self.db.fetchone('SELECT COUNT(*) FROM word_cache')[0]
             
             # Count by source
-            cursor.execute('SELECT source, COUNT(*) FROM word_cache GROUP BY source')
-            source_breakdown = dict(cursor.fetchall())
-            
-            conn.close()
+            source_breakdown = dict(self.db.fetchall('SELECT source, COUNT(*) FROM word_cache GROUP BY source'))
             
             return {
                 'total_cached': total_cached,
                 'cache_file': self.database_path,
-                'source_breakdown': source_breakdown
+                'source_breakdown': source_breakdown,
+                'memory_cache': self.get_memory_cache_stats()
             }
         except Exception as e:
             print(f"Error getting cache stats: {e}")
             return {
                 'total_cached': 0,
                 'cache_file': self.database_path,
-                'source_breakdown': {}
+                'source_breakdown': {},
+                'memory_cache': self.get_memory_cache_stats()
             }
     
     def clear_word_cache(self, word: str, language_code: str = 'la') -> bool:
         """Clear a specific word from cache"""
         try:
-            conn = sqlite3.connect(self.database_path)
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM word_cache WHERE word = ? AND language_code = ?', (word, language_code))
-            rows_affected = cursor.rowcount
-            conn.commit()
-            conn.close()
+            self.forget_word(word, language_code)
+            self.writes.flush()
+            rows_affected = self.db.execute(DELETE_WORD_SQL, (word, language_code))
             return rows_affected > 0
         except Exception as e:
             print(f"Error clearing word cache for '{word}': {e}")
@@ -391,16 +504,8 @@ class EnhancedDictionary:
     def get_words_for_verse(self, verse_reference: str, language_code: str = 'la') -> List[str]:
         """Get all words tracked for a specific verse"""
         try:
-            conn = sqlite3.connect(self.database_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT DISTINCT word 
-                FROM word_verse_relationships 
-                WHERE verse_reference = ? AND language_code = ?
-                ORDER BY position
-            ''', (verse_reference, language_code))
-            words = [row[0] for row in cursor.fetchall()]
-            conn.close()
+            self.writes.flush()
+            words = [row[0] for row in self.db.fetchall(SELECT_WORDS_FOR_VERSE_SQL, (verse_reference, language_code))]
             return words
         except Exception as e:
             print(f"Error getting words for verse '{verse_reference}': {e}")
@@ -434,7 +539,8 @@ class EnhancedDictionary:
             }}
             """
             
-            response = self.openai_client.chat.completions.create(
+            response = chat_completion(
+                self.openai_client,
                 model=self.openai_model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
@@ -473,6 +579,11 @@ class EnhancedDictionary:
     
     def analyze_verse_with_openai(self, verse_text: str, verse_reference: str = "", language_code: str = 'la', target_analysis_language: str = 'en') -> Dict[str, Any]:
         """Perform comprehensive verse analysis using OpenAI with support for multiple analysis languages"""
+        key = ("analyze_verse_with_openai", verse_reference, verse_text, language_code, target_analysis_language)
+        return self.inflight.do(key, self._analyze_verse_with_openai, verse_text, verse_reference,
+                                language_code, target_analysis_language)
+    
+    def _analyze_verse_with_openai(self, verse_text: str, verse_reference: str, language_code: str, target_analysis_language: str) -> Dict[str, Any]:
         if not self.openai_enabled or not self.openai_client:
             return self.analyze_verse(verse_text, verse_reference, language_code)
         
@@ -573,7 +684,8 @@ Respond in JSON format with ALL text in {analysis_lang_name}:
 }}
 """
             
-            response = self.openai_client.chat.completions.create(
+            response = chat_completion(
+                self.openai_client,
                 model=self.openai_model,
                 messages=[
                     {"role": "system", "content": f"You are a multilingual scholar specializing in religious texts. Always provide analysis in {analysis_lang_name} as requested, never default to English unless specifically asked."},
@@ -633,6 +745,10 @@ Respond in JSON format with ALL text in {analysis_lang_name}:
     
     def translate_verse(self, verse_text: str, target_language: str = "en") -> str:
         """Translate verse to target language using OpenAI with proper source language detection"""
+        return self.inflight.do(("translate_verse", verse_text, target_language),
+                                self._translate_verse, verse_text, target_language)
+    
+    def _translate_verse(self, verse_text: str, target_language: str) -> str:
         if not self.openai_enabled or not self.openai_client:
             return f"Translation to {target_language} not available (OpenAI not enabled)"
         
@@ -694,7 +810,8 @@ Return ONLY valid JSON (no explanations):
 """
         
         try:
-            response = self.openai_client.chat.completions.create(
+            response = chat_completion(
+                self.openai_client,
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": f"You are a precise translator. Return ONLY valid JSON with translations in {target_lang_name}. No explanations, no extra text."},
@@ -845,7 +962,8 @@ Return ONLY valid JSON (no explanations):
             }}
             """
             
-            response = self.openai_client.chat.completions.create(
+            response = chat_completion(
+                self.openai_client,
                 model=self.openai_model,
                 messages=[
                     {"role": "system", "content": "You are a Latin morphosyntax expert specializing in detailed grammatical analysis. You excel at explaining WHY each Latin word has its specific ending, including declensions, conjugations, case usage, and subject-verb agreement. Provide comprehensive morphological breakdowns and clear explanations of grammatical relationships."},
@@ -881,52 +999,56 @@ Return ONLY valid JSON (no explanations):
             print(f"Grammatical analysis failed for '{sentence}': {e}")
             return {"success": False, "error": str(e)}
 
+    @staticmethod
+    def translation_cache_key(verse_reference: str, target_language: str) -> str:
+        """translation_cache key of a verse; the normalized verse tables use the same two parts"""
+        return f"{verse_reference}_{target_language}"
+
+    @staticmethod
+    def split_translation_cache_key(cache_key: str):
+        """
+        '<verse_reference>_<target_language>' -> (verse_reference, target_language)
+        Keys from before the source language was dropped ('<ref>_<source>_<target>') are accepted too.
+        """
+        parts = cache_key.rsplit("_", 2)
+        if len(parts) == 3 and parts[1] in SOURCE_LANGUAGES:
+            return parts[0], parts[2]
+        parts = cache_key.rsplit("_", 1)
+        return tuple(parts) if len(parts) == 2 else (cache_key, "")
+
     def save_translation_to_cache(self, cache_key: str, translation_data: Dict[str, Any]) -> None:
-        """Save translation data to cache"""
+        """Save translation data to cache (translations and alignments go to the normalized tables)"""
         try:
-            conn = sqlite3.connect(self.cache_db_path)
-            cursor = conn.cursor()
-            
-            # Create translation cache table if it doesn't exist
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS translation_cache (
-                    cache_key TEXT PRIMARY KEY,
-                    translation_data TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Save translation data as JSON
-            cursor.execute('''
-                INSERT OR REPLACE INTO translation_cache (cache_key, translation_data)
-                VALUES (?, ?)
-            ''', (cache_key, json.dumps(translation_data)))
-            
-            conn.commit()
-            conn.close()
+            verse_reference, target_language = self.split_translation_cache_key(cache_key)
+            with self.db.transaction() as cursor:
+                extras = self.verse_store.save_translation_payload(verse_reference, target_language,
+                                                                   translation_data, cursor=cursor)
+                # translation_cache keeps the remaining fields (e.g. the analysis) and marks the key as cached
+                cursor.execute(INSERT_TRANSLATION_SQL, (cache_key, self.codec.encode(extras)))
             print(f"Translation cached with key: {cache_key}")
             
         except Exception as e:
+            cache_counters.error("translation")
             print(f"Failed to save translation to cache: {e}")
 
     def get_translation_from_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Get translation data from cache"""
         try:
-            conn = sqlite3.connect(self.cache_db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT translation_data FROM translation_cache 
-                WHERE cache_key = ?
-            ''', (cache_key,))
+            result = self.db.fetchone(SELECT_TRANSLATION_SQL, (cache_key,))
+            cache_counters.record("translation", bool(result))
+            if not result:
+                return None
+            stored = self.codec.decode(result[0], {})
             
-            result = cursor.fetchone()
-            conn.close()
-            
-            if result:
-                return json.loads(result[0])
-            return None
+            verse_reference, target_language = self.split_translation_cache_key(cache_key)
+            payload = self.verse_store.get_translation_payload(verse_reference, target_language)
+            if payload is None:
+                # Not migrated yet: the row still holds the whole payload
+                return stored or None
+            payload.update({key: value for key, value in stored.items() if key not in payload})
+            return payload
             
         except Exception as e:
+            cache_counters.error("translation")
             print(f"Failed to get translation from cache: {e}")
-            return None 
\ No newline at end of file
+            return None
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Fallback Aligner Matching
+Lexicon and cognate matching for AdvancedWordAligner's fallback alignment (used when SimAlign is
+unavailable or still loading).
+
+A TargetIndex is built once per target sentence: exact tokens plus a character-trigram inverted
+index. Each source word then only compares against the target tokens that share a trigram with it,
+using a bounded indel (LCS) distance instead of one difflib.SequenceMatcher per token pair.
+
+Glosses come from the alignment lexicon compiled by scripts/build_alignment_lexicon.py (XDXF
+dictionaries + the macronizer's wordform/lemma tables) at ALIGNMENT_LEXICON_PATH. Without it
+only the built-in LATIN_PATTERNS are used.
+"""
+
+import json
+import logging
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Built-in Latin glosses (English and Spanish), always part of the lexicon
+LATIN_PATTERNS = {
+    'deus': ['dios', 'god', 'divine'],
+    'terra': ['tierra', 'earth', 'ground'],
+    'caelum': ['cielo', 'heaven', 'sky'],
+    'aqua': ['agua', 'water'],
+    'ignis': ['fuego', 'fire'],
+    'homo': ['hombre', 'man', 'human'],
+    'femina': ['mujer', 'woman'],
+    'rex': ['rey', 'king'],
+    'regina': ['reina', 'queen']
+}
+
+# Inflectional endings stripped by latin_stem, longest first (normalized spelling: u for v)
+LATIN_ENDINGS = sorted([
+    'auerunt', 'euerunt', 'iuerunt', 'auissent', 'auisset', 'erunt', 'issent', 'isset', 'auit',
+    'euit', 'iuit', 'abant', 'ebant', 'abat', 'ebat', 'ibus', 'orum', 'arum', 'ndum', 'ndi', 'ndo',
+    'isse', 'are', 'ere', 'ire', 'ari', 'eri', 'iri', 'unt', 'ant', 'ent', 'int', 'tur', 'mur', 'mus',
+    'tis', 'uum', 'ium', 'ius', 'am', 'em', 'im', 'um', 'as', 'es', 'is', 'os', 'us', 'ae', 'ei', 'ui',
+    'it', 'at', 'et', 'a', 'e', 'i', 'o', 'u', 'm', 's', 't'
+], key=len, reverse=True)
+MIN_STEM = 3
+
+# Cognates: indel distance below this share of the combined length (SequenceMatcher ratio > 0.6)
+COGNATE_MAX_DISTANCE = 0.4
+MIN_COGNATE_LENGTH = 3
+# Glosses also match inflected target words ("create" ~ "created", "light" ~ "lights")
+GLOSS_MAX_DISTANCE = 2
+MIN_FUZZY_GLOSS_LENGTH = 4
+
+
+def normalize_latin(word: str) -> str:
+    """Lowercase, strip macrons and breves, and fold j/v/æ/œ so spellings share one key"""
+    word = unicodedata.normalize("NFD", word.lower())
+    word = "".join(char for char in word if not unicodedata.combining(char))
+    return word.replace("j", "i").replace("v", "u").replace("æ", "ae").replace("œ", "oe")
+
+
+def latin_stem(word: str) -> str:
+    """Crude stem of a normalize_latin()ed word: the longest ending that leaves MIN_STEM letters, removed"""
+    for ending in LATIN_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM:
+            return word[:-len(ending)]
+    return word
+
+
+def trigrams(word: str) -> Set[str]:
+    """Character trigrams with word boundaries marked, so short words still have some"""
+    padded = f"^{word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_indel_distance(a: str, b: str, limit: int) -> int:
+    """
+    Insertions + deletions turning a into b (len(a) + len(b) - 2 * LCS), or limit + 1 once it
+    exceeds limit. Only the diagonal band |i - j| <= limit is filled, and rows stop early.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if a == b:
+        return 0
+    over = limit + 1
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [over] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        char = a[i - 1]
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            if char == b[j - 1]:
+                value = previous[j - 1]
+            else:
+                value = min(previous[j], current[j - 1]) + 1
+            current[j] = value if value <= limit else over
+        if min(current) > limit:
+            return over
+        previous = current
+    return previous[len(b)]
+
+
+def is_likely_cognate(word1: str, word2: str) -> bool:
+    """Spelling similarity test (the old SequenceMatcher ratio > 0.6, as a bounded indel distance)"""
+    if len(word1) < MIN_COGNATE_LENGTH or len(word2) < MIN_COGNATE_LENGTH:
+        return False
+    total = len(word1) + len(word2)
+    limit = int(total * COGNATE_MAX_DISTANCE - 1e-9)  # strictly below 40% of the combined length
+    return bounded_indel_distance(word1, word2, limit) <= limit
+
+
+class TargetIndex:
+    """Lowercased tokens of one target sentence with exact and character-trigram lookups"""
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = [token.lower() for token in tokens]
+        self.exact: Dict[str, List[int]] = defaultdict(list)
+        self.by_trigram: Dict[str, Set[int]] = defaultdict(set)
+        for index, token in enumerate(self.tokens):
+            self.exact[token].append(index)
+            for trigram in trigrams(token):
+                self.by_trigram[trigram].add(index)
+
+    def candidates(self, word: str) -> Set[int]:
+        """Token indices sharing at least one trigram with word"""
+        found: Set[int] = set()
+        for trigram in trigrams(word):
+            found |= self.by_trigram.get(trigram, set())
+        return found
+
+    def cognates(self, word: str) -> Set[int]:
+        if len(word) < MIN_COGNATE_LENGTH:
+            return set()
+        return {index for index in self.candidates(word) if is_likely_cognate(word, self.tokens[index])}
+
+    def gloss_matches(self, glosses: Iterable[str]) -> Set[int]:
+        """Tokens equal to a gloss, starting with it, or within GLOSS_MAX_DISTANCE of it"""
+        found: Set[int] = set()
+        for gloss in glosses:
+            found.update(self.exact.get(gloss, ()))
+            if len(gloss) < MIN_FUZZY_GLOSS_LENGTH:
+                continue
+            for index in self.candidates(gloss):
+                token = self.tokens[index]
+                if token.startswith(gloss) or bounded_indel_distance(gloss, token, GLOSS_MAX_DISTANCE) <= GLOSS_MAX_DISTANCE:
+                    found.add(index)
+        return found
+
+
+class AlignmentLexicon:
+    """Latin word -> target-language glosses, by inflected form and by stem"""
+
+    def __init__(self, forms: Optional[Dict[str, List[str]]] = None, stems: Optional[Dict[str, List[str]]] = None):
+        self.forms: Dict[str, List[str]] = dict(forms or {})
+        self.stems: Dict[str, List[str]] = dict(stems or {})
+        for word, glosses in LATIN_PATTERNS.items():
+            self.forms[word] = list(dict.fromkeys(glosses + self.forms.get(word, [])))
+            stem = latin_stem(word)
+            self.stems[stem] = list(dict.fromkeys(glosses + self.stems.get(stem, [])))
+
+    @classmethod
+    def load(cls, path: str) -> "AlignmentLexicon":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("forms"), data.get("stems"))
+
+    def glosses(self, word: str) -> List[str]:
+        """Glosses of a Latin word: its inflected form first, then its stem"""
+        normalized = normalize_latin(word)
+        return self.forms.get(normalized) or self.stems.get(latin_stem(normalized), [])
+
+    def __len__(self) -> int:
+        return len(self.forms)
+
+
+_lexicon: Optional[AlignmentLexicon] = None
+_lexicon_lock = threading.Lock()
+
+
+def get_alignment_lexicon() -> AlignmentLexicon:
+    """The compiled lexicon at ALIGNMENT_LEXICON_PATH, or only the built-in patterns if it is missing"""
+    global _lexicon
+    with _lexicon_lock:
+        if _lexicon is None:
+            path = settings.ALIGNMENT_LEXICON_PATH
+            try:
+                _lexicon = AlignmentLexicon.load(path)
+                logger.info(f"Loaded alignment lexicon with {len(_lexicon)} forms from {path}")
+            except FileNotFoundError:
+                logger.warning(f"No alignment lexicon at {path}, using built-in patterns. "
+                               "Build it with: python scripts/build_alignment_lexicon.py")
+                _lexicon = AlignmentLexicon()
+            except Exception as e:
+                logger.error(f"Failed to load alignment lexicon {path}: {e}")
+                _lexicon = AlignmentLexicon()
+        return _lexicon
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Compiled, memory-mapped form of the corpus lemma tables in lemmas.py.
+
+Importing lemmas.py means parsing 35,000 lines of dict literals and keeping three large
+dicts resident in every worker process. Running this module as a script compiles the
+tables into lemmas.db, a read-only SQLite file that is opened with mmap, so only the
+pages actually touched are read and all processes share them through the page cache:
+
+    python lemmastore.py
+
+When lemmas.db is missing or older than lemmas.py, getlemmastore() falls back to
+importing lemmas.py, so the macronizer works the same either way.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+
+LEMMA_SOURCE = os.path.join(os.path.dirname(__file__), 'lemmas.py')
+LEMMA_DB = os.path.join(os.path.dirname(__file__), 'lemmas.db')
+MMAP_SIZE = 64 * 1024 * 1024
+QUERY_CHUNK = 500  # Keys per IN (...) query; stays below SQLite's default limit of 999 parameters
+
+
+def chunks(items, size):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+# enddef
+
+
+class SqliteLemmaStore:
+    """Looks up the lemma tables in lemmas.db. Connections are per thread and read only."""
+
+    def __init__(self, dbname=LEMMA_DB):
+        self.dbname = dbname
+        self.local = threading.local()
+    # enddef
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect("file:%s?mode=ro" % self.dbname, uri=True)
+            conn.execute("PRAGMA mmap_size = %d" % MMAP_SIZE)
+            conn.execute("PRAGMA query_only = ON")
+            self.local.conn = conn
+        return conn
+    # enddef
+
+    def corpuslemmas(self, wordforms):
+        """Returns {wordform: [(lemma, frequency), ...]} in the order of wordform_to_corpus_lemmas."""
+        result = {}
+        conn = self.connection()
+        for chunk in chunks(set(wordforms), QUERY_CHUNK):
+            rows = conn.execute(
+                "SELECT wordform, lemma, frequency FROM corpus_lemmas WHERE wordform IN (%s) ORDER BY wordform, position"
+                % ", ".join("?" * len(chunk)), chunk)
+            for wordform, lemma, frequency in rows:
+                result.setdefault(wordform, []).append((lemma, frequency))
+        return result
+    # enddef
+
+    def lemmafrequencies(self, lemmas):
+        """Returns {lemma: frequency} for the lemmas that occur in the corpus."""
+        result = {}
+        conn = self.connection()
+        for chunk in chunks(set(lemmas), QUERY_CHUNK):
+            rows = conn.execute("SELECT lemma, frequency FROM lemma_frequency WHERE lemma IN (%s)"
+                                % ", ".join("?" * len(chunk)), chunk)
+            result.update(rows)
+        return result
+    # enddef
+# endclass
+
+
+class DictLemmaStore:
+    """Same interface as SqliteLemmaStore, backed by the dicts in lemmas.py."""
+
+    def __init__(self):
+        from lemmas import lemma_frequency, word_lemma_freq, wordform_to_corpus_lemmas
+        self.lemma_frequency = lemma_frequency
+        self.word_lemma_freq = word_lemma_freq
+        self.wordform_to_corpus_lemmas = wordform_to_corpus_lemmas
+    # enddef
+
+    def corpuslemmas(self, wordforms):
+        result = {}
+        for wordform in wordforms:
+            if wordform in self.wordform_to_corpus_lemmas:
+                result[wordform] = [(lemma, self.word_lemma_freq[(wordform, lemma)])
+                                    for lemma in self.wordform_to_corpus_lemmas[wordform]]
+        return result
+    # enddef
+
+    def lemmafrequencies(self, lemmas):
+        return {lemma: self.lemma_frequency[lemma] for lemma in lemmas if lemma in self.lemma_frequency}
+    # enddef
+# endclass
+
+
+def isfresh(dbname=LEMMA_DB, source=LEMMA_SOURCE):
+    return os.path.exists(dbname) and os.path.getmtime(dbname) >= os.path.getmtime(source)
+# enddef
+
+
+_store = None
+_storelock = threading.Lock()
+
+
+def getlemmastore():
+    """Return the process-wide lemma store, preferring the compiled lemmas.db."""
+    global _store
+    with _storelock:
+        if _store is None:
+            _store = SqliteLemmaStore() if isfresh() else DictLemmaStore()
+        return _store
+# enddef
+
+
+def build(dbname=LEMMA_DB):
+    """Compile lemmas.py into dbname. The file is written next to it and moved into place when complete."""
+    from lemmas import lemma_frequency, word_lemma_freq, wordform_to_corpus_lemmas
+    tmpname = dbname + ".tmp"
+    if os.path.exists(tmpname):
+        os.remove(tmpname)
+    conn = sqlite3.connect(tmpname)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("CREATE TABLE lemma_frequency (lemma TEXT PRIMARY KEY, frequency INTEGER NOT NULL) WITHOUT ROWID")
+    conn.execute('''
+        CREATE TABLE corpus_lemmas (
+            wordform TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            lemma TEXT NOT NULL,
+            frequency INTEGER NOT NULL,
+            PRIMARY KEY (wordform, position)
+        ) WITHOUT ROWID
+    ''')
+    conn.executemany("INSERT INTO lemma_frequency (lemma, frequency) VALUES (?, ?)", sorted(lemma_frequency.items()))
+    conn.executemany("INSERT INTO corpus_lemmas (wordform, position, lemma, frequency) VALUES (?, ?, ?, ?)",
+                     ((wordform, position, lemma, word_lemma_freq[(wordform, lemma)])
+                      for wordform, lemmas in sorted(wordform_to_corpus_lemmas.items())
+                      for position, lemma in enumerate(lemmas)))
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    os.replace(tmpname, dbname)
+    return len(lemma_frequency), len(word_lemma_freq)
+# enddef
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else LEMMA_DB
+    lemmacount, pairs = build(target)
+    print("Wrote %d lemmas and %d wordform/lemma pairs to %s" % (lemmacount, pairs, target))
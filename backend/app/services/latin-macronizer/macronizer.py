@@ -16,20 +16,37 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import io
+import itertools
 import os
 import re
-from tempfile import mkstemp
-from collections import defaultdict
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from collections import defaultdict, OrderedDict
 import sqlite3
 from html import escape
 
 import postags
+import rftagger
 
 USE_DB = True
 DB_NAME = 'macronizer.db'
 RFTAGGER_DIR = '/Users/guillermomolina/dev/vulgate/latin-macronizer/RFTagger/bin'
+RFTAGGER_MODEL = os.path.join(os.path.dirname(__file__), 'rftagger-ldt.model')
+RFTAGGER_POOL_SIZE = int(os.environ.get('RFTAGGER_POOL_SIZE', '2'))  # Warm rft-annotate processes per server process
 MORPHEUS_DIR = os.path.join(os.path.dirname(__file__), 'morpheus')
+CRUNCH_BATCH_WINDOW = 0.05  # Seconds to wait for more unknown words before running Morpheus
+CRUNCH_MAX_BATCH = 2000
+STREAM_CHUNK_SIZE = 50  # Verses per chunk in Macronizer.macronizestream
 MACRONS_FILE = os.path.join(os.path.dirname(__file__), 'macrons.txt')
+WORDFORM_CACHE_SIZE = int(os.environ.get('MACRONIZER_WORDFORM_CACHE_SIZE', '50000'))  # Parsed wordforms kept per Wordlist
+ALIGNMENT_CACHE_SIZE = 65536  # Distinct (plain, accented, options) alignments remembered
+DISTANCE_CACHE_SIZE = 65536  # Memoized tag and lemma distances
+RANKING_CACHE_SIZE = 50000  # Ranked candidate lists per Wordlist
+DB_IN_CHUNK = 500  # Wordforms per IN (...) query; stays below SQLite's default limit of 999 parameters
 
 
 def pairwise(iterable):
@@ -51,24 +68,130 @@ def touiorthography(txt):
     return txt
 
 
+def dbversion(dbconn=None):
+    """The version of the word database, increased every time it is reinitialized."""
+    if not USE_DB:
+        return 0
+    conn = dbconn or sqlite3.connect(DB_NAME)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        if dbconn is None:
+            conn.close()
+# enddef
+
+
 def clean_lemma(lemma):
     return lemma.replace("#", "").replace("1", "").replace(" ", "+").replace("-", "").replace("^", "").replace("_", "")
 
 
+@lru_cache(maxsize=DISTANCE_CACHE_SIZE)
+def levenshtein(s1, s2):
+    if len(s1) < len(s2):
+        return levenshtein(s2, s1)
+    if len(s2) == 0:
+        return len(s1)
+    previous_row = range(len(s2) + 1)
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        previous_row = current_row
+    return previous_row[-1]
+# enddef
+
+
+tag_distance = lru_cache(maxsize=DISTANCE_CACHE_SIZE)(postags.tag_distance)
+
+
+def rankaccents(taglemmaaccents, tag, lemma, casemode):
+    """Order the accented forms of a word by how well their tag and lemma match the token's.
+    Only forms with the best capitalization match are kept. Returns a tuple without duplicates."""
+    candidates = []
+    for (lextag, lexlemma, accented) in taglemmaaccents:
+        casedist = 0 if casemode is None or casemode == lexlemma.istitle() else 1
+        tagdist = tag_distance(tag, lextag)
+        lemdist = levenshtein(lemma, lexlemma)
+        candidates.append((casedist, tagdist, lemdist, accented))
+    candidates.sort()
+    ranked = []
+    for (casedist, tagdist, lemdist, accented) in candidates:
+        if accented not in ranked and casedist == candidates[0][0]:
+            ranked.append(accented)
+    return tuple(ranked)
+# enddef
+
+
+class WordformCache:
+    """Least recently used cache of parsed wordforms: wordform -> (isunknown, [(tag, lemma, accented), ...]).
+    Also used for the ranked accented forms per (wordform, tag, lemma, casemode).
+
+    With maxsize None the cache is unbounded, which is what the file based word list needs."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    # enddef
+
+    def __contains__(self, wordform):
+        return wordform in self.entries
+    # enddef
+
+    def get(self, wordform):
+        entry = self.entries.get(wordform)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(wordform)
+        return entry
+    # enddef
+
+    def put(self, wordform, entry):
+        self.entries[wordform] = entry
+        self.entries.move_to_end(wordform)
+        if self.maxsize is not None:
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+    # enddef
+
+    def clear(self):
+        self.entries.clear()
+    # enddef
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitrate": self.hits / lookups if lookups else 0.0,
+        }
+    # enddef
+# endclass
+
+
 class Wordlist:
     def __init__(self):
-        self.unknownwords = set()  # Unknown to Morpheus
-        self.formtolemmas = defaultdict(list)
-        self.formtoaccenteds = defaultdict(list)
-        self.formtotaglemmaaccents = defaultdict(list)
+        self.rankings = WordformCache(RANKING_CACHE_SIZE)  # (wordform, tag, lemma, casemode) -> accented forms
         if USE_DB:
-            self.dbconn = sqlite3.connect(DB_NAME)
+            self.forms = WordformCache(WORDFORM_CACHE_SIZE)
+            self.dbconn = sqlite3.connect(DB_NAME, check_same_thread=False)  # A pooled Macronizer moves between threads, one at a time
             self.dbcursor = self.dbconn.cursor()
         else:
+            self.forms = WordformCache(None)
             self.loadwordsfromfile(MACRONS_FILE)
     # enddef
 
     def reinitializedatabase(self):
+        self.forms.clear()
+        self.rankings.clear()
         self.dbcursor.execute("DROP TABLE IF EXISTS morpheus")
         self.dbcursor.execute('''
             CREATE TABLE morpheus(
@@ -82,6 +205,8 @@ class Wordlist:
         ''')
         self.loadwordsfromfile(MACRONS_FILE, storeindb=True)
         self.dbcursor.execute("CREATE INDEX morpheus_wordform_index ON morpheus (wordform)")
+        # Bump the version so that caches of macronized text know their results are stale:
+        self.dbcursor.execute("PRAGMA user_version = %d" % (dbversion(self.dbconn) + 1))
         self.dbconn.commit()
     # enddef
 
@@ -91,114 +216,248 @@ class Wordlist:
                 if line.startswith("#"):
                     continue
                 [wordform, morphtag, lemma, accented] = line.split()
-                self.addwordparse(wordform, morphtag, lemma, accented)
                 if USE_DB and storeindb:
                     self.dbcursor.execute(
                         "INSERT OR IGNORE INTO morpheus (wordform, morphtag, lemma, accented) VALUES (?, ?, ?, ?)",
                         (wordform, morphtag, lemma, accented))
+                else:
+                    self.addwordparse(wordform, morphtag, lemma, accented)
     # enddef
 
     def loadwords(self, words):  # Expects a set of lowercase words
-        unseenwords = set()
-        for word in words:
-            if word in self.formtotaglemmaaccents:  # Word is already loaded
-                continue
-            if not self.loadwordfromdb(word):  # Could not find word in database
-                unseenwords.add(word)
+        missingwords = [word for word in words if self.forms.get(word) is None]
+        unseenwords = self.loadwordsfromdb(missingwords)  # Words not found in database
         if len(unseenwords) > 0:
             self.crunchwords(unseenwords)  # Try to parse unseen words with Morpheus, and add result to the database
-            for word in unseenwords:
-                if not self.loadwordfromdb(word):
-                    raise Exception("Could not store %s in the database." % word)
+            unstoredwords = self.loadwordsfromdb(unseenwords)
+            if len(unstoredwords) > 0:
+                raise Exception("Could not store %s in the database." % ", ".join(sorted(unstoredwords)))
     # enddef
 
-    def loadwordfromdb(self, word):
-        if USE_DB:
+    def loadwordsfromdb(self, words):
+        """Load the parses of the given words into the cache, DB_IN_CHUNK words per query.
+        Returns the set of words that are not in the database."""
+        words = list(words)
+        if not USE_DB:
+            for word in words:
+                if word not in self.forms:
+                    self.forms.put(word, (True, []))
+            return set()
+        entries = {}
+        for start in range(0, len(words), DB_IN_CHUNK):
+            chunk = words[start:start + DB_IN_CHUNK]
             try:
                 self.dbcursor.execute(
-                    "SELECT wordform, morphtag, lemma, accented FROM morpheus WHERE wordform = ?", (word,))
+                    "SELECT wordform, morphtag, lemma, accented FROM morpheus WHERE wordform IN (%s)"
+                    % ", ".join("?" * len(chunk)), chunk)
             except Exception:
                 raise Exception("Database table is missing. Please reset the database using --initialize.")
-            rows = self.dbcursor.fetchall()
-            if len(rows) == 0:
-                return False
-            for [wordform, morphtag, lemma, accented] in rows:
-                self.addwordparse(wordform, morphtag, lemma, accented)
-        else:
-            self.addwordparse(word, None, None, None)
-        return True
+            for [wordform, morphtag, lemma, accented] in self.dbcursor.fetchall():
+                isunknown, parses = entries.setdefault(wordform, (False, []))
+                if accented is None:
+                    entries[wordform] = (True, parses)
+                else:
+                    parses.append((morphtag, lemma, accented))
+        for wordform, entry in entries.items():
+            self.forms.put(wordform, entry)
+        return set(words) - set(entries)
     # enddef
 
     def addwordparse(self, wordform, morphtag, lemma, accented):
+        isunknown, parses = self.forms.get(wordform) or (False, [])
         if accented is None:
-            self.unknownwords.add(wordform)
+            isunknown = True
         else:
-            self.formtolemmas[wordform].append(lemma)
-            self.formtoaccenteds[wordform].append(accented.lower())
-            self.formtotaglemmaaccents[wordform].append((morphtag, lemma, accented))
+            parses.append((morphtag, lemma, accented))
+        self.forms.put(wordform, (isunknown, parses))
+    # enddef
+
+    def lookup(self, wordform):
+        entry = self.forms.get(wordform)
+        if entry is None:  # Evicted or never loaded; the database is the source of truth
+            self.loadwordsfromdb([wordform])
+            entry = self.forms.entries.get(wordform, (False, []))
+        return entry
+    # enddef
+
+    def isunknown(self, wordform):  # Unknown to Morpheus
+        return self.lookup(wordform)[0]
+    # enddef
+
+    def taglemmaaccents(self, wordform):
+        return self.lookup(wordform)[1]
+    # enddef
+
+    def lemmas(self, wordform):
+        return [lemma for (tag, lemma, accented) in self.lookup(wordform)[1]]
+    # enddef
+
+    def accenteds(self, wordform):
+        return [accented.lower() for (tag, lemma, accented) in self.lookup(wordform)[1]]
+    # enddef
+
+    def rankedaccents(self, wordform, tag, lemma, casemode):
+        """The accented forms of wordform, best first, for a token with the given tag and lemma.
+        casemode is None if any capitalization of the lemma will do, else whether the token is capitalized."""
+        key = (wordform, tag, lemma, casemode)
+        ranked = self.rankings.get(key)
+        if ranked is None:
+            ranked = rankaccents(self.taglemmaaccents(wordform), tag, lemma, casemode)
+            self.rankings.put(key, ranked)
+        return ranked
+    # enddef
+
+    def cachestats(self):
+        return {"wordforms": self.forms.stats(), "rankings": self.rankings.stats()}
     # enddef
 
     def crunchwords(self, words):
-        morphinpfd, morphinpfname = mkstemp()
-        os.close(morphinpfd)
-        crunchedfd, crunchedfname = mkstemp()
-        os.close(crunchedfd)
-        with open(morphinpfname, 'w', encoding='utf-8') as morphinpfile:
+        getcrunchservice().crunch(words)
+    # enddef
+# endclass
+
+
+def parsecrunched(words, morpheus):
+    """Turn cruncher output into morpheus table rows. Words unknown to Morpheus get a row with only the wordform."""
+    rows = []
+    crunchedwordforms = {}
+    knownwords = set()
+    for wordform, nls in pairwise(morpheus.split("\n")):
+        wordform = wordform.strip().lower()
+        nls = nls.strip()
+        crunchedwordforms[wordform] = crunchedwordforms.get(wordform, "") + nls
+    for wordform, nls in crunchedwordforms.items():
+        parses = []
+        for nl in nls.split("<NL>"):
+            nl = nl.replace("</NL>", "")
+            nlparts = nl.split()
+            if len(nlparts) > 0:
+                parses += postags.morpheus_to_parses(wordform, nl)
+        lemmatagtoaccenteds = defaultdict(list)
+        for parse in parses:
+            lemma = clean_lemma(parse[postags.LEMMA])
+            parse[postags.LEMMA] = lemma
+            accented = parse[postags.ACCENTEDFORM]
+            # Work around shortcoming in Morpheus, adding _ in tradu_co_, etc.:
+            if parse[postags.LEMMA].startswith("trans") and accented[3] != "_":
+                accented = accented[:3] + "_" + accented[3:]
+            parse[postags.ACCENTEDFORM] = accented
+            tag = postags.parse_to_ldt(parse)
+            lemmatagtoaccenteds[(lemma, tag)].append(accented)
+        if len(lemmatagtoaccenteds) == 0:
+            continue
+        knownwords.add(wordform)
+        for (lemma, tag), accenteds in lemmatagtoaccenteds.items():
+            # Sometimes there are multiple accented forms; prefer 'volvit' to 'voluit', 'Ju_lius' to 'Iu_lius' etc.:
+            bestaccented = sorted(accenteds, key=lambda x: x.count('v') + x.count('j') + x.count('J'))[-1]
+            rows.append((wordform, tag, lemma, bestaccented))
+    # The remaining were unknown to Morpheus:
+    for wordform in set(words) - knownwords:
+        rows.append((wordform, None, None, None))
+    return rows, knownwords
+# enddef
+
+
+class CrunchService:
+    """Runs Morpheus on unknown wordforms in batches, shared by all Wordlists of the process.
+
+    Words submitted by concurrent callers within CRUNCH_BATCH_WINDOW are collected into one
+    cruncher invocation, and the parses are written to the database in one transaction.
+    submit() returns a concurrent.futures.Future per word (True if Morpheus knew the word);
+    async code can await it with asyncio.wrap_future.
+    """
+
+    def __init__(self, dbname, morpheusdir):
+        self.dbname = dbname
+        self.morpheusdir = morpheusdir
+        self.pending = {}  # wordform -> Future, until the batch containing it is written
+        self.queued = []
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.batches = 0
+        self.wordscrunched = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+    # enddef
+
+    def submit(self, words):
+        futures = {}
+        with self.lock:
             for word in words:
-                morphinpfile.write(word.strip().lower() + '\n')
-                morphinpfile.write(word.strip().capitalize() + '\n')
-        morpheus_command = "MORPHLIB=%s/stemlib %s/bin/cruncher -L < %s > %s 2> /dev/null" % \
-                               (MORPHEUS_DIR, MORPHEUS_DIR, morphinpfname, crunchedfname)
-        exitcode = os.system(morpheus_command)
-        if exitcode != 0:
-            raise Exception("Failed to execute: %s" % morpheus_command)
-        os.remove(morphinpfname)
-        with open(crunchedfname, 'r', encoding='utf-8') as crunchedfile:
-            morpheus = crunchedfile.read()
-        os.remove(crunchedfname)
-        crunchedwordforms = {}
-        knownwords = set()
-        for wordform, nls in pairwise(morpheus.split("\n")):
-            wordform = wordform.strip().lower()
-            nls = nls.strip()
-            crunchedwordforms[wordform] = crunchedwordforms.get(wordform, "") + nls
-        for wordform, nls in crunchedwordforms.items():
-            parses = []
-            for nl in nls.split("<NL>"):
-                nl = nl.replace("</NL>", "")
-                nlparts = nl.split()
-                if len(nlparts) > 0:
-                    parses += postags.morpheus_to_parses(wordform, nl)
-            lemmatagtoaccenteds = defaultdict(list)
-            for parse in parses:
-                lemma = clean_lemma(parse[postags.LEMMA])
-                parse[postags.LEMMA] = lemma
-                accented = parse[postags.ACCENTEDFORM]
-                # Work around shortcoming in Morpheus, adding _ in tradu_co_, etc.:
-                if parse[postags.LEMMA].startswith("trans") and accented[3] != "_":
-                    accented = accented[:3] + "_" + accented[3:]
-                parse[postags.ACCENTEDFORM] = accented
-                tag = postags.parse_to_ldt(parse)
-                lemmatagtoaccenteds[(lemma, tag)].append(accented)
-            if len(lemmatagtoaccenteds) == 0:
+                if word not in self.pending:
+                    self.pending[word] = Future()
+                    self.queued.append(word)
+                futures[word] = self.pending[word]
+        self.wakeup.set()
+        return futures
+    # enddef
+
+    def crunch(self, words):
+        """Blocking convenience wrapper: wait until all words are in the database."""
+        for future in self.submit(words).values():
+            future.result()
+    # enddef
+
+    def run(self):
+        dbconn = sqlite3.connect(self.dbname)
+        while True:
+            self.wakeup.wait()
+            time.sleep(CRUNCH_BATCH_WINDOW)
+            with self.lock:
+                batch = self.queued[:CRUNCH_MAX_BATCH]
+                self.queued = self.queued[CRUNCH_MAX_BATCH:]
+                if not self.queued:
+                    self.wakeup.clear()
+            if not batch:
                 continue
-            knownwords.add(wordform)
-            for (lemma, tag), accenteds in lemmatagtoaccenteds.items():
-                # Sometimes there are multiple accented forms; prefer 'volvit' to 'voluit', 'Ju_lius' to 'Iu_lius' etc.:
-                bestaccented = sorted(accenteds, key=lambda x: x.count('v') + x.count('j') + x.count('J'))[-1]
-                lemmatagtoaccenteds[(lemma, tag)] = bestaccented
-            for (lemma, tag), accented in lemmatagtoaccenteds.items():
-                self.dbcursor.execute("INSERT OR IGNORE INTO morpheus (wordform, morphtag, lemma, accented) VALUES (?, ?, ?, ?)",
-                                      (wordform, tag, lemma, accented))
-        # The remaining were unknown to Morpheus:
-        for wordform in words - knownwords:
-            self.dbcursor.execute("INSERT OR IGNORE INTO morpheus (wordform) VALUES (?)", (wordform,))
+            try:
+                knownwords = self.crunchbatch(batch, dbconn)
+            except Exception as inst:
+                knownwords = None
+                error = inst
+            with self.lock:
+                futures = [self.pending.pop(word) for word in batch]
+            for word, future in zip(batch, futures):
+                if knownwords is None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(word in knownwords)
+    # enddef
 
-        self.dbconn.commit()
+    def crunchbatch(self, words, dbconn):
+        morphinput = "".join(word.strip().lower() + "\n" + word.strip().capitalize() + "\n" for word in words)
+        command = [os.path.join(self.morpheusdir, "bin", "cruncher"), "-L"]
+        environment = dict(os.environ, MORPHLIB=os.path.join(self.morpheusdir, "stemlib"))
+        result = subprocess.run(command, input=morphinput, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                env=environment, encoding='utf-8')
+        if result.returncode != 0:
+            raise Exception("Failed to execute: %s" % " ".join(command))
+        rows, knownwords = parsecrunched(words, result.stdout)
+        with dbconn:
+            dbconn.executemany("INSERT OR IGNORE INTO morpheus (wordform, morphtag, lemma, accented) VALUES (?, ?, ?, ?)",
+                               [row for row in rows if row[3] is not None])
+            dbconn.executemany("INSERT OR IGNORE INTO morpheus (wordform) VALUES (?)",
+                               [(row[0],) for row in rows if row[3] is None])
+        self.batches += 1
+        self.wordscrunched += len(words)
+        return knownwords
     # enddef
 # endclass
 
 
+_crunchservice = None
+_crunchservicelock = threading.Lock()
+
+
+def getcrunchservice():
+    global _crunchservice
+    with _crunchservicelock:
+        if _crunchservice is None:
+            _crunchservice = CrunchService(DB_NAME, MORPHEUS_DIR)
+        return _crunchservice
+# enddef
+
+
 prefixeswithshortj = ("bij", "fidej", "Foroj", "foroj", "ju_rej", "multij", "praej", "quadrij",
                       "rej", "retroj", "se_mij", "sesquij", "u_nij", "introj")
 
@@ -256,68 +515,144 @@ class Token:
                 self.macronized = plain
             return
         # endif
+        self.macronized = alignaccents(plain, accented, domacronize, performutov, performitoj)
+    # enddef
+# endclass
+
 
-        def inscost(a):
-            if a == '_':
-                return 0
-            return 2
-
-        def subcost(p, a):
-            if a == '_':
-                return 100
-            if (a in "IJij" and p in "IJij") or (a in "UVuv" and p in "UVuv"):
-                return 1
-            return 2
-
-        def delcost(_):
-            return 2
-
-        n = len(plain) + 1
-        m = len(accented) + 1
-        distance = [[0 for i in range(m)] for j in range(n)]
-        for i in range(1, n):
-            distance[i][0] = distance[i-1][0] + delcost(plain[i-1])
+@lru_cache(maxsize=ALIGNMENT_CACHE_SIZE)
+def alignaccents(plain, accented, domacronize, performutov, performitoj):
+    """Transfer macrons (and v/j if requested) from the accented form onto the plain text.
+    Weighted edit distance on a flat (len(plain)+1) x (len(accented)+1) array; the characters
+    are case folded and run through toascii once per call instead of once per cell."""
+    plainfolded = [toascii(c.lower()) for c in plain]
+    accentedfolded = [toascii(c.lower()) for c in accented]
+    n = len(plain) + 1
+    m = len(accented) + 1
+    distance = [0] * (n * m)
+    for i in range(1, n):
+        distance[i * m] = distance[(i - 1) * m] + 2  # Deletion
+    for j in range(1, m):
+        distance[j] = distance[j - 1] + (0 if accented[j - 1] == '_' else 2)  # Insertion
+    for i in range(1, n):
+        p = plain[i - 1]
+        pfolded = plainfolded[i - 1]
+        isiorj = p in "IJij"
+        isuorv = p in "UVuv"
+        row = i * m
+        prevrow = row - m
         for j in range(1, m):
-            distance[0][j] = distance[0][j-1] + inscost(accented[j-1])
-        for i in range(1, n):
-            for j in range(1, m):
-                if toascii(plain[i-1].lower()) == toascii(accented[j-1].lower()):
-                    distance[i][j] = distance[i-1][j-1]
-                else:
-                    rghtcost = distance[i-1][j] + delcost(plain[i-1])
-                    diagcost = distance[i-1][j-1] + subcost(plain[i-1], accented[j-1])
-                    downcost = distance[i][j-1] + inscost(accented[j-1])
-                    distance[i][j] = min(rghtcost, diagcost, downcost)
-        result = ""
-        while i != 0 and j != 0:
-            upcost = distance[i][j-1] if j > 0 else 1000
-            diagcost = distance[i-1][j-1] if j > 0 and i > 0 else 1000
-            leftcost = distance[i-1][j] if i > 0 else 1000
-            if diagcost <= upcost and diagcost < leftcost:  # To-do: review the comparisons...
-                i -= 1
-                j -= 1
-                if performutov and accented[j].lower() == 'v' and plain[i] == 'u':
-                    result = 'v' + result
-                elif performutov and accented[j].lower() == 'v' and plain[i] == 'U':
-                    result = 'V' + result
-                elif performitoj and accented[j].lower() == 'j' and plain[i] == 'i':
-                    result = 'j' + result
-                elif performitoj and accented[j].lower() == 'j' and plain[i] == 'I':
-                    result = 'J' + result
+            if pfolded == accentedfolded[j - 1]:
+                distance[row + j] = distance[prevrow + j - 1]
+            else:
+                a = accented[j - 1]
+                if a == '_':
+                    subcost = 100
+                    inscost = 0
                 else:
-                    result = plain[i] + result
-            elif upcost <= diagcost and upcost <= leftcost:
-                j -= 1
-                if domacronize and accented[j] == '_':
-                    result = "_" + result
+                    subcost = 1 if (isiorj and a in "IJij") or (isuorv and a in "UVuv") else 2
+                    inscost = 2
+                distance[row + j] = min(distance[prevrow + j] + 2,
+                                        distance[prevrow + j - 1] + subcost,
+                                        distance[row + j - 1] + inscost)
+    i = n - 1
+    j = m - 1
+    result = []  # Built backwards
+    while i != 0 and j != 0:
+        upcost = distance[i * m + j - 1]
+        diagcost = distance[(i - 1) * m + j - 1]
+        leftcost = distance[(i - 1) * m + j]
+        if diagcost <= upcost and diagcost < leftcost:  # To-do: review the comparisons...
+            i -= 1
+            j -= 1
+            if performutov and accented[j].lower() == 'v' and plain[i] == 'u':
+                result.append('v')
+            elif performutov and accented[j].lower() == 'v' and plain[i] == 'U':
+                result.append('V')
+            elif performitoj and accented[j].lower() == 'j' and plain[i] == 'i':
+                result.append('j')
+            elif performitoj and accented[j].lower() == 'j' and plain[i] == 'I':
+                result.append('J')
             else:
-                i -= 1
-                result = plain[i] + result
-        # Some strange morpheus output (e.g. de_e_recti_) may give an additional _ in the result:
-        result = result.replace("__", "_")
-        self.macronized = result
-    # enddef
-# endclass
+                result.append(plain[i])
+        elif upcost <= diagcost and upcost <= leftcost:
+            j -= 1
+            if domacronize and accented[j] == '_':
+                result.append("_")
+        else:
+            i -= 1
+            result.append(plain[i])
+    # Some strange morpheus output (e.g. de_e_recti_) may give an additional _ in the result:
+    return "".join(reversed(result)).replace("__", "_")
+# enddef
+
+
+def scanverse(verse, automaton):
+    """Input: The "verse" is a complicated list of the format
+    [(tokenindex, [(penalty, scansion, accented), (penalty, scansion, accented), ...]), ...]
+    For example: [(0, [(0, 'L', 'in')]), (2, [(0, 'SL', 'no^va_'), (1, 'SS', 'no^va')]), ...]
+    It returns a tuple such as ([(0, 'in'), (2, 'no^va'), (4, 'fe^rt'), ...], 'DDSSDS')
+
+    The best scansion of the rest of the verse depends only on the word index and the automaton
+    node reached, so this is solved as a dynamic program over (wordindex, nodeindex): a forward
+    pass finds the reachable states, a backward pass picks the best choice in each. Ties are
+    broken as in a depth-first search over the word scansions in the given order: the first
+    choice with the strictly lowest penalty wins, and a verse that cannot be completed costs 100."""
+    # Forward pass: automaton transitions for each word scansion from each reachable node.
+    reachable = [{0}]
+    transitions = []  # transitions[wordindex][(nodeindex, scansionindex)] = (nextnode, feet, meterpenalty)
+    for wordindex, (tokenindex, wordscansions) in enumerate(verse):
+        steps = {}
+        nextnodes = set()
+        for oldnodeindex in reachable[wordindex]:
+            for scansionindex, (scanpenalty, scansion, accented) in enumerate(wordscansions):
+                nodeindex = oldnodeindex
+                feet = []
+                finished = False
+                meterpenalty = 0
+                for syllable in scansion:
+                    (nodeindex, foot, meterpenaltypart) = automaton.get((nodeindex, syllable), (-1, "", 0))
+                    meterpenalty += meterpenaltypart
+                    if nodeindex == 0:
+                        finished = True
+                    feet.append(foot)
+                if nodeindex == -1 or finished and (nodeindex != 0 or wordindex != len(verse)-1):
+                    continue
+                steps[(oldnodeindex, scansionindex)] = (nodeindex, feet, meterpenalty)
+                nextnodes.add(nodeindex)
+        transitions.append(steps)
+        reachable.append(nextnodes)
+    # Backward pass: best[wordindex][nodeindex] = (penalty, scansionindex or None)
+    best = [None] * len(verse) + [dict((nodeindex, (0, None)) for nodeindex in reachable[len(verse)])]
+    for wordindex in range(len(verse) - 1, -1, -1):
+        (tokenindex, wordscansions) = verse[wordindex]
+        best[wordindex] = {}
+        for oldnodeindex in reachable[wordindex]:
+            besttailpenalty = 100
+            bestchoice = None
+            for scansionindex, (scanpenalty, scansion, accented) in enumerate(wordscansions):
+                step = transitions[wordindex].get((oldnodeindex, scansionindex))
+                if step is None:
+                    continue
+                (nodeindex, feet, meterpenalty) = step
+                tailpenalty = best[wordindex+1][nodeindex][0]
+                if scanpenalty + meterpenalty + tailpenalty < besttailpenalty:
+                    bestchoice = scansionindex
+                    besttailpenalty = scanpenalty + meterpenalty + tailpenalty
+            best[wordindex][oldnodeindex] = (besttailpenalty, bestchoice)
+    # Follow the best choices from the start of the verse.
+    indexaccentedpairs = []
+    allfeet = []
+    nodeindex = 0
+    for wordindex, (tokenindex, wordscansions) in enumerate(verse):
+        scansionindex = best[wordindex][nodeindex][1]
+        if scansionindex is None:
+            break
+        (nodeindex, feet, meterpenalty) = transitions[wordindex][(nodeindex, scansionindex)]
+        indexaccentedpairs.append((tokenindex, wordscansions[scansionindex][2]))
+        allfeet += feet
+    return indexaccentedpairs, "".join(allfeet)
+# enddef
 
 
 class Tokenization:
@@ -375,7 +710,7 @@ class Tokenization:
             tobeadded = []
             oldlc = oldtoken.text.lower()
             if oldtoken.isword and oldlc != "que" and (
-                            oldlc in wordlist.unknownwords or oldlc in ["nec", "neque", "necnon", "seque", "seseque",
+                            wordlist.isunknown(oldlc) or oldlc in ["nec", "neque", "necnon", "seque", "seseque",
                                                                         "quique", "mecumque", "tecumque", "secumque"]):
                 if oldlc == "nec":
                     tobeadded = oldtoken.split(1, True)
@@ -409,107 +744,96 @@ class Tokenization:
             print("... (truncated) ...")
     # enddef
 
-    def addtags(self):
-        totaggerfd, totaggerfname = mkstemp()
-        os.close(totaggerfd)
-        fromtaggerfd, fromtaggerfname = mkstemp()
-        os.close(fromtaggerfd)
+    def taggerinput(self):
+        lines = []
         savedencliticbearer = None
-        with open(totaggerfname, 'w', encoding='utf-8') as totaggerfile:
-            for token in self.tokens:
-                if not token.isspace:
-                    tokentext = token.text
-                    if tokentext == tokentext.upper():
-                        tokentext = tokentext.lower()
+        for token in self.tokens:
+            if not token.isspace:
+                tokentext = token.text
+                if tokentext == tokentext.upper():
+                    tokentext = tokentext.lower()
+                if token.hasenclitic:
+                    savedencliticbearer = toascii(tokentext)
+                    continue
+                lines.append(toascii(tokentext))
+                if token.isenclitic:
+                    assert savedencliticbearer is not None
+                    lines.append(savedencliticbearer)
+                    savedencliticbearer = None
+            if token.endssentence:
+                lines.append("")
+        return lines
+    # enddef
+
+    def addtags(self):
+        rft_command = [os.path.join(RFTAGGER_DIR, 'rft-annotate'), '-s', '-q', RFTAGGER_MODEL]
+        try:
+            taggeroutput = rftagger.getpool(rft_command, RFTAGGER_POOL_SIZE).tag(self.taggerinput())
+        except rftagger.TaggerError as error:
+            raise Exception("Failed to execute: %s (%s)" % (" ".join(rft_command), error))
+        fromtaggerfile = io.StringIO(taggeroutput)
+        (taggedenclititoken, enclitictag) = (None, None)
+        line = None
+        for token in self.tokens:
+            if not token.isspace:
+                try:
                     if token.hasenclitic:
-                        savedencliticbearer = toascii(tokentext)
-                        continue
-                    totaggerfile.write(toascii(tokentext) + "\n")
+                        line = fromtaggerfile.readline().strip()
+                        assert line
+                        assert line.count('\t') == 1
+                        (taggedenclititoken, enclitictag) = line.split("\t")
                     if token.isenclitic:
-                        assert savedencliticbearer is not None
-                        totaggerfile.write(savedencliticbearer + "\n")
-                        savedencliticbearer = None
-                if token.endssentence:
-                    totaggerfile.write("\n")
-        rftagger_model = os.path.join(os.path.dirname(__file__), 'rftagger-ldt.model')
-        rft_command = "%s/rft-annotate -s -q %s %s %s" % (RFTAGGER_DIR, rftagger_model, totaggerfname, fromtaggerfname)
-        exitcode = os.system(rft_command)
-        if exitcode != 0:
-            raise Exception("Failed to execute: %s" % rft_command)
-        with open(fromtaggerfname, 'r', encoding='utf-8') as fromtaggerfile:
-            (taggedenclititoken, enclitictag) = (None, None)
-            line = None
-            for token in self.tokens:
-                if not token.isspace:
-                    try:
-                        if token.hasenclitic:
-                            line = fromtaggerfile.readline().strip()
-                            assert line
-                            assert line.count('\t') == 1
-                            (taggedenclititoken, enclitictag) = line.split("\t")
-                        if token.isenclitic:
-                            assert taggedenclititoken is not None
-                            assert enclitictag is not None
-                            (taggedtoken, tag) = (taggedenclititoken, enclitictag)
-                        else:
-                            line = fromtaggerfile.readline().strip()
-                            assert line
-                            assert line.count('\t') == 1
-                            (taggedtoken, tag) = line.split('\t')
-                        if token.text == token.text.upper():
-                            assert taggedtoken == toascii(token.text.lower())
-                        else:
-                            assert taggedtoken == toascii(token.text)
-                    except AssertionError:
-                        raise Exception("Error: Could not handle tagging data in file %s:\n'%s'" %
-                                        (fromtaggerfname, "Premature End Of File." if not line else line))
-                    # endtry
-                    token.tag = tag.replace(".", "")
-                if token.endssentence:
-                    line = fromtaggerfile.readline()
-        os.remove(totaggerfname)
-        os.remove(fromtaggerfname)
+                        assert taggedenclititoken is not None
+                        assert enclitictag is not None
+                        (taggedtoken, tag) = (taggedenclititoken, enclitictag)
+                    else:
+                        line = fromtaggerfile.readline().strip()
+                        assert line
+                        assert line.count('\t') == 1
+                        (taggedtoken, tag) = line.split('\t')
+                    if token.text == token.text.upper():
+                        assert taggedtoken == toascii(token.text.lower())
+                    else:
+                        assert taggedtoken == toascii(token.text)
+                except AssertionError:
+                    raise Exception("Error: Could not handle tagging data:\n'%s'" %
+                                    ("Premature End Of File." if not line else line))
+                # endtry
+                token.tag = tag.replace(".", "")
+            if token.endssentence:
+                line = fromtaggerfile.readline()
     # enddef
 
     def addlemmas(self, wordlist):
-        from lemmas import lemma_frequency, word_lemma_freq, wordform_to_corpus_lemmas
+        from lemmastore import getlemmastore
+        lemmastore = getlemmastore()
+        wordforms = set(toascii(token.text) for token in self.tokens)
+        corpuslemmas = lemmastore.corpuslemmas(wordforms)
+        # Punctuation and spaces have no Morpheus parses: only words go to the wordlist (a miss is a DB query)
+        words = set(toascii(token.text) for token in self.tokens if token.isword)
+        lexlemmas = {}
+        for wordform in (wordforms - set(corpuslemmas)) & words:
+            lexlemmas[wordform] = wordlist.lemmas(wordform.lower())
+        lemmafrequencies = lemmastore.lemmafrequencies(set(lemma for lemmas in lexlemmas.values() for lemma in lemmas))
         for token in self.tokens:
             wordform = toascii(token.text)
             best_lemma = "-"
             max_freq = -1
-            if wordform in wordform_to_corpus_lemmas:
-                for corpus_lemma in wordform_to_corpus_lemmas[wordform]:
-                    if word_lemma_freq[(wordform, corpus_lemma)] > max_freq:
-                        max_freq = word_lemma_freq[(wordform, corpus_lemma)]
+            if wordform in corpuslemmas:
+                for corpus_lemma, freq in corpuslemmas[wordform]:
+                    if freq > max_freq:
+                        max_freq = freq
                         best_lemma = corpus_lemma
-            elif wordform.lower() in wordlist.formtolemmas:
-                for lex_lemma in wordlist.formtolemmas[wordform.lower()]:
-                    if lemma_frequency.get(lex_lemma, 0) > max_freq:
-                        max_freq = lemma_frequency.get(lex_lemma, 0)
+            elif lexlemmas.get(wordform):
+                for lex_lemma in lexlemmas[wordform]:
+                    if lemmafrequencies.get(lex_lemma, 0) > max_freq:
+                        max_freq = lemmafrequencies.get(lex_lemma, 0)
                         best_lemma = lex_lemma
             # endif
             token.lemma = best_lemma
     # enddef
 
     def getaccents(self, wordlist):
-
-        def levenshtein(s1, s2):
-            if len(s1) < len(s2):
-                return levenshtein(s2, s1)
-            if len(s2) == 0:
-                return len(s1)
-            previous_row = range(len(s2) + 1)
-            for i, c1 in enumerate(s1):
-                current_row = [i + 1]
-                for j, c2 in enumerate(s2):
-                    insertions = previous_row[j + 1] + 1
-                    deletions = current_row[j] + 1
-                    substitutions = previous_row[j] + (c1 != c2)
-                    current_row.append(min(insertions, deletions, substitutions))
-                previous_row = current_row
-            return previous_row[-1]
-        # enddef
-
         from macronized_endings import tag_to_endings
 
         for token in self.tokens:
@@ -524,22 +848,13 @@ class Tokenization:
                 token.accented = ["ve"] if token.text.lower() == "ue" else [token.text.lower()]
             elif token.text.lower() == "ne" and token.hasenclitic:  # Not nēque...
                 token.accented = ["ne"]
-            elif len(set(wordlist.formtoaccenteds[wordform])) == 1:
-                token.accented = [wordlist.formtoaccenteds[wordform][0]]
-            elif wordform in wordlist.formtotaglemmaaccents:
-                candidates = []
-                for (lextag, lexlemma, accented) in wordlist.formtotaglemmaaccents[wordform]:
-                    # Prefer lemmas with same capitalization as the token, unless the token is at
-                    # the start of the sentence and capitalized, in which case any lemma is okay.
-                    casedist = 0 if iscapital == lexlemma.istitle() or token.startssentence and iscapital else 1
-                    tagdist = postags.tag_distance(tag, lextag)
-                    lemdist = levenshtein(lemma, lexlemma)
-                    candidates.append((casedist, tagdist, lemdist, accented))
-                candidates.sort()
-                token.accented = []
-                for (casedist, tagdist, lemdist, accented) in candidates:
-                    if accented not in token.accented and casedist == candidates[0][0]:
-                        token.accented.append(accented)
+            elif len(set(wordlist.accenteds(wordform))) == 1:
+                token.accented = [wordlist.accenteds(wordform)[0]]
+            elif wordlist.taglemmaaccents(wordform):
+                # Prefer lemmas with same capitalization as the token, unless the token is at
+                # the start of the sentence and capitalized, in which case any lemma is okay.
+                casemode = None if token.startssentence and iscapital else iscapital
+                token.accented = list(wordlist.rankedaccents(wordform, tag, lemma, casemode))
             else:
                 # Unknown word, but attempt to mark vowels in ending:
                 # To-do: Better support for different capitalization and orthography
@@ -699,42 +1014,6 @@ class Tokenization:
             return filteredscans
         # enddef
 
-        def scanverse(verse, automaton):
-            """Input: The "verse" is a complicated list of the format
-            [(tokenindex, [(penalty, scansion, accented), (penalty, scansion, accented), ...]), ...]
-            For example: [(0, [(0, 'L', 'in')]), (2, [(0, 'SL', 'no^va_'), (1, 'SS', 'no^va')]), ...]
-            It returns a tuple such as ([(0, 'in'), (2, 'no^va'), (4, 'fe^rt'), ...], 'DDSSDS') """
-            def scanverserecurse(verse, wordindex, automaton, oldnodeindex):
-                if wordindex == len(verse):
-                    return [], [], 0
-                (tokenindex, wordscansions) = verse[wordindex]
-                besttail = []
-                besttailfeet = []
-                besttailpenalty = 100
-                for (scanpenalty, scansion, accented) in wordscansions:
-                    nodeindex = oldnodeindex
-                    feet = []
-                    finished = False
-                    meterpenalty = 0
-                    for syllable in scansion:
-                        (nodeindex, foot, meterpenaltypart) = automaton.get((nodeindex, syllable), (-1, "", 0))
-                        meterpenalty += meterpenaltypart
-                        if nodeindex == 0:
-                            finished = True
-                        feet.append(foot)
-                    if nodeindex == -1 or finished and (nodeindex != 0 or wordindex != len(verse)-1):
-                        continue
-                    tail, tailfeet, tailpenalty = scanverserecurse(verse, wordindex+1, automaton, nodeindex)
-                    if scanpenalty + meterpenalty + tailpenalty < besttailpenalty:
-                        besttail = [(tokenindex, accented)] + tail
-                        besttailfeet = feet + tailfeet
-                        besttailpenalty = scanpenalty + meterpenalty + tailpenalty
-                return besttail, besttailfeet, besttailpenalty
-            # enddef
-            indexaccentedpairs, feet, penalty = scanverserecurse(verse, 0, automaton, 0)
-            return indexaccentedpairs, "".join(feet)
-        # enddef
-
         self.scannedfeet = []
         verse = []
         automatonindex = 0
@@ -1008,13 +1287,71 @@ class Macronizer:
     # enddef
 
     def settext(self, text):
-        self.tokenization = Tokenization(text)
-        self.wordlist.loadwords(self.tokenization.allwordforms())
-        newwordforms = self.tokenization.splittokens(self.wordlist)
-        self.wordlist.loadwords(newwordforms)
+        self.tokenization = self.preparetext(text)
         self.tokenization.addtags()
-        self.tokenization.addlemmas(self.wordlist)
-        self.tokenization.getaccents(self.wordlist)
+        self.addaccents(self.tokenization)
+    # enddef
+
+    def preparetext(self, text):
+        """Tokenize the text and load its words; the returned tokenization still has to be tagged."""
+        tokenization = Tokenization(text)
+        self.wordlist.loadwords(tokenization.allwordforms())
+        newwordforms = tokenization.splittokens(self.wordlist)
+        self.wordlist.loadwords(newwordforms)
+        return tokenization
+    # enddef
+
+    def addaccents(self, tokenization):
+        tokenization.addlemmas(self.wordlist)
+        tokenization.getaccents(self.wordlist)
+    # enddef
+
+    def macronizestream(self, verses, automatons=None, chunksize=STREAM_CHUNK_SIZE, domacronize=True,
+                        alsomaius=False, performutov=False, performitoj=False, markambigs=False):
+        """Macronize an iterable of verses (or sentences), yielding the macronized verses in order.
+        The verses are processed chunksize at a time, and tagging is pipelined: while one chunk
+        gets its lemmas and accents, RFTagger is already working on the next one in another thread.
+        Only the tagging runs there; the Wordlist is used from the calling thread only."""
+        if automatons:
+            # Keep the alternation of e.g. hexameter and pentameter across chunk boundaries:
+            chunksize = max(chunksize - chunksize % len(automatons), len(automatons))
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            pending = None
+            chunk = []
+            for verse in itertools.chain(verses, [None]):
+                if verse is not None:
+                    chunk.append(verse.replace("\n", " "))
+                    if len(chunk) < chunksize:
+                        continue
+                if chunk:
+                    tokenization = self.preparetext("\n".join(chunk))
+                    tagging = executor.submit(tokenization.addtags)
+                    if pending is not None:
+                        for macronized in self.finishchunk(*pending, automatons, domacronize, alsomaius,
+                                                           performutov, performitoj, markambigs):
+                            yield macronized
+                    pending = (len(chunk), tokenization, tagging)
+                    chunk = []
+            if pending is not None:
+                for macronized in self.finishchunk(*pending, automatons, domacronize, alsomaius,
+                                                   performutov, performitoj, markambigs):
+                    yield macronized
+        finally:
+            executor.shutdown(wait=True)
+    # enddef
+
+    def finishchunk(self, versecount, tokenization, tagging, automatons, domacronize, alsomaius, performutov,
+                    performitoj, markambigs):
+        tagging.result()
+        self.tokenization = tokenization
+        self.addaccents(tokenization)
+        if automatons:
+            self.scan(automatons)
+        macronizedverses = self.gettext(domacronize, alsomaius, performutov, performitoj, markambigs).split("\n")
+        if len(macronizedverses) != versecount:
+            raise Exception("Expected %d verses but got %d back." % (versecount, len(macronizedverses)))
+        return macronizedverses
     # enddef
 
     def scan(self, automatons):
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Long-lived RFTagger processes for the macronizer.
+
+Starting rft-annotate means reading rftagger-ldt.model from disk, which costs far more
+than tagging a verse or two. Instead of one process per text, a small pool of processes
+is kept running and fed over stdin/stdout: tokens one per line, sentences separated by
+blank lines, exactly as in the temporary files used before. Every request ends with a
+sentinel sentence, so the reader knows when the tagger has caught up.
+
+rft-annotate does not flush its output after each sentence, so the persistent mode needs
+stdbuf (GNU coreutils) to make stdout line buffered. Where stdbuf is missing, the pool
+falls back to one rft-annotate run per request, fed through pipes instead of temp files.
+"""
+
+import queue
+import shutil
+import subprocess
+import threading
+
+SENTINEL = "Rftaggersentinelum"
+REQUEST_TIMEOUT = 60  # seconds to wait for the tagger to answer one request
+SUPERVISE_INTERVAL = 5  # seconds between checks for crashed workers
+
+
+class TaggerError(Exception):
+    pass
+# endclass
+
+
+class RFTaggerWorker:
+    """One rft-annotate process. Not thread safe; the pool hands it to one caller at a time."""
+
+    def __init__(self, command):
+        self.command = command
+        self.process = None
+        self.lines = None
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.start()
+    # enddef
+
+    def start(self):
+        self.lines = queue.Queue()
+        self.process = subprocess.Popen(["stdbuf", "-oL"] + self.command,
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL, encoding='utf-8', bufsize=1)
+        reader = threading.Thread(target=self.readoutput, args=(self.process.stdout, self.lines), daemon=True)
+        reader.start()
+    # enddef
+
+    @staticmethod
+    def readoutput(stream, lines):
+        for line in stream:
+            lines.put(line.rstrip("\n"))
+        lines.put(None)  # End of file: the process has died
+    # enddef
+
+    def isalive(self):
+        return self.process is not None and self.process.poll() is None
+    # enddef
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+    # enddef
+
+    def restart(self):
+        self.stop()
+        self.start()
+    # enddef
+
+    def tag(self, lines):
+        """Tag a list of input lines (tokens, with "" between sentences). Returns the tagger output."""
+        if not self.isalive():
+            raise TaggerError("rft-annotate is not running")
+        request = list(lines)
+        if request and request[-1] != "":
+            request.append("")
+        request += [SENTINEL, "", ""]
+        try:
+            self.process.stdin.write("\n".join(request))
+            self.process.stdin.flush()
+        except (OSError, ValueError):
+            raise TaggerError("Could not write to rft-annotate")
+        output = []
+        while True:
+            try:
+                line = self.lines.get(timeout=REQUEST_TIMEOUT)
+            except queue.Empty:
+                raise TaggerError("rft-annotate did not answer within %d seconds" % REQUEST_TIMEOUT)
+            if line is None:
+                raise TaggerError("rft-annotate exited unexpectedly")
+            if line.split("\t")[0] == SENTINEL:
+                break
+            output.append(line)
+        # The sentinel sentence is followed by its own blank line; consume it to stay in sync.
+        try:
+            if self.lines.get(timeout=REQUEST_TIMEOUT) != "":
+                raise TaggerError("Unexpected output from rft-annotate after sentinel")
+        except queue.Empty:
+            raise TaggerError("rft-annotate did not finish the sentinel sentence")
+        self.requests += 1
+        return "\n".join(output) + "\n"
+    # enddef
+# endclass
+
+
+class RFTaggerPool:
+    """A fixed number of warm rft-annotate workers, checked out one request at a time.
+
+    A supervisor thread restarts workers whose process has died while idle; a worker that
+    fails in the middle of a request is restarted and the request is retried once.
+    """
+
+    def __init__(self, command, size=2):
+        self.command = command
+        self.size = max(1, size)
+        self.persistent = shutil.which("stdbuf") is not None
+        self.workers = []
+        self.idle = queue.Queue()
+        self.restarts = 0
+        self.closed = threading.Event()
+        if self.persistent:
+            for _ in range(self.size):
+                worker = RFTaggerWorker(command)
+                self.workers.append(worker)
+                self.idle.put(worker)
+            supervisor = threading.Thread(target=self.supervise, daemon=True)
+            supervisor.start()
+        else:
+            self.slots = threading.Semaphore(self.size)
+    # enddef
+
+    def supervise(self):
+        while not self.closed.wait(SUPERVISE_INTERVAL):
+            for worker in self.workers:
+                if worker.isalive() or not worker.lock.acquire(blocking=False):
+                    continue
+                try:
+                    worker.restart()
+                    self.restarts += 1
+                except OSError:
+                    pass
+                finally:
+                    worker.lock.release()
+    # enddef
+
+    def tag(self, lines):
+        if not self.persistent:
+            return self.tagonce(lines)
+        worker = self.idle.get()
+        try:
+            with worker.lock:
+                try:
+                    return worker.tag(lines)
+                except TaggerError:
+                    worker.restart()
+                    self.restarts += 1
+                    return worker.tag(lines)
+        finally:
+            self.idle.put(worker)
+    # enddef
+
+    def tagonce(self, lines):
+        text = "\n".join(lines) + "\n" if lines else ""
+        with self.slots:
+            result = subprocess.run(self.command, input=text, stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL, encoding='utf-8')
+        if result.returncode != 0:
+            raise TaggerError("Failed to execute: %s" % " ".join(self.command))
+        return result.stdout
+    # enddef
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "persistent": self.persistent,
+            "idle": self.idle.qsize() if self.persistent else None,
+            "alive": sum(1 for worker in self.workers if worker.isalive()),
+            "restarts": self.restarts,
+            "requests": sum(worker.requests for worker in self.workers),
+        }
+    # enddef
+
+    def close(self):
+        self.closed.set()
+        for worker in self.workers:
+            with worker.lock:
+                worker.stop()
+    # enddef
+# endclass
+
+
+_pools = {}
+_poolslock = threading.Lock()
+
+
+def getpool(command, size):
+    """Return the process-wide pool for this tagger command, starting it on first use."""
+    key = tuple(command)
+    with _poolslock:
+        if key not in _pools:
+            _pools[key] = RFTaggerPool(list(command), size)
+        return _pools[key]
+# enddef
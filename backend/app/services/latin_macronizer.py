@@ -11,7 +11,13 @@ import sys
 import re
 import tempfile
 import sqlite3
-from typing import Optional
+import queue
+import threading
+import time
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional
 
 # Add the latin-macronizer directory to path
 MACRONIZER_DIR = os.path.join(os.path.dirname(__file__), 'latin-macronizer')
@@ -19,37 +25,143 @@ sys.path.insert(0, MACRONIZER_DIR)
 
 # Import the macronizer classes
 try:
-    from latin_macronizer.macronizer import Macronizer as MacronizerCore
+    from latin_macronizer.macronizer import Macronizer as MacronizerCore, dbversion as core_db_version
 except ImportError:
     try:
         # Try direct import if the module is in the path
         sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'latin-macronizer'))
-        from macronizer import Macronizer as MacronizerCore
+        from macronizer import Macronizer as MacronizerCore, dbversion as core_db_version
     except ImportError:
         # Fallback if we can't import the macronizer
         MacronizerCore = None
+        core_db_version = None
+
+
+WARMUP_TEXT = "In principio creavit Deus caelum et terram"
+
+
+class MacronizerPool:
+    """
+    A bounded pool of pre-warmed macronizer cores
+    
+    A core keeps per-text state and its own macronizer.db connection, so it must only be used by
+    one request at a time. Requests check a core out, use it on whatever thread they run on, and
+    return it; when all cores are busy, callers wait. Wait times and busy time are recorded.
+    """
+    
+    def __init__(self, size: int = 2):
+        self.size = max(1, size)
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.in_use = 0
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.busy_time = 0.0
+        for _ in range(self.size):
+            self._idle.put(self._create_core())
+    
+    @staticmethod
+    def _create_core():
+        core = MacronizerCore()
+        try:
+            # Start the tagger, open the lemma store, etc. before the first real request
+            core.macronize(WARMUP_TEXT)
+        except Exception as e:
+            print(f"Warning: Macronizer warm-up failed: {e}")
+        return core
+    
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        """Check out a core for the duration of the with-block"""
+        requested = time.monotonic()
+        try:
+            core = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No macronizer available within {timeout} seconds")
+        acquired = time.monotonic()
+        with self._lock:
+            waited = acquired - requested
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self.in_use += 1
+        try:
+            yield core
+        finally:
+            with self._lock:
+                self.in_use -= 1
+                self.busy_time += time.monotonic() - acquired
+            self._idle.put(core)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, current use, wait times and utilization since the pool was created"""
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            return {
+                "size": self.size,
+                "in_use": self.in_use,
+                "idle": self._idle.qsize(),
+                "checkouts": self.checkouts,
+                "avg_wait_ms": round(1000 * self.total_wait / self.checkouts, 2) if self.checkouts else 0.0,
+                "max_wait_ms": round(1000 * self.max_wait, 2),
+                "utilization": round(self.busy_time / (self.size * elapsed), 4) if elapsed > 0 else 0.0
+            }
+
+
+def make_cache(database_path: str, memory_size: int = 5000) -> Optional["MacronizationCache"]:
+    """Create a result cache tied to the version of macronizer.db, if the macronizer is available"""
+    if core_db_version is None:
+        return None
+    from backend.app.services.macronization_cache import MacronizationCache
+    return MacronizationCache(database_path, core_db_version, memory_size)
+
+
+# Per-process macronizer for the process executor (see LatinMacronizer.macronize_text_async)
+_process_macronizer = None
+
+def _init_process_worker():
+    global _process_macronizer
+    _process_macronizer = LatinMacronizer(pool_size=1)
+
+def _macronize_in_process(latin_text: str, perform_utov: bool, perform_itoj: bool, scan_meter: int) -> str:
+    return _process_macronizer._macronize_uncached(latin_text, perform_utov, perform_itoj, scan_meter)
 
 
 class LatinMacronizer:
     """Service wrapper for the latin-macronizer tool"""
     
-    def __init__(self, database_path: Optional[str] = None):
-        """Initialize the macronizer service"""
+    def __init__(self, database_path: Optional[str] = None, pool_size: int = 1, executor: str = "thread",
+                 cache: Optional["MacronizationCache"] = None):
+        """
+        Initialize the macronizer service
+        
+        Args:
+            database_path: Path to macronizer.db
+            pool_size: Number of pre-warmed macronizer cores (concurrent requests)
+            executor: Where macronize_text_async runs: "thread" (default) or "process"
+            cache: Optional result cache consulted by macronize_text (see make_cache)
+        """
         self.database_path = database_path or "macronizer.db"
-        self.macronizer = None
+        self.pool_size = max(1, pool_size)
+        self.executor = executor
+        self.cache = cache
+        self.pool = None
+        self._process_executor = None
         self._initialize_macronizer()
     
     def _initialize_macronizer(self):
-        """Initialize the macronizer core if available"""
+        """Initialize the pool of macronizer cores if available"""
         if MacronizerCore is None:
             print("Warning: Latin macronizer core not available")
             return
         
         try:
-            self.macronizer = MacronizerCore()
+            self.pool = MacronizerPool(self.pool_size)
         except Exception as e:
             print(f"Warning: Could not initialize macronizer: {e}")
-            self.macronizer = None
+            self.pool = None
     
     def macronize_text(self, latin_text: str, 
                       perform_utov: bool = False, 
@@ -67,42 +179,48 @@ class LatinMacronizer:
         Returns:
             The macronized Latin text with proper macrons
         """
-        if not self.macronizer or not latin_text.strip():
+        if not self.pool or not latin_text.strip():
             return latin_text
         
+        if self.cache is not None:
+            cached = self.cache.get(latin_text, perform_utov, perform_itoj, scan_meter)
+            if cached is not None:
+                return cached
+        
         try:
-            # Clean the input text
-            text = latin_text.strip()
-            
+            macronized = self._macronize_uncached(latin_text, perform_utov, perform_itoj, scan_meter)
+        except Exception as e:
+            print(f"Error macronizing text '{latin_text[:50]}...': {e}")
+            return latin_text
+        
+        if self.cache is not None:
+            self.cache.put(latin_text, macronized, perform_utov, perform_itoj, scan_meter)
+        return macronized
+    
+    def _macronize_uncached(self, latin_text: str, perform_utov: bool, perform_itoj: bool, scan_meter: int) -> str:
+        """Run the macronizer pipeline on a pooled core; raises on failure"""
+        # Clean the input text
+        text = latin_text.strip()
+        
+        with self.pool.checkout() as macronizer:
             # Set the text in the macronizer
-            self.macronizer.settext(text)
+            macronizer.settext(text)
             
             # Apply meter scanning if requested
-            if scan_meter > 0:
-                scansions = [
-                    [],  # prose
-                    [MacronizerCore.dactylichexameter],  # dactylic hexameters
-                    [MacronizerCore.dactylichexameter, MacronizerCore.dactylicpentameter],  # elegiac distichs
-                    [MacronizerCore.hendecasyllable],  # hendecasyllables
-                    [MacronizerCore.iambictrimeter, MacronizerCore.iambicdimeter]  # iambic trimeter + dimeter
-                ]
-                if scan_meter < len(scansions):
-                    self.macronizer.scan(scansions[scan_meter])
+            automatons = self._meter_automatons(scan_meter)
+            if automatons:
+                macronizer.scan(automatons)
             
             # Get the macronized text
-            macronized = self.macronizer.gettext(
+            macronized = macronizer.gettext(
                 domacronize=True,
                 alsomaius=False,
                 performutov=perform_utov,
                 performitoj=perform_itoj,
                 markambigs=False
             )
-            
-            return macronized.strip()
-            
-        except Exception as e:
-            print(f"Error macronizing text '{latin_text[:50]}...': {e}")
-            return latin_text
+        
+        return macronized.strip()
     
     def macronize_verse(self, verse_text: str, meter_hint: Optional[str] = None) -> str:
         """
@@ -115,25 +233,129 @@ class LatinMacronizer:
         Returns:
             The macronized verse text
         """
-        # Determine scan type based on meter hint
-        scan_type = 0  # Default to prose
+        return self.macronize_text(verse_text, scan_meter=self.scan_type_for_hint(meter_hint))
+    
+    def macronize_stream(self, verses: Iterable[str],
+                         perform_utov: bool = False,
+                         perform_itoj: bool = False,
+                         scan_meter: int = 0,
+                         chunk_size: Optional[int] = None) -> Iterator[str]:
+        """
+        Macronize verses one chunk at a time, yielding each macronized verse as soon as its chunk is done
+        
+        Unlike macronize_text, a whole book never has to be held in memory, and RFTagger tags the
+        next chunk while the current one is being accented. Verses are yielded in input order.
+        
+        Args:
+            verses: Iterable of verse texts (a generator is fine)
+            perform_utov: Convert u to v where appropriate
+            perform_itoj: Convert i to j where appropriate
+            scan_meter: Meter type for scanning (0 = prose, 1 = dactylic hexameter, etc.)
+            chunk_size: Verses per chunk (defaults to the core's STREAM_CHUNK_SIZE)
+        
+        Yields:
+            The macronized verse texts
+        """
+        if not self.pool:
+            for verse in verses:
+                yield verse
+            return
         
+        kwargs = {"chunksize": chunk_size} if chunk_size else {}
+        # One core serves the whole stream
+        with self.pool.checkout() as macronizer:
+            for macronized in macronizer.macronizestream(
+                (verse.strip() for verse in verses),
+                automatons=self._meter_automatons(scan_meter),
+                domacronize=True,
+                alsomaius=False,
+                performutov=perform_utov,
+                performitoj=perform_itoj,
+                markambigs=False,
+                **kwargs
+            ):
+                yield macronized.strip()
+    
+    async def macronize_text_async(self, latin_text: str,
+                                   perform_utov: bool = False,
+                                   perform_itoj: bool = False,
+                                   scan_meter: int = 0) -> str:
+        """
+        macronize_text without blocking the event loop
+        
+        With the thread executor the text is macronized by a core from this instance's pool on a
+        worker thread. With the process executor it goes to a pool of worker processes, each with
+        its own macronizer, which sidesteps the GIL for CPU-heavy work such as meter scanning.
+        """
+        if self.executor == "process" and self.pool and latin_text.strip():
+            if self.cache is not None:
+                cached = self.cache.get(latin_text, perform_utov, perform_itoj, scan_meter)
+                if cached is not None:
+                    return cached
+            if self._process_executor is None:
+                self._process_executor = ProcessPoolExecutor(max_workers=self.pool_size,
+                                                             initializer=_init_process_worker)
+            loop = asyncio.get_running_loop()
+            try:
+                macronized = await loop.run_in_executor(self._process_executor, _macronize_in_process,
+                                                        latin_text, perform_utov, perform_itoj, scan_meter)
+            except Exception as e:
+                print(f"Error macronizing text '{latin_text[:50]}...': {e}")
+                return latin_text
+            if self.cache is not None:
+                self.cache.put(latin_text, macronized, perform_utov, perform_itoj, scan_meter)
+            return macronized
+        return await asyncio.to_thread(self.macronize_text, latin_text, perform_utov, perform_itoj, scan_meter)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool metrics for health and monitoring endpoints"""
+        return {
+            "available": self.is_available(),
+            "executor": self.executor,
+            "pool": self.pool.stats() if self.pool else None,
+            "cache": self.cache.get_stats() if self.cache else None
+        }
+    
+    def close(self):
+        """Shut down the worker processes, if any"""
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=True, cancel_futures=True)
+            self._process_executor = None
+    
+    @staticmethod
+    def scan_type_for_hint(meter_hint: Optional[str]) -> int:
+        """Map a meter hint (prose, hexameter, elegiac, etc.) to a scan_meter value"""
         if meter_hint:
             meter_lower = meter_hint.lower()
             if 'hexameter' in meter_lower or 'epic' in meter_lower:
-                scan_type = 1
+                return 1
             elif 'elegiac' in meter_lower or 'distich' in meter_lower:
-                scan_type = 2
+                return 2
             elif 'hendecasyllab' in meter_lower:
-                scan_type = 3
+                return 3
             elif 'iambic' in meter_lower:
-                scan_type = 4
-        
-        return self.macronize_text(verse_text, scan_meter=scan_type)
+                return 4
+        return 0  # Default to prose
+    
+    @staticmethod
+    def _meter_automatons(scan_meter: int) -> list:
+        """The meter automatons for a scan_meter value; empty for prose"""
+        if scan_meter <= 0:
+            return []
+        scansions = [
+            [],  # prose
+            [MacronizerCore.dactylichexameter],  # dactylic hexameters
+            [MacronizerCore.dactylichexameter, MacronizerCore.dactylicpentameter],  # elegiac distichs
+            [MacronizerCore.hendecasyllable],  # hendecasyllables
+            [MacronizerCore.iambictrimeter, MacronizerCore.iambicdimeter]  # iambic trimeter + dimeter
+        ]
+        if scan_meter < len(scansions):
+            return scansions[scan_meter]
+        return []
     
     def is_available(self) -> bool:
         """Check if the macronizer is available and working"""
-        return self.macronizer is not None
+        return self.pool is not None
     
     def test_macronizer(self) -> bool:
         """Test the macronizer with a simple example"""
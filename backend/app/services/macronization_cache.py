@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Macronization Result Cache
+Two-tier cache (in-memory LRU in front of SQLite) for macronized texts, so the same
+verses are not run through the whole macronizer pipeline again and again.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Callable, Dict, Optional
+
+from backend.app.utils.lru_cache import LRUCache
+
+# Bump when a change to the macronizer itself makes earlier results obsolete
+CACHE_FORMAT_VERSION = 1
+
+# How often (seconds) to re-read the macronizer.db version
+VERSION_CHECK_INTERVAL = 30
+
+
+def normalize_text(text: str) -> str:
+    """Normalize the text for the cache key: NFC and trimmed. Inner whitespace is kept, since the
+    macronizer reproduces it (and line breaks matter for meter scanning)."""
+    return unicodedata.normalize("NFC", text).strip()
+
+
+class MacronizationCache:
+    """
+    Cache of macronized text keyed on a hash of (normalized text, perform_utov, perform_itoj,
+    scan_meter, macronizer DB version)
+
+    The DB version comes from macronizer.db (PRAGMA user_version, bumped whenever the database
+    is reinitialized). When it changes, the memory tier is cleared and rows computed against
+    the old database are deleted from the SQLite tier.
+    """
+
+    def __init__(self, database_path: str, db_version: Callable[[], int], memory_size: int = 5000):
+        """
+        Args:
+            database_path: SQLite file for the persistent tier
+            db_version: Returns the current macronizer DB version
+            memory_size: Entries kept in the in-memory LRU tier
+        """
+        self.database_path = database_path
+        self._db_version = db_version
+        self.memory = LRUCache(memory_size)
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked = 0.0
+        self.sqlite_hits = 0
+        self.setup_database()
+        self.current_version()
+
+    def setup_database(self):
+        conn = sqlite3.connect(self.database_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS macronization_cache (
+                cache_key TEXT PRIMARY KEY,
+                db_version INTEGER NOT NULL,
+                original_text TEXT NOT NULL,
+                macronized_text TEXT NOT NULL,
+                perform_utov BOOLEAN,
+                perform_itoj BOOLEAN,
+                scan_meter INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_macronization_cache_version ON macronization_cache(db_version)')
+        conn.commit()
+        conn.close()
+
+    def current_version(self) -> int:
+        """The macronizer DB version, re-read at most every VERSION_CHECK_INTERVAL seconds"""
+        now = time.monotonic()
+        with self._lock:
+            if self._version is not None and now - self._version_checked < VERSION_CHECK_INTERVAL:
+                return self._version
+            version = self._db_version()
+            changed = self._version is not None and version != self._version
+            self._version = version
+            self._version_checked = now
+        if changed:
+            self.invalidate_stale(version)
+        return version
+
+    def invalidate_stale(self, version: int):
+        """Drop everything computed against another macronizer DB version"""
+        self.memory.clear()
+        conn = sqlite3.connect(self.database_path)
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM macronization_cache WHERE db_version != ?', (version,))
+        deleted = cursor.rowcount
+        conn.commit()
+        conn.close()
+        print(f"Macronizer DB version is now {version}: dropped {deleted} cached macronizations")
+
+    def make_key(self, text: str, perform_utov: bool, perform_itoj: bool, scan_meter: int,
+                 version: Optional[int] = None) -> str:
+        version = self.current_version() if version is None else version
+        payload = json.dumps([normalize_text(text), bool(perform_utov), bool(perform_itoj), int(scan_meter),
+                              version, CACHE_FORMAT_VERSION], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, text: str, perform_utov: bool = False, perform_itoj: bool = False,
+            scan_meter: int = 0) -> Optional[str]:
+        """Return the cached macronization, or None"""
+        key = self.make_key(text, perform_utov, perform_itoj, scan_meter)
+        macronized = self.memory.get(key)
+        if macronized is not None:
+            return macronized
+
+        conn = sqlite3.connect(self.database_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT macronized_text FROM macronization_cache WHERE cache_key = ?', (key,))
+        row = cursor.fetchone()
+        conn.close()
+        if row is None:
+            return None
+        self.sqlite_hits += 1
+        self.memory.put(key, row[0])
+        return row[0]
+
+    def put(self, text: str, macronized: str, perform_utov: bool = False, perform_itoj: bool = False,
+            scan_meter: int = 0):
+        """Store a macronization in both tiers"""
+        version = self.current_version()
+        key = self.make_key(text, perform_utov, perform_itoj, scan_meter, version)
+        self.memory.put(key, macronized)
+        conn = sqlite3.connect(self.database_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO macronization_cache
+            (cache_key, db_version, original_text, macronized_text, perform_utov, perform_itoj, scan_meter)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (key, version, normalize_text(text), macronized, perform_utov, perform_itoj, scan_meter))
+        conn.commit()
+        conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        conn = sqlite3.connect(self.database_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM macronization_cache')
+        stored = cursor.fetchone()[0]
+        conn.close()
+        return {
+            "db_version": self._version,
+            "memory": self.memory.stats(),
+            "sqlite_entries": stored,
+            "sqlite_hits": self.sqlite_hits
+        }
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+OpenAI Rate Limiter
+Token-bucket limiter for OpenAI calls with a requests/min and a tokens/min budget, shared by
+EnhancedDictionary, VulgateAnalyzer and AILexiconBuilder.
+
+Waiters are served by priority class (interactive before analysis before batch), then in
+arrival order. Async callers wait with asyncio.sleep and never block the event loop; code
+that already runs in a worker thread (the synchronous OpenAI clients) uses acquire_blocking.
+"""
+
+import asyncio
+import bisect
+import contextvars
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.app.core.config import settings
+
+# Lower value is served first
+PRIORITIES = {"interactive": 0, "analysis": 1, "batch": 2}
+DEFAULT_PRIORITY = "interactive"
+
+# How often a waiter that is not at the head of the queue re-checks (seconds)
+POLL_INTERVAL = 0.05
+
+# Priority class for OpenAI calls made in the current context (copied into asyncio.to_thread)
+_current_priority: contextvars.ContextVar = contextvars.ContextVar("openai_priority", default=DEFAULT_PRIORITY)
+
+
+@contextmanager
+def openai_priority(priority: str):
+    """Run the OpenAI calls made inside the block under a priority class"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority class '{priority}', expected one of {list(PRIORITIES)}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def estimate_tokens(messages: List[Dict[str, Any]], max_tokens: int = 0) -> int:
+    """Rough token count of a chat request: ~4 characters per token plus the completion budget"""
+    characters = sum(len(str(message.get("content", ""))) for message in messages)
+    return characters // 4 + max_tokens
+
+
+class TokenBucketRateLimiter:
+    """Two token buckets (requests and tokens) refilled continuously, with a priority queue"""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, burst_seconds: float = 10.0):
+        """
+        Args:
+            requests_per_minute: Sustained request budget
+            tokens_per_minute: Sustained token budget (prompt + completion)
+            burst_seconds: Bucket capacity, in seconds' worth of budget
+        """
+        self.request_rate = requests_per_minute / 60.0
+        self.token_rate = tokens_per_minute / 60.0
+        self.request_capacity = max(1.0, self.request_rate * burst_seconds)
+        self.token_capacity = max(1.0, self.token_rate * burst_seconds)
+        self._requests = self.request_capacity
+        self._tokens = self.token_capacity
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+        self._waiting: List[Tuple[int, int]] = []  # sorted (priority, sequence) tickets
+        self._sequence = itertools.count()
+        self.granted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self, now: float):
+        elapsed = now - self._refilled
+        self._refilled = now
+        self._requests = min(self.request_capacity, self._requests + elapsed * self.request_rate)
+        self._tokens = min(self.token_capacity, self._tokens + elapsed * self.token_rate)
+
+    def _enqueue(self, priority: Optional[str]) -> Tuple[int, int]:
+        priority = priority or _current_priority.get()
+        ticket = (PRIORITIES.get(priority, PRIORITIES[DEFAULT_PRIORITY]), next(self._sequence))
+        with self._lock:
+            bisect.insort(self._waiting, ticket)
+        return ticket
+
+    def _dequeue(self, ticket: Tuple[int, int]):
+        with self._lock:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+
+    def _try_take(self, ticket: Tuple[int, int], tokens: int) -> float:
+        """Take one request and the tokens if ticket is first in line; else how long to wait"""
+        tokens = min(tokens, self.token_capacity)
+        with self._lock:
+            if self._waiting[0] != ticket:
+                return POLL_INTERVAL
+            self._refill(time.monotonic())
+            if self._requests >= 1 and self._tokens >= tokens:
+                self._requests -= 1
+                self._tokens -= tokens
+                self._waiting.pop(0)
+                return 0.0
+            request_wait = (1 - self._requests) / self.request_rate if self._requests < 1 else 0.0
+            token_wait = (tokens - self._tokens) / self.token_rate if self._tokens < tokens else 0.0
+            return max(request_wait, token_wait, 0.001)
+
+    def _granted(self, waited: float):
+        with self._lock:
+            self.granted += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    async def acquire(self, tokens: int = 0, priority: Optional[str] = None) -> float:
+        """Wait (without blocking the loop) for one request and the tokens; returns seconds waited"""
+        start = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                delay = self._try_take(ticket, tokens)
+                if delay <= 0:
+                    break
+                await asyncio.sleep(min(delay, POLL_INTERVAL))
+        finally:
+            self._dequeue(ticket)
+        waited = time.monotonic() - start
+        self._granted(waited)
+        return waited
+
+    def acquire_blocking(self, tokens: int = 0, priority: Optional[str] = None) -> float:
+        """acquire() for worker threads; never call this on the event loop"""
+        start = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                delay = self._try_take(ticket, tokens)
+                if delay <= 0:
+                    break
+                time.sleep(min(delay, POLL_INTERVAL))
+        finally:
+            self._dequeue(ticket)
+        waited = time.monotonic() - start
+        self._granted(waited)
+        return waited
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """Correct the token bucket once the real usage of a call is known"""
+        if actual_tokens is None:
+            return
+        with self._lock:
+            self._tokens -= actual_tokens - min(estimated_tokens, self.token_capacity)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            names = {value: name for name, value in PRIORITIES.items()}
+            depth = {name: 0 for name in PRIORITIES}
+            for priority, _ in self._waiting:
+                depth[names[priority]] += 1
+            return {
+                "requests_per_minute": round(self.request_rate * 60, 2),
+                "tokens_per_minute": round(self.token_rate * 60, 2),
+                "available_requests": round(self._requests, 2),
+                "available_tokens": round(self._tokens, 2),
+                "queue_depth": len(self._waiting),
+                "queue_depth_by_priority": depth,
+                "granted": self.granted,
+                "avg_wait_ms": round(self.total_wait / self.granted * 1000, 2) if self.granted else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 2)
+            }
+
+
+_limiter: Optional[TokenBucketRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucketRateLimiter:
+    """The process-wide OpenAI limiter, built from settings on first use"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = TokenBucketRateLimiter(settings.OPENAI_REQUESTS_PER_MINUTE,
+                                              settings.OPENAI_TOKENS_PER_MINUTE,
+                                              settings.OPENAI_RATE_BURST_SECONDS)
+        return _limiter
+
+
+def _total_tokens(response) -> Optional[int]:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+def chat_completion(client, priority: Optional[str] = None, **kwargs):
+    """client.chat.completions.create() behind the shared limiter (blocking; use from threads)"""
+    limiter = get_rate_limiter()
+    estimated = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens", 0))
+    limiter.acquire_blocking(estimated, priority)
+    response = client.chat.completions.create(**kwargs)
+    limiter.record_usage(estimated, _total_tokens(response))
+    return response
+
+
+async def achat_completion(client, priority: Optional[str] = None, **kwargs):
+    """chat_completion() for coroutines: waits on the loop, runs the call in a worker thread"""
+    limiter = get_rate_limiter()
+    estimated = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens", 0))
+    await limiter.acquire(estimated, priority)
+    response = await asyncio.to_thread(client.chat.completions.create, **kwargs)
+    limiter.record_usage(estimated, _total_tokens(response))
+    return response
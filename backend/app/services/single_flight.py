@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Single-Flight Request Coalescing
+When several callers ask for the same key at the same time (e.g. everyone opening the same
+chapter before its analysis is cached), only the first runs the expensive call; the others
+wait for it and receive the same result or exception.
+"""
+
+import asyncio
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls by key, from threads (do) and coroutines (ado) alike"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.coalesced_by_key: Counter = Counter()
+
+    def _join(self, key: Hashable):
+        """Return (future, is_leader) for key"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                self.coalesced_by_key[key] += 1
+                return future, False
+            future = self._in_flight[key] = Future()
+            self.calls += 1
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None):
+        with self._lock:
+            self._in_flight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) unless a call for key is already running; then wait for that one"""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def ado(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """do() for coroutines: fn (synchronous) runs in a worker thread, waiting never blocks the loop"""
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await asyncio.to_thread(fn, *args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "upstream_calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+                "most_coalesced": [
+                    {"key": (" / ".join(map(str, key)) if isinstance(key, tuple) else str(key))[:120], "coalesced": count}
+                    for key, count in self.coalesced_by_key.most_common(top)
+                ]
+            }
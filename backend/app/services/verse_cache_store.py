@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Verse Translation and Alignment Store
+Normalized cache tables for verse translations and word alignments, replacing the JSON blobs
+in translation_cache.translation_data and verse_analysis_cache.translations_json /
+word_alignments_json. A reader asks for exactly the kinds it needs (e.g. only the dynamic
+translation, or only the literal alignments) instead of parsing the whole payload.
+
+Tables:
+    verse_translations      one row per (verse_reference, language_code, kind)
+    verse_alignment_sets    method/confidence/word count per (verse_reference, language_code, kind)
+    verse_alignments        one row per source word (aligned or not), keyed by source_index
+
+Kinds are "literal" and "dynamic" ("translation" too for translations: the text the client
+asked for). language_code is the target language.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from backend.app.db.sqlite_pool import get_pool
+
+TRANSLATION_KINDS = ("translation", "literal", "dynamic")
+ALIGNMENT_KINDS = ("literal", "dynamic")
+
+# Separator for the target words of one alignment row (never part of a tokenized word)
+WORD_SEPARATOR = "\t"
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS verse_translations (
+        verse_reference TEXT NOT NULL,
+        language_code TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        text TEXT NOT NULL,
+        source_language TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (verse_reference, language_code, kind)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS verse_alignment_sets (
+        verse_reference TEXT NOT NULL,
+        language_code TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        method TEXT,
+        confidence REAL,
+        word_count INTEGER,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (verse_reference, language_code, kind)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS verse_alignments (
+        verse_reference TEXT NOT NULL,
+        language_code TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        source_index INTEGER NOT NULL,
+        source_word TEXT,
+        target_words TEXT,
+        target_indices TEXT,
+        confidence REAL,
+        PRIMARY KEY (verse_reference, language_code, kind, source_index)
+    )
+    ''',
+    # The primary keys already index (verse_reference, language_code, kind)
+    'CREATE INDEX IF NOT EXISTS idx_verse_translations_language ON verse_translations(language_code, kind)',
+]
+
+INSERT_TRANSLATION_ROW_SQL = '''
+    INSERT OR REPLACE INTO verse_translations (verse_reference, language_code, kind, text, source_language, updated_at)
+    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+'''
+INSERT_ALIGNMENT_SET_SQL = '''
+    INSERT OR REPLACE INTO verse_alignment_sets (verse_reference, language_code, kind, method, confidence, word_count, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+'''
+DELETE_ALIGNMENT_ROWS_SQL = 'DELETE FROM verse_alignments WHERE verse_reference = ? AND language_code = ? AND kind = ?'
+INSERT_ALIGNMENT_ROW_SQL = '''
+    INSERT OR REPLACE INTO verse_alignments
+    (verse_reference, language_code, kind, source_index, source_word, target_words, target_indices, confidence)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+SELECT_SOURCE_WORDS_SQL = '''
+    SELECT source_index, source_word FROM verse_alignments
+    WHERE verse_reference = ? AND language_code = ? AND source_word IS NOT NULL
+'''
+SELECT_ALIGNMENT_SETS_SQL = '''
+    SELECT kind, method, confidence, word_count FROM verse_alignment_sets
+    WHERE verse_reference = ? AND language_code = ? AND kind IN ({placeholders})
+'''
+SELECT_ALIGNMENT_ROWS_SQL = '''
+    SELECT kind, source_index, source_word, target_words, target_indices, confidence FROM verse_alignments
+    WHERE verse_reference = ? AND language_code = ? AND kind IN ({placeholders})
+    ORDER BY kind, source_index
+'''
+SELECT_TRANSLATIONS_SQL = '''
+    SELECT kind, text, source_language FROM verse_translations
+    WHERE verse_reference = ? AND language_code = ? AND kind IN ({placeholders})
+'''
+
+
+def _placeholders(values: Sequence[Any]) -> str:
+    return ", ".join("?" * len(values))
+
+
+def _encode_indices(indices: Iterable[int]) -> str:
+    return ",".join(str(int(index)) for index in indices)
+
+
+def _decode_indices(text: Optional[str]) -> List[int]:
+    return [int(index) for index in text.split(",")] if text else []
+
+
+def _word_count(alignments: List[Dict[str, Any]]) -> int:
+    """Source positions described by an alignment list (both layouts)"""
+    return max([len(alignments)] + [alignment["source_index"] + 1 for alignment in alignments
+                                    if alignment.get("source_index") is not None])
+
+
+class VerseCacheStore:
+    """Reads and writes the normalized translation/alignment tables of one cache database"""
+
+    def __init__(self, database_path: str):
+        self.database_path = database_path
+        self.db = get_pool(database_path)
+        with self.db.transaction() as cursor:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+
+    # Translations
+
+    def save_translations(self, verse_reference: str, language_code: str, translations: Dict[str, str],
+                          source_language: Optional[str] = None, cursor=None):
+        """Store any of the kinds "translation", "literal" and "dynamic" present in translations"""
+        rows = [(verse_reference, language_code, kind, translations[kind], source_language)
+                for kind in TRANSLATION_KINDS if translations.get(kind)]
+        if not rows:
+            return
+        if cursor is not None:
+            cursor.executemany(INSERT_TRANSLATION_ROW_SQL, rows)
+        else:
+            self.db.executemany(INSERT_TRANSLATION_ROW_SQL, rows)
+
+    def get_translations(self, verse_reference: str, language_code: str,
+                         kinds: Sequence[str] = TRANSLATION_KINDS) -> Optional[Dict[str, str]]:
+        """{kind: text, "source_language": ...} for the requested kinds, or None if none are cached"""
+        rows = self.db.fetchall(SELECT_TRANSLATIONS_SQL.format(placeholders=_placeholders(kinds)),
+                                [verse_reference, language_code, *kinds])
+        if not rows:
+            return None
+        result = {kind: text for kind, text, _ in rows}
+        result["source_language"] = next((source for _, _, source in rows if source), None)
+        return result
+
+    # Alignments
+
+    def save_alignments(self, verse_reference: str, language_code: str, kind: str,
+                        alignments: List[Dict[str, Any]], method: Optional[str] = None,
+                        confidence: Optional[float] = None, word_count: Optional[int] = None, cursor=None):
+        """
+        Store one kind of alignment for a verse, replacing what was there
+
+        alignments may be the API list layout (entries with source_index/source_word) or the
+        frontend layout (one entry per source position). Every position gets a row, unaligned ones
+        with empty target_indices. Entries without a source_word keep the word already stored for
+        their position, so the frontend layout does not erase what the API layout saved.
+        """
+        def rows(stored_words):
+            for position, alignment in enumerate(alignments):
+                index = alignment.get("source_index", position)
+                yield (
+                    verse_reference, language_code, kind, index,
+                    alignment.get("source_word") or stored_words.get(index),
+                    WORD_SEPARATOR.join(alignment.get("target_words") or []),
+                    _encode_indices(alignment.get("target_indices") or []),
+                    alignment.get("confidence", 0.0)
+                )
+
+        def write(cur):
+            stored_words = {}
+            if not all(alignment.get("source_word") for alignment in alignments):
+                stored_words = dict(cur.execute(SELECT_SOURCE_WORDS_SQL, (verse_reference, language_code)).fetchall())
+            cur.execute(INSERT_ALIGNMENT_SET_SQL, (verse_reference, language_code, kind, method, confidence, word_count))
+            cur.execute(DELETE_ALIGNMENT_ROWS_SQL, (verse_reference, language_code, kind))
+            cur.executemany(INSERT_ALIGNMENT_ROW_SQL, list(rows(stored_words)))
+
+        if cursor is not None:
+            write(cursor)
+        else:
+            with self.db.transaction() as cur:
+                write(cur)
+
+    def get_alignments(self, verse_reference: str, language_code: str,
+                       kinds: Sequence[str] = ALIGNMENT_KINDS) -> Optional[Dict[str, Dict[str, Any]]]:
+        """{kind: {"method", "confidence", "word_count", "alignments": [API list layout]}}, or None"""
+        params = [verse_reference, language_code, *kinds]
+        sets = self.db.fetchall(SELECT_ALIGNMENT_SETS_SQL.format(placeholders=_placeholders(kinds)), params)
+        if not sets:
+            return None
+        result = {kind: {"method": method, "confidence": confidence or 0.0, "word_count": word_count, "alignments": []}
+                  for kind, method, confidence, word_count in sets}
+        for kind, index, source_word, target_words, target_indices, confidence in self.db.fetchall(
+                SELECT_ALIGNMENT_ROWS_SQL.format(placeholders=_placeholders(kinds)), params):
+            result[kind]["alignments"].append({
+                "source_word": source_word,
+                "source_index": index,
+                "target_words": target_words.split(WORD_SEPARATOR) if target_words else [],
+                "target_indices": _decode_indices(target_indices),
+                "confidence": confidence
+            })
+        return result
+
+    def save_frontend_alignments(self, verse_reference: str, language_code: str, frontend: Dict[str, Any], cursor=None):
+        """Store the output of WordAligner.format_alignment_for_frontend"""
+        for kind in ALIGNMENT_KINDS:
+            positions = frontend.get(kind) or []
+            self.save_alignments(verse_reference, language_code, kind, positions,
+                                 method=frontend.get("method"),
+                                 confidence=frontend.get(f"{kind}_confidence", frontend.get("average_confidence")),
+                                 word_count=len(positions), cursor=cursor)
+
+    def get_frontend_alignments(self, verse_reference: str, language_code: str) -> Optional[Dict[str, Any]]:
+        """Rebuild the format_alignment_for_frontend layout (position-indexed arrays)"""
+        stored = self.get_alignments(verse_reference, language_code)
+        if not stored:
+            return None
+        word_counts = {kind: entry["word_count"] or _word_count(entry["alignments"]) for kind, entry in stored.items()}
+        result: Dict[str, Any] = {}
+        for kind in ALIGNMENT_KINDS:
+            entry = stored.get(kind) or {"alignments": [], "confidence": 0.0}
+            # A kind stored without positions still spans the verse, like the arrays of the other kind
+            word_count = word_counts.get(kind) or max(word_counts.values())
+            positions = [{"target_words": [], "target_indices": [], "confidence": 0.0} for _ in range(word_count)]
+            for alignment in entry["alignments"]:
+                if 0 <= alignment["source_index"] < word_count:
+                    positions[alignment["source_index"]] = {
+                        "target_words": alignment["target_words"],
+                        "target_indices": alignment["target_indices"],
+                        "confidence": alignment["confidence"]
+                    }
+            result[kind] = positions
+            result[f"{kind}_confidence"] = entry["confidence"]
+        result["method"] = next((stored[kind]["method"] for kind in ALIGNMENT_KINDS if kind in stored), "unknown")
+        # Averaged over the kinds that have alignments, as /dictionary/translate does
+        confidences = [result[f"{kind}_confidence"] for kind in ALIGNMENT_KINDS if stored.get(kind, {}).get("alignments")]
+        result["average_confidence"] = sum(confidences) / len(confidences) if confidences else 0.0
+        return result
+
+    # The /dictionary/translate payload
+
+    def save_translation_payload(self, verse_reference: str, language_code: str, data: Dict[str, Any],
+                                 cursor=None) -> Dict[str, Any]:
+        """
+        Store the translations and alignments of a /dictionary/translate cache payload in the
+        normalized tables; returns the remaining fields (e.g. "analysis") still to be kept as JSON
+        """
+        self.save_translations(verse_reference, language_code, data, data.get("source_language"), cursor=cursor)
+        alignments = data.get("word_alignments") or {}
+        for kind in ALIGNMENT_KINDS:
+            if kind in alignments:
+                self.save_alignments(verse_reference, language_code, kind, alignments[kind],
+                                     method=alignments.get("method"),
+                                     confidence=alignments.get(f"{kind}_confidence"),
+                                     word_count=_word_count(alignments[kind]),
+                                     cursor=cursor)
+        normalized = set(TRANSLATION_KINDS) | {"source_language", "word_alignments"}
+        return {key: value for key, value in data.items() if key not in normalized}
+
+    def get_translation_payload(self, verse_reference: str, language_code: str,
+                                include_alignments: bool = True) -> Optional[Dict[str, Any]]:
+        """Rebuild a /dictionary/translate cache payload, or None if the verse is not cached"""
+        translations = self.get_translations(verse_reference, language_code)
+        if not translations:
+            return None
+        payload = dict(translations)
+        if include_alignments:
+            stored = self.get_alignments(verse_reference, language_code) or {}
+            literal = stored.get("literal", {})
+            dynamic = stored.get("dynamic", {})
+            literal_confidence = literal.get("confidence", 0.0)
+            dynamic_confidence = dynamic.get("confidence", 0.0)
+            payload["word_alignments"] = {
+                "literal": literal.get("alignments", []),
+                "dynamic": dynamic.get("alignments", []),
+                "method": literal.get("method") or dynamic.get("method") or "fallback",
+                "literal_confidence": literal_confidence,
+                "dynamic_confidence": dynamic_confidence,
+                "average_confidence": (
+                    (literal_confidence + dynamic_confidence) / 2
+                    if literal.get("alignments") and dynamic.get("alignments") else
+                    literal_confidence if literal.get("alignments") else
+                    dynamic_confidence if dynamic.get("alignments") else 0.0
+                )
+            }
+        return payload
+
+
+_stores: Dict[str, VerseCacheStore] = {}
+
+
+def get_verse_cache_store(database_path: str) -> VerseCacheStore:
+    """The store for a cache database (tables are created on first use)"""
+    store = _stores.get(database_path)
+    if store is None:
+        store = _stores[database_path] = VerseCacheStore(database_path)
+    return store
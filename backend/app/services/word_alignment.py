@@ -6,21 +6,32 @@ Provides semantic-based word alignment between source and target texts
 import re
 import json
 import logging
+import threading
+import time
+import importlib.util
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 
-# Initialize availability flag
-SIMALIGN_AVAILABLE = False
+from backend.app.core.config import settings
+from backend.app.services.alignment_backends import apply_inference_backend
+from backend.app.services.embedding_cache import get_embedding_cache, sentence_hash
+from backend.app.services.fallback_aligner import TargetIndex, get_alignment_lexicon
 
-try:
-    import torch
-    from transformers import AutoTokenizer, AutoModel
-    from simalign import SentenceAligner
-    SIMALIGN_AVAILABLE = True
-except ImportError:
-    SIMALIGN_AVAILABLE = False
+# Availability is checked without importing: torch/transformers are only imported when the
+# model is loaded (in the background at startup), not when the API imports this module
+SIMALIGN_AVAILABLE = all(importlib.util.find_spec(module) is not None
+                         for module in ("torch", "transformers", "simalign"))
+if not SIMALIGN_AVAILABLE:
     logging.warning("SimAlign not available. Install with: pip install simalign torch transformers")
 
+# Sentences per padded forward pass in align_pairs (CPU: larger batches mostly add padding)
+ALIGN_BATCH_SIZE = 32
+
+# SimAlign's "bert" model; cached source embeddings are keyed by it, its default layer, the
+# token type and the inference backend (backends round differently)
+BERT_MODEL = "bert-base-multilingual-cased"
+EMBEDDING_MODEL = f"{BERT_MODEL}/layer8/bpe"
+
 @dataclass
 class WordAlignment:
     source_word: str
@@ -30,23 +41,96 @@ class WordAlignment:
     confidence: float = 0.0
 
 class AdvancedWordAligner:
-    def __init__(self):
+    def __init__(self, load_model: bool = True, backend: Optional[str] = None):
+        """
+        Args:
+            load_model: Load SimAlign now (blocking); pass False and call start_loading()
+                to load it in a background thread while alignments use the fallback
+            backend: Encoder inference backend (torch, torch_int8, onnx, onnx_int8);
+                defaults to settings.ALIGNMENT_BACKEND
+        """
         self.logger = logging.getLogger(__name__)
         self.aligner = None
         self.tokenizer = None
         self.model = None
-        
-        if SIMALIGN_AVAILABLE:
-            try:
-                # Initialize SimAlign with multilingual BERT
-                self.aligner = SentenceAligner(
-                    model="bert",
-                    token_type="bpe",
-                    matching_methods="mai"  # Maximum Alignment Inference
-                )
-                self.logger.info("SimAlign initialized successfully")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize SimAlign: {e}")
+        self.backend = backend or settings.ALIGNMENT_BACKEND
+        self.embedding_model = f"{EMBEDDING_MODEL}/{self.backend}"
+        self.encoded_sentences = 0  # sentences run through the encoder (cache misses included)
+        
+        # Model state: not_loaded -> loading -> ready | failed, or unavailable without SimAlign
+        self.state = "not_loaded" if SIMALIGN_AVAILABLE else "unavailable"
+        self.load_error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self._load_lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._loader: Optional[threading.Thread] = None
+        if not SIMALIGN_AVAILABLE:
+            self._loaded.set()
+        elif load_model:
+            self.load_model()
+
+    @property
+    def is_ready(self) -> bool:
+        """True once SimAlign is loaded; until then alignments use the fallback aligner"""
+        return self.state == "ready"
+
+    @property
+    def is_loading(self) -> bool:
+        """True until the model load has finished (results until then are provisional fallbacks)"""
+        return self.state in ("not_loaded", "loading")
+
+    def load_model(self):
+        """Import torch/transformers and load multilingual BERT (blocking; once)"""
+        with self._load_lock:
+            if self.state != "not_loaded":
+                return
+            self.state = "loading"
+        start = time.perf_counter()
+        try:
+            from simalign import SentenceAligner
+            # Initialize SimAlign with multilingual BERT
+            self.aligner = SentenceAligner(
+                model="bert",
+                token_type="bpe",
+                matching_methods="mai"  # Maximum Alignment Inference
+            )
+            self.backend = apply_inference_backend(self.aligner, self.backend, settings.ALIGNMENT_ONNX_DIR, BERT_MODEL)
+            self.embedding_model = f"{EMBEDDING_MODEL}/{self.backend}"
+            self.state = "ready"
+            self.logger.info("SimAlign initialized successfully")
+        except Exception as e:
+            self.state = "failed"
+            self.load_error = str(e)
+            self.logger.error(f"Failed to initialize SimAlign: {e}")
+        finally:
+            self.load_seconds = round(time.perf_counter() - start, 2)
+            self._loaded.set()
+
+    def start_loading(self):
+        """Load the model in a daemon thread and return immediately (no-op if loading already started)"""
+        with self._load_lock:
+            if self.state != "not_loaded" or self._loader is not None:
+                return
+            self._loader = threading.Thread(target=self.load_model, name="word-aligner-loader", daemon=True)
+        self._loader.start()
+
+    def wait_until_loaded(self, timeout: Optional[float] = None) -> bool:
+        """Block until loading finished (loading here if nobody started it); returns is_ready"""
+        if self.state == "not_loaded" and self._loader is None:
+            self.load_model()
+        self._loaded.wait(timeout)
+        return self.is_ready
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness for /health"""
+        return {
+            "ready": self.is_ready,
+            "state": self.state,
+            "method": "simalign_bert" if self.is_ready else "fallback",
+            "backend": self.backend,
+            "load_seconds": self.load_seconds,
+            "error": self.load_error
+        }
 
     def align_words(self, source_text: str, target_text: str, source_language: str = "latin") -> Dict[str, List[WordAlignment]]:
         """
@@ -61,8 +145,10 @@ class AdvancedWordAligner:
             Dictionary with alignment results for literal and dynamic translations
         """
         
-        if not SIMALIGN_AVAILABLE:
-            self.logger.warning("SimAlign not available, falling back to basic alignment")
+        if not self.is_ready:
+            if self.state in ("unavailable", "failed"):
+                self.logger.warning("SimAlign not available, falling back to basic alignment")
+            # Still loading: answer now with the fallback instead of waiting for the model
             return self._fallback_alignment(source_text, target_text, source_language)
         
         try:
@@ -88,6 +174,121 @@ class AdvancedWordAligner:
             self.logger.error(f"SimAlign failed: {e}")
             return self._fallback_alignment(source_text, target_text, source_language)
 
+    def align_many(self, source_text: str, target_texts: List[str], source_language: str = "latin") -> List[Dict[str, Any]]:
+        """
+        Align one source against several targets (e.g. its literal and dynamic translations)
+        in one forward pass: the source is encoded once, padded into a batch with the targets
+        
+        Returns:
+            One align_words() result per target, in order
+        """
+        return self.align_pairs([(source_text, target_text) for target_text in target_texts], source_language)
+
+    def align_pairs(self, pairs: List[Tuple[str, str]], source_language: str = "latin",
+                    batch_size: int = ALIGN_BATCH_SIZE) -> List[Dict[str, Any]]:
+        """
+        Bulk alignment of (source, target) pairs, e.g. every verse of a chapter with its translations.
+        Each distinct sentence is encoded once, batch_size sentences per forward pass;
+        source sentences come from the embedding cache when they were encoded before.
+        
+        Returns:
+            One align_words() result per pair, in order
+        """
+        if not self.is_ready:
+            return [self.align_words(source_text, target_text, source_language) for source_text, target_text in pairs]
+        
+        try:
+            sources = [self._tokenize_text(source_text, source_language) for source_text, _ in pairs]
+            targets = [self._tokenize_text(target_text, "target") for _, target_text in pairs]
+            embedded = self._embed_sentences(sources + targets, batch_size, cached=sources)
+            
+            results = []
+            for (source_text, target_text), source_tokens, target_tokens in zip(pairs, sources, targets):
+                source = embedded.get(tuple(source_tokens))
+                target = embedded.get(tuple(target_tokens))
+                if source is None or target is None:
+                    # Empty or truncated sentence: let align_words deal with it
+                    results.append(self.align_words(source_text, target_text, source_language))
+                    continue
+                word_alignments = self._convert_alignments(
+                    source_tokens, target_tokens, self._mwmf_alignments(source, target)
+                )
+                results.append({
+                    "alignments": word_alignments,
+                    "method": "simalign_bert",
+                    "confidence": self._calculate_average_confidence(word_alignments)
+                })
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Batched SimAlign failed, aligning pair by pair: {e}")
+            return [self.align_words(source_text, target_text, source_language) for source_text, target_text in pairs]
+
+    def warm_source_embeddings(self, source_texts: List[str], source_language: str = "latin",
+                               batch_size: int = ALIGN_BATCH_SIZE) -> int:
+        """
+        Encode source verses into the embedding cache ahead of time (e.g. a whole book)
+        
+        Returns:
+            Number of sentences that had to be encoded (0 when all were cached already)
+        """
+        if not self.is_ready or get_embedding_cache() is None:
+            return 0
+        sources = [self._tokenize_text(source_text, source_language) for source_text in source_texts]
+        before = self.encoded_sentences
+        self._embed_sentences(sources, batch_size, cached=sources)
+        return self.encoded_sentences - before
+
+    def _embed_sentences(self, sentences: List[List[str]], batch_size: int,
+                         cached: Optional[List[List[str]]] = None) -> Dict[Tuple[str, ...], Tuple[Any, List[int]]]:
+        """
+        Subword embeddings and subword-to-word maps of each distinct sentence, batch_size per forward pass.
+        Sentences listed in cached (the source side) are read from and written to the embedding cache.
+        """
+        embed_loader = self.aligner.embed_loader
+        embedded = {}
+        cache = get_embedding_cache() if cached else None
+        cacheable = {}
+        if cache is not None:
+            cacheable = {tuple(sentence): sentence_hash(sentence) for sentence in cached if sentence}
+            try:
+                found = cache.get_many(list(cacheable.values()), self.embedding_model)
+            except Exception as e:
+                self.logger.warning(f"Source embedding cache unavailable: {e}")
+                found = {}
+            for words, key in cacheable.items():
+                if key in found:
+                    embedded[words] = found[key]
+        # Similar lengths in one batch keep the padding short
+        unique = sorted(dict.fromkeys(tuple(sentence) for sentence in sentences
+                                      if sentence and tuple(sentence) not in embedded), key=len)
+        encoded = {}
+        for start in range(0, len(unique), batch_size):
+            batch = [list(sentence) for sentence in unique[start:start + batch_size]]
+            vectors = embed_loader.get_embed_list(batch).cpu().detach().numpy()
+            for words, row in zip(batch, vectors):
+                subword_to_word = [index for index, word in enumerate(words) for _ in embed_loader.tokenizer.tokenize(word)]
+                if len(subword_to_word) <= len(row):  # longer means the tokenizer truncated it
+                    encoded[tuple(words)] = (row[:len(subword_to_word)], subword_to_word)
+        self.encoded_sentences += len(unique)
+        if cache is not None:
+            new_sources = {cacheable[words]: value for words, value in encoded.items() if words in cacheable}
+            try:
+                cache.put_many(new_sources, self.embedding_model)
+            except Exception as e:
+                self.logger.warning(f"Could not store source embeddings: {e}")
+        embedded.update(encoded)
+        return embedded
+
+    def _mwmf_alignments(self, source: Tuple[Any, List[int]], target: Tuple[Any, List[int]]) -> List[Tuple[int, int]]:
+        """Word pairs SentenceAligner.get_word_aligns would return under 'mwmf', from precomputed embeddings"""
+        source_vectors, source_words = source
+        target_vectors, target_words = target
+        similarity = self.aligner.get_similarity(source_vectors, target_vectors)
+        similarity = self.aligner.apply_distortion(similarity, getattr(self.aligner, "distortion", 0.0))
+        matches = self.aligner.get_max_weight_match(similarity)
+        return sorted({(source_words[i], target_words[j]) for i, j in zip(*matches.nonzero())})
+
     def _tokenize_text(self, text: str, language: str) -> List[str]:
         """Tokenize text considering language-specific characteristics"""
         
@@ -197,13 +398,15 @@ class AdvancedWordAligner:
         
         source_tokens = self._tokenize_text(source_text, source_language)
         target_tokens = self._tokenize_text(target_text, "target")
+        # Built once per target sentence and shared by every source word
+        target_index = TargetIndex(target_tokens)
         
         # Simple position-based alignment with improvements
         alignments = []
         
         for i, source_word in enumerate(source_tokens):
             # Try to find semantic matches first
-            target_matches = self._find_semantic_matches(source_word, target_tokens, source_language)
+            target_matches = self._find_semantic_matches(source_word, target_index, source_language)
             
             if target_matches:
                 target_words = [target_tokens[idx] for idx in target_matches]
@@ -230,51 +433,17 @@ class AdvancedWordAligner:
             "confidence": self._calculate_average_confidence(alignments)
         }
 
-    def _find_semantic_matches(self, source_word: str, target_tokens: List[str], source_language: str) -> List[int]:
-        """Find potential semantic matches using heuristics"""
-        
-        matches = []
-        source_lower = source_word.lower()
-        
-        # Common Latin-to-Spanish/English patterns
-        if source_language == "latin":
-            latin_patterns = {
-                'deus': ['dios', 'god', 'divine'],
-                'terra': ['tierra', 'earth', 'ground'],
-                'caelum': ['cielo', 'heaven', 'sky'],
-                'aqua': ['agua', 'water'],
-                'ignis': ['fuego', 'fire'],
-                'homo': ['hombre', 'man', 'human'],
-                'femina': ['mujer', 'woman'],
-                'rex': ['rey', 'king'],
-                'regina': ['reina', 'queen']
-            }
-            
-            # Check for direct matches
-            for target_idx, target_word in enumerate(target_tokens):
-                target_lower = target_word.lower()
-                
-                # Direct semantic mapping
-                if source_lower in latin_patterns:
-                    if any(pattern in target_lower for pattern in latin_patterns[source_lower]):
-                        matches.append(target_idx)
-                
-                # Cognate detection (similar spelling)
-                if self._is_likely_cognate(source_lower, target_lower):
-                    matches.append(target_idx)
+    def _find_semantic_matches(self, source_word: str, target_index: TargetIndex, source_language: str) -> List[int]:
+        """Find potential semantic matches: lexicon glosses of the word, then spelling cognates"""
         
-        return matches
-
-    def _is_likely_cognate(self, word1: str, word2: str) -> bool:
-        """Simple cognate detection based on string similarity"""
-        if len(word1) < 3 or len(word2) < 3:
-            return False
-        
-        # Calculate simple edit distance ratio
-        from difflib import SequenceMatcher
-        similarity = SequenceMatcher(None, word1, word2).ratio()
+        # Lexicon and cognates are Latin-specific
+        if source_language != "latin":
+            return []
         
-        return similarity > 0.6  # 60% similarity threshold
+        matches = target_index.gloss_matches(get_alignment_lexicon().glosses(source_word))
+        # Spelled as written: normalize_latin's v -> u / j -> i folding is for lexicon keys only
+        matches |= target_index.cognates(source_word.lower())
+        return sorted(matches)
 
     def format_alignment_response(self, alignments_data: Dict[str, Any]) -> Dict[str, Any]:
         """Format alignment data for API response"""
@@ -344,9 +513,25 @@ class AdvancedWordAligner:
             )
         }
 
-# Global instance
-word_aligner = AdvancedWordAligner()
+# Global instance; the model is loaded by start_word_aligner_loading() or the first blocking get
+word_aligner = AdvancedWordAligner(load_model=False)
+
+def start_word_aligner_loading() -> AdvancedWordAligner:
+    """Start loading the global aligner's model in the background (called at API startup)"""
+    word_aligner.start_loading()
+    return word_aligner
 
-def get_word_aligner() -> AdvancedWordAligner:
-    """Get the global word aligner instance"""
+def get_word_aligner(wait: bool = True) -> AdvancedWordAligner:
+    """
+    Get the global word aligner instance
+    
+    Args:
+        wait: Block until the model is loaded (scripts, tests). Request handlers pass False and
+            get the fallback aligner's results until the background load has finished; the load
+            is started here too, in case the startup hook did not run.
+    """
+    if wait:
+        word_aligner.wait_until_loaded()
+    else:
+        word_aligner.start_loading()
     return word_aligner 
\ No newline at end of file
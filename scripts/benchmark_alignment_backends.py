@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the word alignment inference backends
+Aligns a fixed set of Vulgate verses with English translations using each backend (torch,
+torch_int8, onnx, onnx_int8). It reports latency and agreement with the full-precision torch
+alignments:
+    link precision/recall/F1 over (source word, target word) links
+    the share of pairs whose alignments are identical
+
+The source embedding cache is disabled so every backend runs its encoder.
+
+Usage: python scripts/benchmark_alignment_backends.py [--backends torch onnx_int8] [--repeat N]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.core.config import settings  # noqa: E402
+from backend.app.services.alignment_backends import BACKENDS  # noqa: E402
+from backend.app.services.word_alignment import SIMALIGN_AVAILABLE, AdvancedWordAligner  # noqa: E402
+
+# Genesis 1:1-5 and John 1:1-5, each with a literal and a dynamic English translation
+PAIRS = [
+    ("In principio creavit Deus caelum et terram.",
+     "In beginning created God heaven and earth"),
+    ("In principio creavit Deus caelum et terram.",
+     "In the beginning God created the heavens and the earth"),
+    ("Terra autem erat inanis et vacua, et tenebrae erant super faciem abyssi: et spiritus Dei ferebatur super aquas.",
+     "Earth however was empty and void, and darkness were over face of abyss: and spirit of God was borne over waters"),
+    ("Terra autem erat inanis et vacua, et tenebrae erant super faciem abyssi: et spiritus Dei ferebatur super aquas.",
+     "Now the earth was formless and empty, darkness was over the surface of the deep, and the Spirit of God was hovering over the waters"),
+    ("Dixitque Deus: Fiat lux. Et facta est lux.",
+     "Said and God: Let be light. And made is light"),
+    ("Dixitque Deus: Fiat lux. Et facta est lux.",
+     "And God said, Let there be light, and there was light"),
+    ("Et vidit Deus lucem quod esset bona: et divisit lucem a tenebris.",
+     "And saw God light that it was good: and divided light from darkness"),
+    ("Et vidit Deus lucem quod esset bona: et divisit lucem a tenebris.",
+     "God saw that the light was good, and he separated the light from the darkness"),
+    ("Appellavitque lucem Diem, et tenebras Noctem: factumque est vespere et mane, dies unus.",
+     "Called and light Day, and darkness Night: made and is evening and morning, day one"),
+    ("Appellavitque lucem Diem, et tenebras Noctem: factumque est vespere et mane, dies unus.",
+     "God called the light day, and the darkness he called night. And there was evening, and there was morning, the first day"),
+    ("In principio erat Verbum, et Verbum erat apud Deum, et Deus erat Verbum.",
+     "In beginning was the Word, and the Word was with God, and God was the Word"),
+    ("In principio erat Verbum, et Verbum erat apud Deum, et Deus erat Verbum.",
+     "In the beginning was the Word, and the Word was with God, and the Word was God"),
+    ("Hoc erat in principio apud Deum.",
+     "This was in beginning with God"),
+    ("Hoc erat in principio apud Deum.",
+     "He was with God in the beginning"),
+    ("Omnia per ipsum facta sunt: et sine ipso factum est nihil, quod factum est.",
+     "All through him made are: and without him made is nothing, which made is"),
+    ("Omnia per ipsum facta sunt: et sine ipso factum est nihil, quod factum est.",
+     "Through him all things were made; without him nothing was made that has been made"),
+    ("In ipso vita erat, et vita erat lux hominum:",
+     "In him life was, and life was light of men"),
+    ("In ipso vita erat, et vita erat lux hominum:",
+     "In him was life, and that life was the light of all people"),
+    ("Et lux in tenebris lucet, et tenebrae eam non comprehenderunt.",
+     "And light in darkness shines, and darkness it not grasped"),
+    ("Et lux in tenebris lucet, et tenebrae eam non comprehenderunt.",
+     "The light shines in the darkness, and the darkness has not overcome it"),
+]
+
+
+def links(result):
+    return {(a.source_index, target) for a in result["alignments"] for target in a.target_indices}
+
+
+def agreement(reference, results):
+    """Micro-averaged link precision, recall and F1 against the reference, and the identical share"""
+    matched = predicted = expected = identical = 0
+    for ref, res in zip(reference, results):
+        ref_links, res_links = links(ref), links(res)
+        matched += len(ref_links & res_links)
+        predicted += len(res_links)
+        expected += len(ref_links)
+        identical += ref_links == res_links
+    precision = matched / predicted if predicted else 0.0
+    recall = matched / expected if expected else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1, identical / len(reference)
+
+
+def run_backend(backend, repeat, batch_size):
+    start = time.perf_counter()
+    aligner = AdvancedWordAligner(backend=backend)
+    load_seconds = time.perf_counter() - start
+    if not aligner.is_ready or aligner.backend != backend:
+        return None
+
+    aligner.align_words(*PAIRS[0], "latin")  # warm-up (first-call allocations, ONNX graph setup)
+    latencies = []
+    for _ in range(repeat):
+        for source, target in PAIRS:
+            start = time.perf_counter()
+            aligner.align_words(source, target, "latin")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = aligner.align_pairs(PAIRS, "latin", batch_size=batch_size)
+    bulk_seconds = (time.perf_counter() - start) / repeat
+
+    latencies.sort()
+    return {
+        "load_seconds": load_seconds,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "pairs_per_sec": len(PAIRS) / bulk_seconds,
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare word alignment accuracy and latency per inference backend")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS,
+                        help="Backends to measure (torch is always run as the reference)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the pairs")
+    parser.add_argument("--batch-size", type=int, default=8, help="Sentences per forward pass in align_pairs")
+    args = parser.parse_args()
+
+    if not SIMALIGN_AVAILABLE:
+        print("❌ SimAlign not available - install simalign, torch and transformers")
+        return 1
+    settings.ALIGNMENT_EMBEDDING_CACHE_MB = 0  # measure the encoder, not the cache
+
+    backends = ["torch"] + [backend for backend in args.backends if backend != "torch"]
+    measured = {}
+    for backend in backends:
+        print(f"Running {backend}...")
+        measured[backend] = run_backend(backend, args.repeat, args.batch_size)
+        if measured[backend] is None:
+            print(f"  ⚠️  {backend} could not be loaded (see the log), skipped")
+    reference = measured["torch"]
+    if reference is None:
+        print("❌ The torch reference backend could not be loaded")
+        return 1
+
+    print(f"\n{len(PAIRS)} Vulgate verse/translation pairs, {args.repeat} passes, agreement vs torch")
+    print(f"{'backend':12s} {'load s':>7s} {'p50 ms':>8s} {'p95 ms':>8s} {'pairs/s':>8s} {'speedup':>8s}"
+          f" {'prec':>6s} {'recall':>6s} {'F1':>6s} {'same':>6s}")
+    for backend, result in measured.items():
+        if result is None:
+            continue
+        precision, recall, f1, identical = agreement(reference["results"], result["results"])
+        print(f"{backend:12s} {result['load_seconds']:7.1f} {result['p50_ms']:8.1f} {result['p95_ms']:8.1f}"
+              f" {result['pairs_per_sec']:8.1f} {reference['p50_ms'] / result['p50_ms']:7.2f}x"
+              f" {precision:6.3f} {recall:6.3f} {f1:6.3f} {identical:6.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the fallback word aligner
+Compares the original fallback with the indexed one (per-target trigram index, bounded indel distance
+and the compiled lexicon). The original scanned every target token per source word with
+difflib.SequenceMatcher and rebuilt its pattern dict per call. Both run on the fixed Vulgate pairs of
+benchmark_alignment_backends.py. The script reports pairs/sec, how many source words each matches by
+meaning instead of by position, and how often the two cognate tests agree.
+
+Usage: python scripts/benchmark_fallback_alignment.py [--repeat N] [--lexicon PATH]
+"""
+
+import argparse
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+# Add the project root (and this directory, for the shared sample pairs) to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "scripts"))
+
+from backend.app.core.config import settings  # noqa: E402
+from backend.app.services.fallback_aligner import get_alignment_lexicon, is_likely_cognate  # noqa: E402
+from backend.app.services.word_alignment import AdvancedWordAligner  # noqa: E402
+from benchmark_alignment_backends import PAIRS  # noqa: E402
+
+
+def reference_is_likely_cognate(word1, word2):
+    if len(word1) < 3 or len(word2) < 3:
+        return False
+    return SequenceMatcher(None, word1, word2).ratio() > 0.6
+
+
+def reference_fallback(aligner, source_text, target_text):
+    """_fallback_alignment and _find_semantic_matches as they were before the indexed matcher"""
+    source_tokens = aligner._tokenize_text(source_text, "latin")
+    target_tokens = aligner._tokenize_text(target_text, "target")
+    alignments = []
+    for i, source_word in enumerate(source_tokens):
+        source_lower = source_word.lower()
+        latin_patterns = {
+            'deus': ['dios', 'god', 'divine'], 'terra': ['tierra', 'earth', 'ground'],
+            'caelum': ['cielo', 'heaven', 'sky'], 'aqua': ['agua', 'water'], 'ignis': ['fuego', 'fire'],
+            'homo': ['hombre', 'man', 'human'], 'femina': ['mujer', 'woman'], 'rex': ['rey', 'king'],
+            'regina': ['reina', 'queen']
+        }
+        matches = []
+        for target_idx, target_word in enumerate(target_tokens):
+            target_lower = target_word.lower()
+            if source_lower in latin_patterns:
+                if any(pattern in target_lower for pattern in latin_patterns[source_lower]):
+                    matches.append(target_idx)
+            if reference_is_likely_cognate(source_lower, target_lower):
+                matches.append(target_idx)
+        if matches:
+            alignments.append((i, matches, 0.7))
+        else:
+            ratio = len(target_tokens) / len(source_tokens) if source_tokens else 1
+            target_idx = min(int(i * ratio), len(target_tokens) - 1)
+            alignments.append((i, [target_idx] if target_idx >= 0 else [], 0.3))
+    return alignments
+
+
+def semantic_words(alignments):
+    return sum(1 for _, _, confidence in alignments if confidence == 0.7)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the original and the indexed fallback aligner")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed passes over the pairs")
+    parser.add_argument("--lexicon", help="Lexicon file (default: ALIGNMENT_LEXICON_PATH)")
+    args = parser.parse_args()
+
+    if args.lexicon:
+        settings.ALIGNMENT_LEXICON_PATH = args.lexicon
+    lexicon = get_alignment_lexicon()
+    aligner = AdvancedWordAligner(load_model=False)
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        reference = [reference_fallback(aligner, source, target) for source, target in PAIRS]
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        indexed = [aligner._fallback_alignment(source, target, "latin") for source, target in PAIRS]
+    indexed_time = time.perf_counter() - start
+    indexed = [[(a.source_index, a.target_indices, a.confidence) for a in result["alignments"]] for result in indexed]
+
+    compared = agreeing = 0
+    for source, target in PAIRS:
+        for source_word in aligner._tokenize_text(source, "latin"):
+            for target_word in aligner._tokenize_text(target, "target"):
+                compared += 1
+                agreeing += (reference_is_likely_cognate(source_word.lower(), target_word.lower())
+                             == is_likely_cognate(source_word.lower(), target_word.lower()))
+
+    pairs = len(PAIRS) * args.repeat
+    source_words = sum(len(result) for result in reference)
+    print(f"{len(PAIRS)} Vulgate pairs x {args.repeat}, lexicon with {len(lexicon)} forms")
+    print(f"  original  {pairs / reference_time:10,.0f} pairs/sec  "
+          f"{sum(map(semantic_words, reference))}/{source_words} words matched by meaning")
+    print(f"  indexed   {pairs / indexed_time:10,.0f} pairs/sec  "
+          f"{sum(map(semantic_words, indexed))}/{source_words} words matched by meaning  "
+          f"({reference_time / indexed_time:.1f}x)")
+    print(f"  cognate tests agree on {agreeing}/{compared} word pairs ({agreeing / compared:.1%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the macron alignment in Token.macronize
+Compares the original list-of-lists edit distance with macronizer.alignaccents
+on synthetic (plain, accented) pairs built from the macronizer vocabulary, checks
+that both give identical output, and reports tokens per second.
+
+Usage: python scripts/benchmark_macronize_alignment.py [number of tokens]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+macronizer_dir = project_root / 'backend' / 'app' / 'services' / 'latin-macronizer'
+sys.path.insert(0, str(macronizer_dir))
+
+from macronizer import alignaccents, toascii  # noqa: E402
+
+
+def reference_alignment(plain, accented, domacronize, performutov, performitoj):
+    """The alignment as it was implemented in Token.macronize before alignaccents"""
+    def inscost(a):
+        if a == '_':
+            return 0
+        return 2
+
+    def subcost(p, a):
+        if a == '_':
+            return 100
+        if (a in "IJij" and p in "IJij") or (a in "UVuv" and p in "UVuv"):
+            return 1
+        return 2
+
+    def delcost(_):
+        return 2
+
+    n = len(plain) + 1
+    m = len(accented) + 1
+    distance = [[0 for i in range(m)] for j in range(n)]
+    for i in range(1, n):
+        distance[i][0] = distance[i-1][0] + delcost(plain[i-1])
+    for j in range(1, m):
+        distance[0][j] = distance[0][j-1] + inscost(accented[j-1])
+    for i in range(1, n):
+        for j in range(1, m):
+            if toascii(plain[i-1].lower()) == toascii(accented[j-1].lower()):
+                distance[i][j] = distance[i-1][j-1]
+            else:
+                rghtcost = distance[i-1][j] + delcost(plain[i-1])
+                diagcost = distance[i-1][j-1] + subcost(plain[i-1], accented[j-1])
+                downcost = distance[i][j-1] + inscost(accented[j-1])
+                distance[i][j] = min(rghtcost, diagcost, downcost)
+    result = ""
+    while i != 0 and j != 0:
+        upcost = distance[i][j-1] if j > 0 else 1000
+        diagcost = distance[i-1][j-1] if j > 0 and i > 0 else 1000
+        leftcost = distance[i-1][j] if i > 0 else 1000
+        if diagcost <= upcost and diagcost < leftcost:
+            i -= 1
+            j -= 1
+            if performutov and accented[j].lower() == 'v' and plain[i] == 'u':
+                result = 'v' + result
+            elif performutov and accented[j].lower() == 'v' and plain[i] == 'U':
+                result = 'V' + result
+            elif performitoj and accented[j].lower() == 'j' and plain[i] == 'i':
+                result = 'j' + result
+            elif performitoj and accented[j].lower() == 'j' and plain[i] == 'I':
+                result = 'J' + result
+            else:
+                result = plain[i] + result
+        elif upcost <= diagcost and upcost <= leftcost:
+            j -= 1
+            if domacronize and accented[j] == '_':
+                result = "_" + result
+        else:
+            i -= 1
+            result = plain[i] + result
+    return result.replace("__", "_")
+
+
+def make_pairs(count, seed=1):
+    """Synthetic tokens: vocabulary words with random macrons, u/v and i/j, and ae ligatures"""
+    rng = random.Random(seed)
+    with open(macronizer_dir / 'vocabulary.txt', encoding='utf-8') as vocabulary:
+        words = [line.strip() for line in vocabulary if len(line.strip()) > 2]
+    # Running text repeats words, so draw from a Zipf-like distribution over a limited vocabulary
+    words = rng.sample(words, 5000)
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    pairs = []
+    for word in rng.choices(words, weights, k=count):
+        accented = "".join(c + "_" if c in "aeiouy" and rng.random() < 0.3 else c for c in word)
+        accented = accented.replace("u", "v", 1) if rng.random() < 0.2 else accented
+        accented = accented.replace("i", "j", 1) if rng.random() < 0.2 else accented
+        plain = word.replace("ae", "æ", 1) if rng.random() < 0.1 else word
+        pairs.append((plain, accented))
+    return pairs
+
+
+def run(function, pairs):
+    start = time.perf_counter()
+    results = [function(plain, accented, True, True, True) for plain, accented in pairs]
+    return results, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    pairs = make_pairs(count)
+    print(f"Aligning {count} synthetic tokens ({len(set(pairs))} distinct)")
+
+    reference, reference_time = run(reference_alignment, pairs)
+    uncached, uncached_time = run(alignaccents.__wrapped__, pairs)
+    alignaccents.cache_clear()
+    cached, cached_time = run(alignaccents, pairs)
+
+    if not reference == uncached == cached:
+        mismatches = [pair for pair, a, b in zip(pairs, reference, uncached) if a != b]
+        print(f"❌ Output differs for {len(mismatches)} tokens, e.g. {mismatches[:5]}")
+        return 1
+    print("✅ Identical output")
+    for label, seconds in [("original", reference_time), ("flat array", uncached_time), ("flat array + cache", cached_time)]:
+        print(f"  {label:20s} {count / seconds:12,.0f} tokens/sec  ({reference_time / seconds:5.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the meter scanner in Tokenization.scanverses
+Scans dactylic hexameters with the original recursive scanverse and with the
+dynamic-programming macronizer.scanverse, checks that both choose the same
+accented forms and feet, and reports verses per second.
+
+Every word is treated as unknown to Morpheus, so all its vowels are ambiguous.
+That is the worst case for the scanner, and it needs neither RFTagger nor the
+Morpheus database.
+
+Usage: python scripts/benchmark_scanverses.py [number of repetitions]
+"""
+
+import copy
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'backend' / 'app' / 'services' / 'latin-macronizer'))
+
+import macronizer  # noqa: E402
+
+# Vergil, Aeneid 1.1-11
+HEXAMETERS = """Arma virumque cano Troiae qui primus ab oris
+Italiam fato profugus Laviniaque venit
+litora multum ille et terris iactatus et alto
+vi superum saevae memorem Iunonis ob iram
+multa quoque et bello passus dum conderet urbem
+inferretque deos Latio genus unde Latinum
+Albanique patres atque altae moenia Romae
+Musa mihi causas memora quo numine laeso
+quidve dolens regina deum tot volvere casus
+insignem pietate virum tot adire labores
+impulerit tantaene animis caelestibus irae"""
+
+# A run of words that can each be elided or kept in hiatus multiplies the number of
+# partial scansions with every word; this is where the recursive scanner blows up.
+ELISIONS = "arma " + " ".join(["o"] * 12) + " arma virumque cano Troiae qui primus ab oris"
+
+
+def reference_scanverse(verse, automaton):
+    """The scanner as it was implemented in Tokenization.scanverses before macronizer.scanverse"""
+    def scanverserecurse(verse, wordindex, automaton, oldnodeindex):
+        if wordindex == len(verse):
+            return [], [], 0
+        (tokenindex, wordscansions) = verse[wordindex]
+        besttail = []
+        besttailfeet = []
+        besttailpenalty = 100
+        for (scanpenalty, scansion, accented) in wordscansions:
+            nodeindex = oldnodeindex
+            feet = []
+            finished = False
+            meterpenalty = 0
+            for syllable in scansion:
+                (nodeindex, foot, meterpenaltypart) = automaton.get((nodeindex, syllable), (-1, "", 0))
+                meterpenalty += meterpenaltypart
+                if nodeindex == 0:
+                    finished = True
+                feet.append(foot)
+            if nodeindex == -1 or finished and (nodeindex != 0 or wordindex != len(verse)-1):
+                continue
+            tail, tailfeet, tailpenalty = scanverserecurse(verse, wordindex+1, automaton, nodeindex)
+            if scanpenalty + meterpenalty + tailpenalty < besttailpenalty:
+                besttail = [(tokenindex, accented)] + tail
+                besttailfeet = feet + tailfeet
+                besttailpenalty = scanpenalty + meterpenalty + tailpenalty
+        return besttail, besttailfeet, besttailpenalty
+    indexaccentedpairs, feet, penalty = scanverserecurse(verse, 0, automaton, 0)
+    return indexaccentedpairs, "".join(feet)
+
+
+def make_tokenization(text):
+    tokenization = macronizer.Tokenization(text)
+    for token in tokenization.tokens:
+        if token.isword:
+            token.accented = [token.text.lower()]
+            token.isunknown = True
+    return tokenization
+
+
+def run(scanverse, tokenization):
+    """Scan a copy of the tokenization with the given scanverse; returns (feet, accented forms, seconds)"""
+    tokenization = copy.deepcopy(tokenization)
+    saved = macronizer.scanverse
+    macronizer.scanverse = scanverse
+    try:
+        start = time.perf_counter()
+        tokenization.scanverses([macronizer.Macronizer.dactylichexameter])
+        seconds = time.perf_counter() - start
+    finally:
+        macronizer.scanverse = saved
+    return tokenization.scannedfeet, [token.accented for token in tokenization.tokens], seconds
+
+
+def compare(label, text):
+    verses = text.count("\n") + 1
+    tokenization = make_tokenization(text)
+    print(f"{label}: scanning {verses} hexameters with all vowels ambiguous")
+
+    reference_feet, reference_accented, reference_time = run(reference_scanverse, tokenization)
+    feet, accented, dp_time = run(macronizer.scanverse, tokenization)
+
+    if feet != reference_feet or accented != reference_accented:
+        print("❌ Scansions differ")
+        for number, (old, new) in enumerate(zip(reference_feet, feet), 1):
+            if old != new:
+                print(f"  verse {number}: {old!r} != {new!r}")
+        return False
+    print("✅ Identical output")
+    print(f"  {'recursive':12s} {verses / reference_time:10,.1f} verses/sec")
+    print(f"  {'dynamic':12s} {verses / dp_time:10,.1f} verses/sec  ({reference_time / dp_time:.1f}x)")
+    return True
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    ok = compare("Aeneid 1.1-11", "\n".join([HEXAMETERS] * repetitions))
+    ok = compare("Run of elisions", ELISIONS) and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark batched word alignment
+Aligns the literal and dynamic translations of a set of verses three ways - align_words per
+translation (two forward passes per verse), align_many per verse (one pass) and align_pairs
+over the whole set (a chapter per few passes) - checks that they agree and reports verses/sec.
+
+Usage: python scripts/benchmark_word_alignment.py [number of verses] [--batch-size N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services.word_alignment import ALIGN_BATCH_SIZE, get_word_aligner  # noqa: E402
+
+# Genesis 1:1-5 with literal and dynamic English translations
+SAMPLE_VERSES = [
+    ("In principio creavit Deus caelum et terram.",
+     "In beginning created God heaven and earth",
+     "In the beginning God created the heavens and the earth"),
+    ("Terra autem erat inanis et vacua, et tenebrae erant super faciem abyssi: et spiritus Dei ferebatur super aquas.",
+     "Earth however was empty and void, and darkness were over face of abyss: and spirit of God was borne over waters",
+     "Now the earth was formless and empty, darkness was over the surface of the deep, and the Spirit of God was hovering over the waters"),
+    ("Dixitque Deus: Fiat lux. Et facta est lux.",
+     "Said and God: Let be light. And made is light",
+     "And God said, Let there be light, and there was light"),
+    ("Et vidit Deus lucem quod esset bona: et divisit lucem a tenebris.",
+     "And saw God light that it was good: and divided light from darkness",
+     "God saw that the light was good, and he separated the light from the darkness"),
+    ("Appellavitque lucem Diem, et tenebras Noctem: factumque est vespere et mane, dies unus.",
+     "Called and light Day, and darkness Night: made and is evening and morning, day one",
+     "God called the light day, and the darkness he called night. And there was evening, and there was morning, the first day"),
+]
+
+
+def alignment_pairs(results):
+    return [[(a.source_index, tuple(a.target_indices)) for a in result["alignments"]] for result in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-call, per-verse and bulk word alignment")
+    parser.add_argument("verses", nargs="?", type=int, default=30, help="Verses to align (the sample repeats)")
+    parser.add_argument("--batch-size", type=int, default=ALIGN_BATCH_SIZE, help="Sentences per forward pass in bulk mode")
+    args = parser.parse_args()
+
+    verses = [SAMPLE_VERSES[index % len(SAMPLE_VERSES)] for index in range(args.verses)]
+    aligner = get_word_aligner()
+    if not aligner.is_ready:
+        print("⚠️  SimAlign is not available: this measures the fallback aligner only")
+
+    start = time.perf_counter()
+    per_call = []
+    for source, literal, dynamic in verses:
+        per_call.append(aligner.align_words(source, literal, "latin"))
+        per_call.append(aligner.align_words(source, dynamic, "latin"))
+    per_call_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    per_verse = []
+    for source, literal, dynamic in verses:
+        per_verse.extend(aligner.align_many(source, [literal, dynamic], "latin"))
+    per_verse_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pairs = [(source, target) for source, literal, dynamic in verses for target in (literal, dynamic)]
+    bulk = aligner.align_pairs(pairs, "latin", batch_size=args.batch_size)
+    bulk_time = time.perf_counter() - start
+
+    reference = alignment_pairs(per_call)
+    for label, results in (("align_many", per_verse), ("align_pairs", bulk)):
+        differing = sum(a != b for a, b in zip(reference, alignment_pairs(results)))
+        status = "✅ identical" if not differing else f"⚠️  {differing} of {len(reference)} alignments differ"
+        print(f"{label}: {status}")
+
+    print(f"Aligned {len(verses)} verses (literal + dynamic), method {per_call[0]['method']}")
+    for label, seconds in (("align_words x2", per_call_time), ("align_many", per_verse_time),
+                           (f"align_pairs ({args.batch_size}/pass)", bulk_time)):
+        print(f"  {label:28s} {len(verses) / seconds:10,.1f} verses/sec  ({per_call_time / seconds:5.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
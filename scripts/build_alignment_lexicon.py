@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Build the fallback aligner's lexicon
+Compiles Latin -> English/French glosses from the XDXF dictionaries in source/dictionaries into
+alignment_lexicon.json (ALIGNMENT_LEXICON_PATH), the lookup structure the fallback word aligner
+loads at startup. It has two tables:
+
+    forms   inflected Latin word -> glosses, for every wordform in the macronizer's lemma tables
+            (backend/app/services/latin-macronizer/lemmas.py) whose lemma has glosses
+    stems   Latin stem -> glosses, for forms that are not in the lemma tables
+
+Most of these dictionaries are Latin synonym dictionaries, so glosses come from:
+    Shumway1898     English headword -> Latin synonyms
+    Doederlein1874  "<b>suspirare</b>, to sigh", "<b>tellus</b> denotes the earth"
+    Wagner1878      "Fr.: Amener; pousser" (French)
+Synonym groups then lend their glosses to members that have none.
+
+Usage: python scripts/build_alignment_lexicon.py [--dictionaries DIR] [--output PATH]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.core.config import settings  # noqa: E402
+from backend.app.services.fallback_aligner import LATIN_PATTERNS, latin_stem, normalize_latin  # noqa: E402
+from parse_dictionaries import XDXFParser  # noqa: E402
+
+MACRONIZER_DIR = project_root / "backend" / "app" / "services" / "latin-macronizer"
+
+MAX_GLOSSES = 8
+# Synonym groups larger than this are themes rather than synonyms: they lend no glosses
+MAX_SYNONYM_GROUP = 3
+# Shorter Latin words (in, et, ad...) are function words: glossing them only adds noise
+MIN_LATIN_LENGTH = 3
+# Dictionary headwords of verbs are often infinitives, the lemma tables use the first person
+LEMMA_VARIANTS = [("o", ["are", "ere", "ire", "ari", "eri", "iri", "i"]), ("or", ["ari", "eri", "iri", "i"])]
+
+STOPWORDS = {
+    # English
+    "the", "and", "for", "with", "from", "that", "this", "which", "who", "whom", "what", "any", "one",
+    "its", "his", "her", "their", "our", "are", "was", "were", "been", "being", "has", "have", "had",
+    "not", "but", "also", "only", "properly", "generally", "especially", "thing", "things", "something",
+    "anything", "person", "persons", "man's", "opp", "etc", "like", "same", "other", "more", "most",
+    "very", "such", "both", "than", "into", "upon", "out", "all", "used", "means", "denotes", "subst",
+    # French
+    "les", "des", "une", "est", "être", "etre", "avoir", "dans", "par", "pour", "sur", "avec", "qui",
+    "que", "quelqu", "quelque", "chose", "faire", "son", "ses", "aux", "pas", "plus", "vers", "action", "non",
+}
+
+# "<b>suspirare</b>, to sigh," / "<b>tellus</b> denotes the earth as ...": only a word that ends the
+# phrase counts, so "denotes a greater degree of darkness" does not make "greater" a gloss
+DOEDERLEIN_PATTERNS = [
+    re.compile(r"<b>([^<]+)</b>,\s*to\s+([a-z]+)(?=[,;.:)]|\s+(?:as|in|or)\b)"),
+    re.compile(r"<b>([^<]+)</b>,?\s+(?:means?|denotes?|signif(?:y|ies)|expresses?),?\s+"
+               r"(?:(?:to|in|the|a|an|properly|only|merely|originally)\s+)*([a-z]+)(?=[,;.:)]|\s+(?:as|in|or)\b)"),
+]
+
+
+def gloss_words(text):
+    """Lowercased content words of a gloss phrase"""
+    words = re.findall(r"[^\W\d_]+", text.lower())
+    return [word for word in words if len(word) >= 3 and word not in STOPWORDS]
+
+
+def read_articles(path):
+    """[(headwords, raw article), ...] of one XDXF file"""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        content = f.read()
+    articles = []
+    for article in re.findall(r"<ar>(.*?)</ar>", content, re.DOTALL):
+        keys = [re.sub(r"<opt>.*?</opt>", "", key) for key in re.findall(r"<k[^>]*>(.*?)</k>", article, re.DOTALL)]
+        keys = [XDXFParser().clean_text(key).lower() for key in keys]
+        articles.append(([key for key in keys if key], article))
+    return articles
+
+
+def collect_glosses(dictionaries_dir):
+    """Latin headword -> ordered glosses, and the synonym groups (lists of Latin headwords)"""
+    glosses = defaultdict(list)
+    groups = []
+
+    def add(latin, words):
+        latin = normalize_latin(latin.strip())
+        if len(latin) >= MIN_LATIN_LENGTH and " " not in latin:
+            glosses[latin].extend(words)
+
+    for word, words in LATIN_PATTERNS.items():
+        add(word, words)
+
+    for path in sorted(glob.glob(os.path.join(dictionaries_dir, "*/dict.xdxf"))):
+        name = os.path.basename(os.path.dirname(path))
+        articles = read_articles(path)
+        for keys, article in articles:
+            if name == "Shumway1898":
+                heading = re.search(r"<b>(.*?)</b>\s*:", article)
+                latin = re.findall(r"<dtrn>(.*?)</dtrn>", article)
+                if heading:
+                    for word in latin:
+                        add(word, gloss_words(heading.group(1)))
+                if len(latin) > 1:
+                    groups.append(latin)
+                continue
+            if name == "Wagner1878":
+                french = re.search(r"<b>Fr\.:</b>\s*<c[^>]*>(.*?)</c>", article, re.DOTALL)
+                if french and keys:
+                    add(keys[0], gloss_words(XDXFParser().clean_text(french.group(1))))
+                continue
+            if name == "Doederlein1874":
+                for pattern in DOEDERLEIN_PATTERNS:
+                    for latin, gloss in pattern.findall(article):
+                        add(latin, gloss_words(gloss))
+            if len(keys) > 1:
+                groups.append(keys)
+        print(f"  {name}: {len(articles)} articles")
+
+    return glosses, groups
+
+
+def lemma_glosses(forms, lemma):
+    """Glosses of a lemma-table lemma, also trying the infinitive the dictionaries list verbs under"""
+    if lemma in forms:
+        return forms[lemma]
+    for ending, replacements in LEMMA_VARIANTS:
+        if lemma.endswith(ending):
+            for replacement in replacements:
+                variant = lemma[:-len(ending)] + replacement
+                if variant in forms:
+                    return forms[variant]
+    return []
+
+
+def build_lexicon(dictionaries_dir):
+    glosses, groups = collect_glosses(dictionaries_dir)
+    direct = len(glosses)
+
+    # Synonyms lend their glosses to group members that have none
+    borrowed = defaultdict(list)
+    for group in groups:
+        members = [normalize_latin(word) for word in group if " " not in word.strip()]
+        if len(members) > MAX_SYNONYM_GROUP:
+            continue
+        for member in members:
+            if member not in glosses:
+                for other in members:
+                    borrowed[member].extend(glosses.get(other, [])[:1])
+    for member, words in borrowed.items():
+        if words:
+            glosses[member] = words
+
+    stems = defaultdict(list)
+    for latin, words in glosses.items():
+        stems[latin_stem(latin)].extend(words)
+    stems = {stem: list(dict.fromkeys(words))[:MAX_GLOSSES] for stem, words in stems.items() if words}
+
+    forms = {latin: list(dict.fromkeys(words))[:MAX_GLOSSES] for latin, words in glosses.items() if words}
+    sys.path.insert(0, str(MACRONIZER_DIR))
+    from lemmas import wordform_to_corpus_lemmas
+    for wordform, lemmas in wordform_to_corpus_lemmas.items():
+        words = []
+        for lemma in lemmas:
+            words.extend(lemma_glosses(forms, normalize_latin(lemma.rstrip("0123456789"))))
+        if words:
+            forms.setdefault(normalize_latin(wordform), list(dict.fromkeys(words))[:MAX_GLOSSES])
+
+    stats = {"glossed_headwords": direct, "borrowed_from_synonyms": sum(1 for words in borrowed.values() if words),
+             "forms": len(forms), "stems": len(stems)}
+    return {"forms": forms, "stems": stems}, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the fallback word aligner's lexicon")
+    parser.add_argument("--dictionaries", default=str(project_root / "source" / "dictionaries"),
+                        help="Directory with <name>/dict.xdxf files")
+    parser.add_argument("--output", default=settings.ALIGNMENT_LEXICON_PATH, help="Lexicon file to write")
+    args = parser.parse_args()
+
+    print(f"Reading dictionaries from {args.dictionaries}")
+    start = time.perf_counter()
+    lexicon, stats = build_lexicon(args.dictionaries)
+    if not lexicon["forms"]:
+        print("❌ No glosses found - check the dictionaries directory")
+        return 1
+
+    tmp_path = args.output + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(lexicon, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, args.output)
+    print(f"✅ Wrote {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB) in {time.perf_counter() - start:.1f}s")
+    for key, value in stats.items():
+        print(f"  {key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
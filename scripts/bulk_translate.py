@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bulk-translate verses into the translation cache
+Packs many verses into each OpenAI prompt and writes the results to translation_cache, where
+/dictionary/translate finds them. Interrupted runs resume from the checkpoint file.
+
+Usage:
+    python scripts/bulk_translate.py Gn --language es
+    python scripts/bulk_translate.py Gn --chapter 1 --budget 2000 --no-align
+    python scripts/bulk_translate.py --all --language en --checkpoint bulk_en.json
+
+    # Against a local OpenAI-compatible stub server
+    python scripts/bulk_translate.py Gn --chapter 1 --base-url http://127.0.0.1:8080/v1 --api-key stub
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.core.config import settings  # noqa: E402
+from backend.app.services.bulk_translation import DEFAULT_TOKEN_BUDGET, LANGUAGE_NAMES, BulkTranslator  # noqa: E402
+from backend.app.services.enhanced_dictionary import EnhancedDictionary  # noqa: E402
+from verse_loader import load_verses  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translate a book into the translation cache, many verses per prompt")
+    parser.add_argument("book", nargs="?", help="Book abbreviation or name, e.g. Gn")
+    parser.add_argument("--all", action="store_true", help="Translate every Bible book")
+    parser.add_argument("--chapter", type=int, help="Only this chapter")
+    parser.add_argument("--language", default="en", choices=sorted(LANGUAGE_NAMES), help="Target language")
+    parser.add_argument("--budget", type=int, default=DEFAULT_TOKEN_BUDGET, help="Prompt tokens per batch")
+    parser.add_argument("--model", default=os.getenv("OPENAI_MODEL", "gpt-4"), help="Chat model")
+    parser.add_argument("--base-url", default=settings.OPENAI_BASE_URL, help="OpenAI-compatible API base URL")
+    parser.add_argument("--api-key", default=settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY"), help="API key")
+    parser.add_argument("--cache-db", default=settings.WORD_CACHE_DB, help="Database with translation_cache")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: bulk_translate_<language>.json next to the cache DB)")
+    parser.add_argument("--no-align", action="store_true", help="Do not compute word alignments")
+    args = parser.parse_args()
+
+    if not args.book and not args.all:
+        parser.error("give a book or --all")
+    if not args.api_key:
+        parser.error("no API key: set OPENAI_API_KEY or pass --api-key")
+
+    verses = load_verses(None if args.all else args.book, args.chapter)
+    if not verses:
+        print(f"❌ No verses found for {args.book}")
+        return 1
+
+    from openai import OpenAI
+    client = OpenAI(api_key=args.api_key, base_url=args.base_url)
+    dictionary = EnhancedDictionary(database_path=args.cache_db)
+    aligner = None
+    if not args.no_align:
+        from backend.app.services.word_alignment import get_word_aligner
+        aligner = get_word_aligner()
+
+    checkpoint = args.checkpoint or os.path.join(os.path.dirname(os.path.abspath(args.cache_db)),
+                                                 f"bulk_translate_{args.language}.json")
+    translator = BulkTranslator(client, args.cache_db, target_language=args.language, model=args.model,
+                                token_budget=args.budget, checkpoint_path=checkpoint,
+                                detect_source_language=dictionary.detect_source_language, aligner=aligner)
+
+    print(f"Translating {len(verses)} verses to {LANGUAGE_NAMES[args.language]} (checkpoint: {checkpoint})")
+    stats = translator.run(verses, progress=lambda s: print(
+        f"  batch {s['batches']}: {s['translated']} translated, {s['failed']} failed (up to {s['last_reference']})"))
+    print(f"✅ Done: {stats}")
+    dictionary.close()
+    return 0 if not stats["failed"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
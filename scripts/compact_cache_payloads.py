@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Convert cached payloads to (or back from) the compact codec
+Rewrites the JSON payload columns of verse_analysis_cache and translation_cache as compact
+BLOBs (msgpack + zstd with a dictionary trained on the rows, when those packages are installed),
+and reports disk size and read latency before and after. Readers decode both forms, so this can
+run against a live cache. Set CACHE_COMPACT_PAYLOADS=true so new rows are written compact too.
+
+Usage:
+    python scripts/compact_cache_payloads.py --report-only
+    python scripts/compact_cache_payloads.py --train
+    python scripts/compact_cache_payloads.py --revert
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.core.config import settings  # noqa: E402
+from backend.app.db.payload_codec import DEFAULT_DICTIONARY_SIZE, ZSTD_AVAILABLE, get_payload_codec  # noqa: E402
+
+PAYLOAD_COLUMNS = {
+    "verse_analysis_cache": ("word_analysis_json", "translations_json", "theological_layer_json",
+                             "jungian_layer_json", "cosmological_layer_json", "word_alignments_json"),
+    "translation_cache": ("translation_data",),
+}
+BATCH_ROWS = 500
+
+
+def payload_columns(db):
+    """{table: [columns]} for the payload columns present in this database"""
+    present = {}
+    for table, columns in PAYLOAD_COLUMNS.items():
+        existing = {row[1] for row in db.fetchall(f"PRAGMA table_info({table})")}
+        if existing:
+            present[table] = [column for column in columns if column in existing]
+    return present
+
+
+def measure(codec, tables):
+    """Disk size, payload bytes and full-scan read+decode latency"""
+    db = codec.pool
+    db.fetchone("PRAGMA wal_checkpoint(TRUNCATE)")
+    page_size = db.fetchone("PRAGMA page_size")[0]
+    used_pages = db.fetchone("PRAGMA page_count")[0] - db.fetchone("PRAGMA freelist_count")[0]
+    report = {"file_bytes": os.path.getsize(db.database_path), "used_bytes": used_pages * page_size,
+              "payload_bytes": 0, "payloads": 0, "read_seconds": 0.0}
+    for table, columns in tables.items():
+        if not columns:
+            continue
+        lengths = " + ".join(f"COALESCE(LENGTH({column}), 0)" for column in columns)
+        report["payload_bytes"] += db.fetchone(f"SELECT COALESCE(SUM({lengths}), 0) FROM {table}")[0]
+        start = time.perf_counter()
+        for row in db.fetchall(f"SELECT {', '.join(columns)} FROM {table}"):
+            for value in row:
+                if value is not None:
+                    codec.decode(value)
+                    report["payloads"] += 1
+        report["read_seconds"] += time.perf_counter() - start
+    return report
+
+
+def sample_payloads(codec, tables, limit):
+    samples = []
+    for table, columns in tables.items():
+        for row in codec.pool.fetchall(f"SELECT {', '.join(columns)} FROM {table}"):
+            samples.extend(codec.decode(value) for value in row if value is not None)
+    random.shuffle(samples)
+    return samples[:limit]
+
+
+def convert(codec, tables, compact):
+    """Re-encode every payload; returns the number of values rewritten"""
+    converted = 0
+    for table, columns in tables.items():
+        if not columns:
+            continue
+        rows = codec.pool.fetchall(f"SELECT rowid, {', '.join(columns)} FROM {table}")
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        for start in range(0, len(rows), BATCH_ROWS):
+            updates = []
+            for rowid, *values in rows[start:start + BATCH_ROWS]:
+                encoded = [None if value is None else codec.encode(codec.decode(value), compact=compact)
+                           for value in values]
+                converted += sum(value is not None for value in values)
+                updates.append((*encoded, rowid))
+            codec.pool.executemany(f"UPDATE {table} SET {assignments} WHERE rowid = ?", updates)
+    return converted
+
+
+def print_report(before, after=None):
+    def line(label, key, fmt):
+        values = [fmt(before[key])] + ([fmt(after[key])] if after else [])
+        change = ""
+        if after and before[key]:
+            change = f"{(after[key] - before[key]) / before[key] * 100:+.1f}%"
+        print(f"  {label:<22}" + "".join(f"{value:>16}" for value in values) + f"{change:>10}")
+
+    def per_payload(report):
+        return f"{report['read_seconds'] / report['payloads'] * 1e6 if report['payloads'] else 0.0:>13,.1f} µs"
+
+    print(f"  {'':<22}{'before':>16}" + (f"{'after':>16}{'change':>10}" if after else ""))
+    line("database file", "file_bytes", lambda v: f"{v / 1024:,.1f} KiB")
+    line("pages in use", "used_bytes", lambda v: f"{v / 1024:,.1f} KiB")
+    line("payload bytes", "payload_bytes", lambda v: f"{v / 1024:,.1f} KiB")
+    line("full read + decode", "read_seconds", lambda v: f"{v * 1000:,.1f} ms")
+    print(f"  {'per payload':<22}{per_payload(before)}" + (per_payload(after) if after else "") +
+          f"   ({before['payloads']} payloads)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert cache payloads between JSON text and the compact codec")
+    parser.add_argument("--cache-db", default=settings.WORD_CACHE_DB, help="Cache database")
+    parser.add_argument("--report-only", action="store_true", help="Only print size and read latency")
+    parser.add_argument("--train", action="store_true", help="Train a zstd dictionary on the payloads first")
+    parser.add_argument("--dict-size", type=int, default=DEFAULT_DICTIONARY_SIZE, help="Dictionary size in bytes")
+    parser.add_argument("--samples", type=int, default=5000, help="Payloads to train the dictionary on")
+    parser.add_argument("--revert", action="store_true", help="Rewrite compact payloads back to JSON text")
+    parser.add_argument("--no-vacuum", action="store_true", help="Skip VACUUM after converting")
+    args = parser.parse_args()
+
+    if not Path(args.cache_db).exists():
+        print(f"❌ Cache database not found: {args.cache_db}")
+        return 1
+
+    codec = get_payload_codec(args.cache_db)
+    tables = payload_columns(codec.pool)
+    print(f"Cache database: {args.cache_db}  codec: {codec.stats()}")
+    before = measure(codec, tables)
+    if args.report_only:
+        print_report(before)
+        return 0
+
+    if args.train and not args.revert:
+        if not ZSTD_AVAILABLE:
+            print("⚠️  zstandard is not installed: converting without a dictionary (zlib)")
+        else:
+            samples = sample_payloads(codec, tables, args.samples)
+            try:
+                dict_id = codec.train_dictionary(samples, args.dict_size)
+                print(f"✅ Trained dictionary {dict_id} on {len(samples)} payloads")
+            except Exception as e:
+                print(f"⚠️  Could not train a dictionary ({e}); converting without one")
+
+    start = time.perf_counter()
+    converted = convert(codec, tables, compact=not args.revert)
+    print(f"✅ Rewrote {converted} payloads as {'JSON text' if args.revert else 'compact BLOBs'} "
+          f"in {time.perf_counter() - start:.1f}s")
+    if not args.no_vacuum:
+        codec.pool.close_all()
+        codec.pool.execute("VACUUM")
+    print_report(before, measure(codec, tables))
+    codec.pool.close_all()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -36,6 +36,22 @@ def initialize_macronizer_db():
         print(f"❌ Error initializing macronizer database: {e}")
         return False
 
+def build_lemma_store():
+    """Compile lemmas.py into the memory-mapped lemmas.db"""
+    print("\nCompiling lemma frequency tables...")
+    
+    try:
+        sys.path.insert(0, str(project_root / 'backend' / 'app' / 'services' / 'latin-macronizer'))
+        import lemmastore
+        
+        lemma_count, pair_count = lemmastore.build()
+        print(f"✅ Wrote {lemma_count} lemmas and {pair_count} wordform/lemma pairs to {lemmastore.LEMMA_DB}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error compiling lemma tables: {e}")
+        return False
+
 def test_macronizer():
     """Test that the macronizer works after initialization"""
     print("\nTesting macronizer...")
@@ -77,6 +93,11 @@ def main():
         print("Failed to initialize macronizer database")
         return 1
     
+    # Compile the lemma tables (the macronizer falls back to lemmas.py without them)
+    if not build_lemma_store():
+        print("Failed to compile lemma tables")
+        return 1
+    
     # Test the macronizer
     if not test_macronizer():
         print("Macronizer initialization succeeded but testing failed")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Migrate cached translations and alignments to the normalized verse tables
+Moves the JSON blobs of translation_cache.translation_data and of
+verse_analysis_cache.translations_json / word_alignments_json into verse_translations,
+verse_alignment_sets and verse_alignments, and renames translation_cache keys that still contain
+the source language ('Gn 1:1_latin_en' -> 'Gn 1:1_en', the key the verse tables use). Safe to
+run more than once: rows already migrated are rewritten with the same values.
+
+Usage:
+    python scripts/migrate_verse_cache_tables.py
+    python scripts/migrate_verse_cache_tables.py --cache-db word_cache.db --drop-blobs
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.core.config import settings  # noqa: E402
+from backend.app.db.payload_codec import get_payload_codec  # noqa: E402
+from backend.app.services.enhanced_dictionary import EnhancedDictionary  # noqa: E402
+from backend.app.services.verse_cache_store import get_verse_cache_store  # noqa: E402
+
+
+def table_exists(db, name):
+    return db.fetchone("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)) is not None
+
+
+def migrate_translation_cache(store):
+    """Normalize translation_cache payloads and keys; the row keeps only the remaining fields"""
+    migrated = rekeyed = 0
+    if not table_exists(store.db, "translation_cache"):
+        return migrated, rekeyed
+    codec = get_payload_codec(store.database_path)
+    rows = store.db.fetchall("SELECT cache_key, translation_data FROM translation_cache")
+    with store.db.transaction() as cursor:
+        for cache_key, translation_data in rows:
+            verse_reference, target_language = EnhancedDictionary.split_translation_cache_key(cache_key)
+            key = EnhancedDictionary.translation_cache_key(verse_reference, target_language)
+            if key != cache_key:
+                cursor.execute("UPDATE OR REPLACE translation_cache SET cache_key = ? WHERE cache_key = ?", (key, cache_key))
+                rekeyed += 1
+            try:
+                data = codec.decode(translation_data, {})
+            except (ValueError, RuntimeError):
+                print(f"⚠️  Skipping unreadable translation_cache row {cache_key}")
+                continue
+            if not any(kind in data for kind in ("translation", "literal", "dynamic", "word_alignments")):
+                continue  # already migrated
+            extras = store.save_translation_payload(verse_reference, target_language, data, cursor=cursor)
+            cursor.execute("UPDATE translation_cache SET translation_data = ? WHERE cache_key = ?",
+                           (codec.encode(extras), key))
+            migrated += 1
+    return migrated, rekeyed
+
+
+def migrate_verse_analysis_cache(store, drop_blobs=False):
+    """Normalize the translations and word alignments stored next to verse analyses"""
+    migrated = 0
+    if not table_exists(store.db, "verse_analysis_cache"):
+        return migrated
+    columns = {row[1] for row in store.db.fetchall("PRAGMA table_info(verse_analysis_cache)")}
+    if "word_alignments_json" not in columns:
+        return migrated
+    codec = get_payload_codec(store.database_path)
+    rows = store.db.fetchall('''
+        SELECT verse_reference, language_code, translations_json, word_alignments_json, alignment_method
+        FROM verse_analysis_cache
+        WHERE translations_json IS NOT NULL OR word_alignments_json IS NOT NULL
+    ''')
+    with store.db.transaction() as cursor:
+        for verse_reference, language_code, translations_json, word_alignments_json, method in rows:
+            try:
+                translations = codec.decode(translations_json, {})
+                alignments = codec.decode(word_alignments_json)
+            except (ValueError, RuntimeError):
+                print(f"⚠️  Skipping unreadable verse_analysis_cache row {verse_reference} ({language_code})")
+                continue
+            store.save_translations(verse_reference, language_code, translations, cursor=cursor)
+            if alignments:
+                alignments.setdefault("method", method)
+                store.save_frontend_alignments(verse_reference, language_code, alignments, cursor=cursor)
+            migrated += 1
+        if drop_blobs:
+            # translations_json stays: verse analyses read it too
+            cursor.execute("UPDATE verse_analysis_cache SET word_alignments_json = NULL")
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move cached translation/alignment JSON into the normalized verse tables")
+    parser.add_argument("--cache-db", default=settings.WORD_CACHE_DB, help="Cache database to migrate")
+    parser.add_argument("--drop-blobs", action="store_true",
+                        help="Clear verse_analysis_cache.word_alignments_json after copying")
+    args = parser.parse_args()
+
+    if not Path(args.cache_db).exists():
+        print(f"❌ Cache database not found: {args.cache_db}")
+        return 1
+
+    store = get_verse_cache_store(args.cache_db)
+    print(f"Migrating {args.cache_db}")
+    translations, rekeyed = migrate_translation_cache(store)
+    print(f"✅ translation_cache: {translations} rows normalized, {rekeyed} keys renamed")
+    analyses = migrate_verse_analysis_cache(store, drop_blobs=args.drop_blobs)
+    print(f"✅ verse_analysis_cache: {analyses} rows normalized" + (" (blobs cleared)" if args.drop_blobs else ""))
+    store.db.close_all()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
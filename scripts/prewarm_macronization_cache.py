@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Prewarm the macronization cache
+Macronizes every verse of a book (or of the whole database) offline, so that the API
+answers those verses from macronization_cache.db instead of running the macronizer.
+
+Usage:
+    python scripts/prewarm_macronization_cache.py Gn
+    python scripts/prewarm_macronization_cache.py Gn --chapter 1 --utov --itoj
+    python scripts/prewarm_macronization_cache.py --all
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.core.config import settings  # noqa: E402
+from backend.app.services.latin_macronizer import LatinMacronizer, make_cache  # noqa: E402
+from verse_loader import load_verses  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Macronize a book into the macronization cache")
+    parser.add_argument("book", nargs="?", help="Book abbreviation or name, e.g. Gn")
+    parser.add_argument("--all", action="store_true", help="Prewarm every Bible book")
+    parser.add_argument("--chapter", type=int, help="Only this chapter")
+    parser.add_argument("--utov", action="store_true", help="Cache results with u to v conversion")
+    parser.add_argument("--itoj", action="store_true", help="Cache results with i to j conversion")
+    args = parser.parse_args()
+
+    if not args.book and not args.all:
+        parser.error("give a book or --all")
+
+    verses = load_verses(None if args.all else args.book, args.chapter)
+    if not verses:
+        print(f"❌ No verses found for {args.book}")
+        return 1
+
+    cache = make_cache(settings.MACRONIZATION_CACHE_DB, settings.MACRONIZATION_CACHE_SIZE)
+    macronizer = LatinMacronizer(pool_size=1, cache=cache)
+    if not macronizer.is_available() or cache is None:
+        print("❌ Macronizer not available - check installation")
+        return 1
+
+    print(f"Prewarming {len(verses)} verses into {settings.MACRONIZATION_CACHE_DB}")
+    start = time.perf_counter()
+    already_cached = 0
+    for number, (reference, text) in enumerate(verses, 1):
+        if not text or not text.strip():
+            continue
+        if cache.get(text, args.utov, args.itoj, 0) is not None:
+            already_cached += 1
+            continue
+        macronizer.macronize_text(text, perform_utov=args.utov, perform_itoj=args.itoj)
+        if number % 100 == 0:
+            rate = number / (time.perf_counter() - start)
+            print(f"  {number}/{len(verses)} ({reference}), {rate:.1f} verses/sec")
+
+    print(f"✅ Done in {time.perf_counter() - start:.1f}s ({already_cached} were already cached)")
+    print(f"Cache: {cache.get_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Verse loading shared by the batch scripts
+load_verses() returns the Bible verses of a book (or chapter, or of every book) from the main
+database as (reference, text) pairs, in canonical order. Not a script of its own: imported by
+prewarm_macronization_cache.py, bulk_translate.py and warm_alignment_embeddings.py.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.core.config import settings  # noqa: E402
+
+
+def load_verses(book, chapter=None):
+    """Return [(reference, text), ...] for a book (by abbreviation or name), or all books if book is None"""
+    conn = sqlite3.connect(settings.SQLITE_DB_PATH)
+    cursor = conn.cursor()
+    query = '''
+        SELECT b.abbreviation, v.chapter, v.verse_number, v.text
+        FROM verses v JOIN books b ON v.book_id = b.id
+        WHERE b.source = 'bible'
+    '''
+    params = []
+    if book is not None:
+        query += ' AND (b.abbreviation = ? OR b.name = ? OR b.latin_name = ?)'
+        params += [book, book, book]
+    if chapter is not None:
+        query += ' AND v.chapter = ?'
+        params.append(chapter)
+    query += ' ORDER BY b.id, v.chapter, v.verse_number'
+    cursor.execute(query, params)
+    verses = [(f"{abbreviation} {chapter}:{verse}", text) for abbreviation, chapter, verse, text in cursor.fetchall()]
+    conn.close()
+    return verses
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Warm the source embedding cache
+Encodes every verse of a book (or of the whole database) into alignment_embeddings.db, so that
+word alignment for those verses only runs the encoder on the translation side.
+
+Usage:
+    python scripts/warm_alignment_embeddings.py Gn
+    python scripts/warm_alignment_embeddings.py Gn --chapter 1 --batch-size 16
+    python scripts/warm_alignment_embeddings.py --all
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services.embedding_cache import get_embedding_cache  # noqa: E402
+from backend.app.services.word_alignment import ALIGN_BATCH_SIZE, get_word_aligner  # noqa: E402
+from verse_loader import load_verses  # noqa: E402
+
+# Verses encoded between progress lines (and per embedding cache write)
+CHUNK_SIZE = 256
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-embed a book's verses into the alignment embedding cache")
+    parser.add_argument("book", nargs="?", help="Book abbreviation or name, e.g. Gn")
+    parser.add_argument("--all", action="store_true", help="Warm every Bible book")
+    parser.add_argument("--chapter", type=int, help="Only this chapter")
+    parser.add_argument("--batch-size", type=int, default=ALIGN_BATCH_SIZE, help="Sentences per forward pass")
+    args = parser.parse_args()
+
+    if not args.book and not args.all:
+        parser.error("give a book or --all")
+
+    aligner = get_word_aligner()
+    cache = get_embedding_cache()
+    if not aligner.is_ready:
+        print("❌ SimAlign not available - install simalign, torch and transformers")
+        return 1
+    if cache is None:
+        print("❌ Embedding cache disabled (ALIGNMENT_EMBEDDING_CACHE_MB is 0)")
+        return 1
+
+    verses = [(reference, text) for reference, text in load_verses(None if args.all else args.book, args.chapter)
+              if text and text.strip()]
+    if not verses:
+        print(f"❌ No verses found for {args.book}")
+        return 1
+
+    print(f"Embedding {len(verses)} verses into {cache.database_path} ({aligner.embedding_model})")
+    start = time.perf_counter()
+    encoded = 0
+    for offset in range(0, len(verses), CHUNK_SIZE):
+        chunk = verses[offset:offset + CHUNK_SIZE]
+        encoded += aligner.warm_source_embeddings([text for _, text in chunk], "latin", args.batch_size)
+        done = offset + len(chunk)
+        rate = done / (time.perf_counter() - start)
+        print(f"  {done}/{len(verses)} ({chunk[-1][0]}), {rate:.1f} verses/sec")
+
+    print(f"✅ Done in {time.perf_counter() - start:.1f}s ({len(verses) - encoded} were already cached)")
+    print(f"Cache: {cache.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for the word alignment inference backends
+Unknown or unavailable backends fall back to torch, and the ONNX encoder must produce the
+same embeddings as SimAlign's PyTorch model.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import alignment_backends  # noqa: E402
+from backend.app.services.alignment_backends import (  # noqa: E402
+    ONNXRUNTIME_AVAILABLE, apply_inference_backend, load_onnx_session, onnx_model_path, write_model_file
+)
+from backend.app.services.word_alignment import SIMALIGN_AVAILABLE, AdvancedWordAligner  # noqa: E402
+
+
+def test_backend_selection():
+    assert apply_inference_backend(object(), "tensorrt", "/tmp", "bert-base-multilingual-cased") == "torch"
+    assert apply_inference_backend(object(), "torch", "/tmp", "bert-base-multilingual-cased") == "torch"
+    assert onnx_model_path("/models", "bert-base-multilingual-cased", 8, quantized=True).endswith(
+        "bert-base-multilingual-cased-layer8-int8.onnx")
+    # Backends round differently, so cached source embeddings are kept apart per backend
+    aligner = AdvancedWordAligner(load_model=False, backend="onnx_int8")
+    assert aligner.embedding_model.endswith("/onnx_int8")
+    assert aligner.status()["backend"] == "onnx_int8"
+    print("✅ Backend selection and embedding cache keys")
+
+
+def test_failed_export_leaves_no_model_file():
+    """A partial export is never moved into place, so the next start exports again"""
+    model_dir = os.path.join(tempfile.mkdtemp(), "onnx")
+
+    def failing_export(embed_loader, path):
+        with open(path, "wb") as f:
+            f.write(b"partial")
+        raise RuntimeError("export interrupted")
+
+    class EmbedLoader:
+        layer = 8
+
+    original, alignment_backends.export_onnx_encoder = alignment_backends.export_onnx_encoder, failing_export
+    try:
+        with pytest.raises(RuntimeError):
+            load_onnx_session(EmbedLoader(), model_dir, "bert-base-multilingual-cased", quantized=False)
+    finally:
+        alignment_backends.export_onnx_encoder = original
+    assert os.listdir(model_dir) == []
+
+    path = onnx_model_path(model_dir, "bert-base-multilingual-cased", 8, quantized=True)
+    write_model_file(path, lambda tmp_path: Path(tmp_path).write_bytes(b"model"))
+    assert os.listdir(model_dir) == [os.path.basename(path)]
+    with open(path, "rb") as f:
+        assert f.read() == b"model"
+    print("✅ Model files only appear once they were written completely")
+
+
+def test_onnx_matches_torch():
+    if not SIMALIGN_AVAILABLE or not ONNXRUNTIME_AVAILABLE:
+        print("⚠️  SimAlign or onnxruntime not installed, skipping")
+        return
+    import numpy as np
+    from backend.app.core.config import settings
+    settings.ALIGNMENT_ONNX_DIR = tempfile.mkdtemp()
+    torch_aligner = AdvancedWordAligner(backend="torch")
+    onnx_aligner = AdvancedWordAligner(backend="onnx")
+    assert onnx_aligner.backend == "onnx"
+    batch = [["In", "principio", "creavit", "Deus"], ["In", "the", "beginning", "God", "created"]]
+    expected = torch_aligner.aligner.embed_loader.get_embed_list(batch).cpu().detach().numpy()
+    actual = onnx_aligner.aligner.embed_loader.get_embed_list(batch).cpu().detach().numpy()
+    assert expected.shape == actual.shape
+    assert np.allclose(expected, actual, atol=1e-3)
+    print("✅ ONNX encoder matches the PyTorch embeddings")
+
+
+if __name__ == "__main__":
+    test_backend_selection()
+    test_failed_export_leaves_no_model_file()
+    test_onnx_matches_torch()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for batched word alignment
+align_many and align_pairs must return what align_words returns pair by pair, and an aligner
+whose model is not loaded yet must answer with the fallback aligner. A stub SentenceAligner
+(deterministic subword vectors) runs the batched path without the BERT model.
+"""
+
+import sys
+import threading
+import zlib
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import word_alignment  # noqa: E402
+from backend.app.services.word_alignment import AdvancedWordAligner, get_word_aligner  # noqa: E402
+
+SOURCE = "In principio creavit Deus caelum et terram"
+LITERAL = "In beginning created God heaven and earth"
+DYNAMIC = "In the beginning God created the heavens and the earth"
+DIMS = 16
+
+
+def summarize(result):
+    return result["method"], [(a.source_index, a.target_indices) for a in result["alignments"]]
+
+
+def links(result):
+    return sorted((a.source_index, index) for a in result["alignments"] for index in a.target_indices)
+
+
+class StubTensor:
+    """What get_embed_list returns, for the .cpu().detach().numpy() chain"""
+
+    def __init__(self, array):
+        self.array = array
+
+    def cpu(self):
+        return self
+
+    def detach(self):
+        return self
+
+    def numpy(self):
+        return self.array
+
+
+class StubTokenizer:
+    """Splits words into three-letter subwords"""
+
+    def tokenize(self, word):
+        return [word[start:start + 3] for start in range(0, len(word), 3)]
+
+
+class StubEmbedLoader:
+    """Context-free subword vectors, padded per batch and truncated at max_subwords like BERT"""
+
+    def __init__(self, max_subwords):
+        self.tokenizer = StubTokenizer()
+        self.max_subwords = max_subwords
+        self.forward_passes = 0
+        self.encoded = []
+
+    def get_embed_list(self, sentences):
+        import numpy as np
+        self.forward_passes += 1
+        self.encoded.extend(tuple(words) for words in sentences)
+        rows = [[subword_vector(subword) for word in words for subword in self.tokenizer.tokenize(word)][:self.max_subwords]
+                for words in sentences]
+        # Padding rows hold a constant, so reading them changes the alignments
+        batch = np.full((len(rows), max(len(row) for row in rows), DIMS), 9.0, dtype=np.float32)
+        for index, row in enumerate(rows):
+            batch[index, :len(row)] = row
+        return StubTensor(batch)
+
+
+def subword_vector(subword):
+    import numpy as np
+    return np.random.default_rng(zlib.crc32(subword.lower().encode("utf-8"))).standard_normal(DIMS)
+
+
+class StubSentenceAligner:
+    """SimAlign's SentenceAligner hooks over the stub encoder (mutual argmax stands in for mwmf)"""
+
+    distortion = 0.5
+
+    def __init__(self, max_subwords=64):
+        self.embed_loader = StubEmbedLoader(max_subwords)
+        self.word_align_calls = 0
+
+    @staticmethod
+    def get_similarity(X, Y):
+        import numpy as np
+        X = X / np.linalg.norm(X, axis=1, keepdims=True)
+        Y = Y / np.linalg.norm(Y, axis=1, keepdims=True)
+        return (X @ Y.T + 1.0) / 2.0
+
+    @staticmethod
+    def apply_distortion(sim_matrix, ratio=0.5):
+        import numpy as np
+        rows, columns = sim_matrix.shape
+        if rows < 2 or columns < 2 or ratio == 0.0:
+            return sim_matrix
+        pos_x = np.arange(columns)[None, :] / (columns - 1)
+        pos_y = np.arange(rows)[:, None] / (rows - 1)
+        return sim_matrix * (1.0 - (pos_x - pos_y) ** 2 * ratio)
+
+    @staticmethod
+    def get_max_weight_match(sim):
+        import numpy as np
+        forward = np.zeros_like(sim)
+        forward[np.arange(sim.shape[0]), sim.argmax(axis=1)] = 1
+        backward = np.zeros_like(sim)
+        backward[sim.argmax(axis=0), np.arange(sim.shape[1])] = 1
+        return forward * backward
+
+    def get_word_aligns(self, src_sent, trg_sent):
+        """SentenceAligner.get_word_aligns: both sentences in one padded pass, truncated subwords dropped"""
+        self.word_align_calls += 1
+        tokens = [[self.embed_loader.tokenizer.tokenize(word) for word in sentence] for sentence in (src_sent, trg_sent)]
+        maps = [[index for index, subwords in enumerate(sentence) for _ in subwords] for sentence in tokens]
+        vectors = self.embed_loader.get_embed_list([src_sent, trg_sent]).cpu().detach().numpy()
+        vectors = [vectors[index, :min(len(maps[index]), self.embed_loader.max_subwords)] for index in (0, 1)]
+        sim = self.apply_distortion(self.get_similarity(vectors[0], vectors[1]), self.distortion)
+        matches = self.get_max_weight_match(sim)
+        return {"mwmf": sorted({(maps[0][i], maps[1][j]) for i, j in zip(*matches.nonzero())})}
+
+
+def stub_aligner(max_subwords=64):
+    aligner = AdvancedWordAligner(load_model=False)
+    aligner.aligner = StubSentenceAligner(max_subwords)
+    aligner.state = "ready"
+    return aligner
+
+
+def expected_links(aligner, source, target):
+    source_tokens = aligner._tokenize_text(source, "latin")
+    target_tokens = aligner._tokenize_text(target, "target")
+    return sorted(aligner.aligner.get_word_aligns(source_tokens, target_tokens)["mwmf"])
+
+
+def test_align_many_matches_align_words():
+    aligner = get_word_aligner()
+    literal, dynamic = aligner.align_many(SOURCE, [LITERAL, DYNAMIC], "latin")
+    assert summarize(literal) == summarize(aligner.align_words(SOURCE, LITERAL, "latin"))
+    assert summarize(dynamic) == summarize(aligner.align_words(SOURCE, DYNAMIC, "latin"))
+    print(f"✅ align_many ({literal['method']}) matches align_words")
+
+
+def test_align_pairs_keeps_order():
+    aligner = get_word_aligner()
+    pairs = [(SOURCE, LITERAL), ("Fiat lux", "Let there be light"), (SOURCE, DYNAMIC), ("", "nothing")]
+    results = aligner.align_pairs(pairs, "latin", batch_size=2)
+    assert len(results) == len(pairs)
+    for (source, target), result in zip(pairs, results):
+        assert summarize(result) == summarize(aligner.align_words(source, target, "latin"))
+    assert results[3]["alignments"] == []
+    print("✅ align_pairs returns one result per pair, in order")
+
+
+def test_batched_path_matches_get_word_aligns():
+    """Mixed lengths padded into shared batches give the word pairs of one pair per pass"""
+    pytest.importorskip("numpy")
+    original, word_alignment.get_embedding_cache = word_alignment.get_embedding_cache, lambda: None
+    try:
+        aligner = stub_aligner()
+        pairs = [(SOURCE, LITERAL), ("Fiat lux", "Let there be light"), (SOURCE, DYNAMIC),
+                 ("Et vidit Deus lucem quod esset bona", "And God saw the light that it was good")]
+        results = aligner.align_pairs(pairs, "latin", batch_size=2)
+        stub = aligner.aligner
+        assert stub.word_align_calls == 0  # every pair went through the batched path
+        assert stub.embed_loader.forward_passes == 4 and aligner.encoded_sentences == 7
+        for (source, target), result in zip(pairs, results):
+            assert result["method"] == "simalign_bert"
+            assert links(result) and links(result) == expected_links(aligner, source, target)
+        print("✅ Batched alignment matches get_word_aligns across mixed-length batches")
+    finally:
+        word_alignment.get_embedding_cache = original
+
+
+def test_truncated_sentence_uses_get_word_aligns():
+    """A sentence the encoder truncates is aligned pair by pair, the rest of the batch is not"""
+    pytest.importorskip("numpy")
+    original, word_alignment.get_embedding_cache = word_alignment.get_embedding_cache, lambda: None
+    try:
+        aligner = stub_aligner(max_subwords=6)
+        pairs = [("Fiat lux", "Let there be light"), (SOURCE, "God created")]  # SOURCE has 14 subwords
+        embedded = aligner._embed_sentences([aligner._tokenize_text(SOURCE, "latin"), ["Fiat", "lux"]], 2)
+        assert list(embedded) == [("Fiat", "lux")]
+
+        results = aligner.align_pairs(pairs, "latin")
+        assert aligner.aligner.word_align_calls == 1
+        for (source, target), result in zip(pairs, results):
+            assert result["method"] == "simalign_bert"
+            assert links(result) == expected_links(aligner, source, target)
+        print("✅ Truncated sentence fell back to get_word_aligns with the same word pairs")
+    finally:
+        word_alignment.get_embedding_cache = original
+
+
+def test_unloaded_aligner_falls_back_without_blocking():
+    aligner = AdvancedWordAligner(load_model=False)
+    assert not aligner.is_ready and aligner.status()["method"] == "fallback"
+    result = aligner.align_words(SOURCE, LITERAL, "latin")
+    assert summarize(result) == summarize(aligner._fallback_alignment(SOURCE, LITERAL, "latin"))
+    aligner.start_loading()
+    aligner.start_loading()  # second call is a no-op
+    aligner.wait_until_loaded(timeout=600)
+    assert not aligner.is_loading
+    assert aligner.status()["state"] in ("ready", "failed", "unavailable")
+    print(f"✅ Aligner answered with the fallback while unloaded, then reached {aligner.state}")
+
+
+def test_non_blocking_get_starts_loading():
+    """get_word_aligner(wait=False) starts the background load when the startup hook has not"""
+    aligner = AdvancedWordAligner(load_model=False)
+    aligner.state = "not_loaded"  # as with SimAlign installed
+    loaded = threading.Event()
+    aligner.load_model = lambda: (setattr(aligner, "state", "ready"), loaded.set())
+    original, word_alignment.word_aligner = word_alignment.word_aligner, aligner
+    try:
+        assert get_word_aligner(wait=False) is aligner
+        assert loaded.wait(timeout=5) and aligner.is_ready
+        print("✅ Non-blocking get_word_aligner started loading the model")
+    finally:
+        word_alignment.word_aligner = original
+
+
+if __name__ == "__main__":
+    test_align_many_matches_align_words()
+    test_align_pairs_keeps_order()
+    test_batched_path_matches_get_word_aligns()
+    test_truncated_sentence_uses_get_word_aligns()
+    test_unloaded_aligner_falls_back_without_blocking()
+    test_non_blocking_get_starts_loading()
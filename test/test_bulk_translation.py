@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for the bulk translation pipeline
+Runs BulkTranslator against a stub chat model that answers the batched prompt format.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services.bulk_translation import BulkTranslator, pack_batches  # noqa: E402
+from backend.app.services.verse_cache_store import get_verse_cache_store  # noqa: E402
+
+
+class StubChatClient:
+    """Answers batched translation prompts like the real API; can drop one verse id per call"""
+
+    def __init__(self, drop_id=None):
+        self.calls = 0
+        self.drop_id = drop_id
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, max_tokens, temperature):
+        self.calls += 1
+        verses = json.loads(re.search(r"Verses \(JSON\):\n(.*)\n\nReturn", messages[-1]["content"], re.S).group(1))
+        translations = [{"id": verse["id"], "literal": f"lit {verse['text']}", "dynamic": f"dyn {verse['text']}"}
+                        for verse in verses if verse["id"] != self.drop_id or len(verses) == 1]
+        content = json.dumps({"translations": translations})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+                               usage=SimpleNamespace(total_tokens=max_tokens))
+
+
+class StubAligner:
+    """Aligns word i to word i like SimAlign, leaving the first source word unaligned"""
+
+    def align_pairs(self, pairs, source_language):
+        return [{"source": source.split(), "target": target.split()} for source, target in pairs]
+
+    def format_alignment_response(self, result):
+        alignments = [{"source_word": word, "source_index": index,
+                       "target_words": [result["target"][index]] if index else [],
+                       "target_indices": [index] if index else [], "confidence": 0.8 if index else 0.0}
+                      for index, word in enumerate(result["source"])]
+        return {"alignments": alignments, "method": "simalign", "average_confidence": 0.6}
+
+
+VERSES = [(f"Gn 1:{number}", f"verse {number} " + "et " * 20) for number in range(1, 31)]
+
+
+def test_packing():
+    """Batches respect the token budget and keep verse order"""
+    batches = pack_batches(VERSES, "en", token_budget=400)
+    assert len(batches) > 1
+    assert [verse for batch in batches for verse in batch] == VERSES
+    print(f"✅ {len(VERSES)} verses packed into {len(batches)} prompts")
+
+
+def test_run_and_resume():
+    """All verses land in translation_cache; a second run skips them; dropped verses are retried"""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    checkpoint = path + ".json"
+    try:
+        client = StubChatClient(drop_id=2)
+        translator = BulkTranslator(client, path, target_language="es", token_budget=600, checkpoint_path=checkpoint)
+        stats = translator.run(VERSES)
+        assert stats["translated"] == 30 and stats["failed"] == 0
+        assert client.calls < len(VERSES)
+
+        conn = sqlite3.connect(path)
+        rows = conn.execute("SELECT cache_key FROM translation_cache").fetchall()
+        conn.close()
+        assert len(rows) == 30 and ("Gn 1:3_es",) in rows
+        data = get_verse_cache_store(path).get_translation_payload("Gn 1:3", "es")
+        assert data["dynamic"].startswith("dyn verse 3") and data["source_language"] == "latin"
+
+        resumed_client = StubChatClient()
+        resumed = BulkTranslator(resumed_client, path, target_language="es", checkpoint_path=checkpoint)
+        assert resumed.run(VERSES)["skipped"] == 30 and resumed_client.calls == 0
+        print(f"✅ Bulk translation: {stats}")
+    finally:
+        for leftover in (path, checkpoint):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+def test_alignments_match_translate():
+    """Bulk-cached alignments keep every source word, as /dictionary/translate caches them"""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        aligner = StubAligner()
+        translator = BulkTranslator(StubChatClient(), path, target_language="es", aligner=aligner)
+        translator.run(VERSES[:3])
+
+        store = get_verse_cache_store(path)
+        source, target = VERSES[2][1], f"lit {VERSES[2][1]}"
+        expected = aligner.format_alignment_response(aligner.align_pairs([(source, target)], "latin")[0])["alignments"]
+        assert store.get_translation_payload("Gn 1:3", "es")["word_alignments"]["literal"] == expected
+        frontend = store.get_frontend_alignments("Gn 1:3", "es")
+        assert len(frontend["literal"]) == len(frontend["dynamic"]) == len(source.split())
+        assert frontend["average_confidence"] == 0.6
+        print("✅ Bulk alignments keep unaligned source words")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    test_packing()
+    test_run_and_resume()
+    test_alignments_match_translate()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for the cache manager
+Self-check of the cache databases and the per-cache hit counters.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services.cache_manager import CacheManager, cache_counters  # noqa: E402
+from backend.app.services.enhanced_dictionary import EnhancedDictionary, WordInfo  # noqa: E402
+
+
+def test_self_check():
+    """A set-up word cache passes; a missing analysis DB passes only if it can be created"""
+    directory = tempfile.mkdtemp()
+    try:
+        manager = CacheManager(os.path.join(directory, "word_cache.db"), os.path.join(directory, "analysis.db"))
+        EnhancedDictionary(database_path=manager.word_cache_path).close()
+        report = manager.self_check()
+        assert report["ok"], report
+        assert report["databases"]["word_cache"]["integrity"] == "ok"
+        assert report["databases"]["analysis"]["detail"] == "not created yet"
+
+        # A word cache without its tables is reported, not silently used
+        bare = CacheManager(os.path.join(directory, "bare.db"), os.path.join(directory, "analysis.db"))
+        bare.pool("word_cache").execute("CREATE TABLE word_cache (word TEXT)")
+        report = bare.self_check()
+        assert not report["ok"] and "translation_cache" in report["databases"]["word_cache"]["missing_tables"]
+        manager.close()
+        bare.close()
+        print("✅ Cache self-check")
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_hit_rates():
+    """Word and translation lookups show up in the counters"""
+    directory = tempfile.mkdtemp()
+    try:
+        cache_counters.reset()
+        dictionary = EnhancedDictionary(database_path=os.path.join(directory, "word_cache.db"))
+        dictionary.save_to_cache(WordInfo(latin="lux", definition="light", etymology="", part_of_speech="noun"))
+        dictionary.get_from_cache("lux")
+        dictionary.get_from_cache("tenebrae")
+        dictionary.get_translation_from_cache("Gn 1:3_en")
+        stats = cache_counters.stats()
+        assert stats["word"]["hits"] == 1 and stats["word"]["misses"] == 1 and stats["word"]["hit_rate"] == 0.5
+        assert stats["translation"]["misses"] == 1
+        dictionary.close()
+        print(f"✅ Cache hit rates: {stats}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    test_self_check()
+    test_hit_rates()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for the source embedding cache
+Round-trips float16 embeddings through SQLite, checks the byte budget and LRU eviction, and
+that the aligner only encodes the target of a source it has seen before.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import word_alignment  # noqa: E402
+from backend.app.services.embedding_cache import EmbeddingCache, sentence_hash  # noqa: E402
+from test_batched_alignment import DYNAMIC, LITERAL, SOURCE, links, stub_aligner  # noqa: E402
+
+MODEL = "bert-base-multilingual-cased/layer8/bpe"
+
+
+def make_cache(max_bytes=1024 * 1024):
+    return EmbeddingCache(os.path.join(tempfile.mkdtemp(), "embeddings.db"), max_bytes)
+
+
+def embedding(subwords, dims=8, seed=0):
+    import numpy as np
+    vectors = np.random.default_rng(seed).standard_normal((subwords, dims)).astype(np.float32)
+    return vectors, [index // 2 for index in range(subwords)]
+
+
+def test_roundtrip():
+    np = pytest.importorskip("numpy")
+    cache = make_cache()
+    key = sentence_hash(["In", "principio", "creavit", "Deus"])
+    vectors, mapping = embedding(7)
+    cache.put_many({key: (vectors, mapping)}, MODEL)
+
+    found = cache.get_many([key, sentence_hash(["Fiat", "lux"])], MODEL)
+    assert list(found) == [key]
+    cached_vectors, cached_mapping = found[key]
+    assert cached_vectors.dtype == np.float32 and cached_vectors.shape == (7, 8)
+    assert np.allclose(cached_vectors, vectors, atol=1e-2)
+    assert cached_mapping == mapping
+    assert cache.get_many([key], "another-model") == {}
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+    print("✅ Embeddings round-trip as float16 per model")
+
+
+def test_eviction_keeps_recently_used():
+    pytest.importorskip("numpy")
+    entry_bytes = 10 * 8 * 2 + 10 * 4  # float16 vectors + uint32 subword map
+    cache = make_cache(max_bytes=entry_bytes * 4)
+    keys = [sentence_hash([str(number)]) for number in range(4)]
+    for number, key in enumerate(keys):
+        cache.put_many({key: embedding(10, seed=number)}, MODEL)
+        time.sleep(0.01)
+    cache.get_many([keys[0]], MODEL)  # keys[1] is now the least recently used
+
+    cache.put_many({sentence_hash(["new"]): embedding(10, seed=9)}, MODEL)
+    stats = cache.stats()
+    assert stats["bytes"] <= cache.max_bytes
+    assert stats["evictions"] >= 1
+    remaining = cache.get_many(keys, MODEL)
+    assert keys[0] in remaining and keys[1] not in remaining
+    print(f"✅ Eviction kept the cache under budget ({stats['entries']} entries, {stats['evictions']} evicted)")
+
+
+def test_replacing_a_key_keeps_the_byte_count():
+    pytest.importorskip("numpy")
+    cache = make_cache()
+    key = sentence_hash(["Fiat", "lux"])
+    cache.put_many({key: embedding(10)}, MODEL)
+    cache.put_many({key: embedding(6, seed=1)}, MODEL)
+    stored = cache.db.fetchone('SELECT SUM(size_bytes) FROM source_embeddings')[0]
+    assert cache.total_bytes == stored == 6 * 8 * 2 + 6 * 4
+    assert cache.stats()["entries"] == 1
+    print("✅ Re-storing a key replaces its bytes instead of adding them")
+
+
+def test_aligner_encodes_only_the_new_target():
+    """A cached source is not run through the encoder again, and aligns as it would uncached"""
+    pytest.importorskip("numpy")
+    cache = make_cache()
+    original, word_alignment.get_embedding_cache = word_alignment.get_embedding_cache, lambda: cache
+    try:
+        aligner = stub_aligner()
+        encoder = aligner.aligner.embed_loader
+        aligner.align_pairs([(SOURCE, LITERAL)], "latin")
+        assert encoder.forward_passes == 1 and len(encoder.encoded) == 2
+
+        del encoder.encoded[:]
+        cached = aligner.align_pairs([(SOURCE, DYNAMIC)], "latin")[0]
+        assert encoder.forward_passes == 2
+        assert encoder.encoded == [tuple(aligner._tokenize_text(DYNAMIC, "target"))]
+        assert cache.stats()["hits"] == 1
+
+        word_alignment.get_embedding_cache = lambda: None
+        uncached = stub_aligner().align_pairs([(SOURCE, DYNAMIC)], "latin")[0]
+        assert cached["method"] == uncached["method"] == "simalign_bert"
+        assert links(cached) == links(uncached)
+        print("✅ Second target encoded alone, with the alignment of an uncached run")
+    finally:
+        word_alignment.get_embedding_cache = original
+
+
+if __name__ == "__main__":
+    test_roundtrip()
+    test_eviction_keeps_recently_used()
+    test_replacing_a_key_keeps_the_byte_count()
+    test_aligner_encodes_only_the_new_target()
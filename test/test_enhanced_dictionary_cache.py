@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for the EnhancedDictionary word cache
+Checks the in-memory tier, negative caching and the buffered SQLite writes.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services.enhanced_dictionary import EnhancedDictionary, WordInfo  # noqa: E402
+
+
+def make_dictionary():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    return EnhancedDictionary(database_path=path), path
+
+
+def test_memory_tier():
+    """A word saved once is served from memory; clearing it drops both tiers"""
+    dictionary, path = make_dictionary()
+    try:
+        dictionary.save_to_cache(WordInfo(latin="deus", definition="god", etymology="", part_of_speech="noun"))
+        assert dictionary.get_from_cache("deus").definition == "god"
+        assert dictionary.get_memory_cache_stats()["hits"] == 1
+
+        # A fresh dictionary reads it back from SQLite once, then from memory
+        dictionary.flush_writes()
+        other = EnhancedDictionary(database_path=path)
+        other.clear_memory_cache()
+        assert other.get_from_cache("deus").definition == "god"
+        assert other.get_from_cache("deus").definition == "god"
+
+        assert dictionary.clear_word_cache("deus")
+        assert dictionary.get_from_cache("deus") is None
+        print("✅ Memory tier:", dictionary.get_memory_cache_stats())
+    finally:
+        dictionary.close()
+        os.remove(path)
+
+
+def test_negative_cache_and_write_behind():
+    """Unknown words are cached as not_found and written to SQLite in one batch"""
+    dictionary, path = make_dictionary()
+    try:
+        dictionary.analyze_verse("In principio creavit Deus caelum et terram", "Gn 1:1")
+        assert dictionary.lookup_word("creavit").source == "not_found"
+        assert dictionary.get_memory_cache_stats()["negative_hits"] >= 1
+        assert dictionary.get_words_for_verse("Gn 1:1")[:2] == ["In", "principio"]
+
+        dictionary.close()
+        conn = sqlite3.connect(path)
+        assert conn.execute("SELECT COUNT(*) FROM word_cache").fetchone()[0] == 7
+        assert conn.execute("SELECT COUNT(*) FROM word_verse_relationships").fetchone()[0] == 7
+        conn.close()
+        print("✅ Negative cache and write-behind:", dictionary.writes.stats())
+    finally:
+        dictionary.close()
+        os.remove(path)
+
+
+def test_batch_lookup():
+    """get_many_from_cache resolves cached words together and leaves out the rest"""
+    dictionary, path = make_dictionary()
+    try:
+        for word in ("et", "in", "Dominus"):
+            dictionary.save_to_cache(WordInfo(latin=word, definition=word, etymology="", part_of_speech=""))
+        dictionary.flush_writes()
+        dictionary.clear_memory_cache()
+
+        found = dictionary.get_many_from_cache(["et", "Dominus", "et", "verbum"])
+        assert sorted(found) == ["Dominus", "et"]
+        assert dictionary.get_memory_cache_stats()["size"] == 2
+        print("✅ Batch lookup:", sorted(found))
+    finally:
+        dictionary.close()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    test_memory_tier()
+    test_negative_cache_and_write_behind()
+    test_batch_lookup()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for the indexed fallback aligner
+The bounded indel distance and cognate test must agree with their slow definitions, and
+lexicon glosses must match inflected target words.
+"""
+
+import json
+import random
+import sys
+import tempfile
+from difflib import SequenceMatcher
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import fallback_aligner  # noqa: E402
+from backend.app.services.fallback_aligner import (  # noqa: E402
+    AlignmentLexicon, TargetIndex, bounded_indel_distance, is_likely_cognate, latin_stem, normalize_latin
+)
+from backend.app.services.word_alignment import AdvancedWordAligner  # noqa: E402
+
+
+def indel_distance(a, b):
+    """Unbounded reference: len(a) + len(b) - 2 * LCS"""
+    lcs = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            lcs[i][j] = lcs[i - 1][j - 1] + 1 if a[i - 1] == b[j - 1] else max(lcs[i - 1][j], lcs[i][j - 1])
+    return len(a) + len(b) - 2 * lcs[len(a)][len(b)]
+
+
+def test_bounded_indel_distance():
+    rng = random.Random(7)
+    for _ in range(2000):
+        a = "".join(rng.choice("aeiourst") for _ in range(rng.randint(0, 9)))
+        b = "".join(rng.choice("aeiourst") for _ in range(rng.randint(0, 9)))
+        limit = rng.randint(0, 6)
+        expected = indel_distance(a, b)
+        assert bounded_indel_distance(a, b, limit) == (expected if expected <= limit else limit + 1), (a, b, limit)
+    print("✅ bounded_indel_distance matches the LCS definition within its bound")
+
+
+def test_cognates_match_sequence_matcher():
+    words = ["principio", "principle", "terra", "tierra", "creavit", "created", "lux", "light",
+             "aqua", "agua", "erat", "earth", "verbum", "verb", "deus", "dios", "abyssi", "abyss"]
+    for word1 in words:
+        for word2 in words:
+            expected = len(word1) >= 3 and len(word2) >= 3 and SequenceMatcher(None, word1, word2).ratio() > 0.6
+            assert is_likely_cognate(word1, word2) == expected, (word1, word2)
+    index = TargetIndex(["In", "the", "beginning", "God", "created", "the", "earth"])
+    assert index.cognates("creavit") == {4}
+    print("✅ Cognate test agrees with SequenceMatcher")
+
+
+def test_lexicon_glosses():
+    assert normalize_latin("Cælum") == "caelum" and normalize_latin("jūstitia") == "iustitia"
+    assert latin_stem(normalize_latin("creavit")) == latin_stem("creare") == latin_stem("creo") == "cre"
+    lexicon = AlignmentLexicon(forms={"lucem": ["light"]}, stems={"cre": ["create"]})
+    assert lexicon.glosses("lucem") == ["light"]
+    assert lexicon.glosses("creaverunt") == ["create"]  # by stem
+    assert "god" in lexicon.glosses("Deus")  # built-in patterns are always there
+    index = TargetIndex(["God", "created", "the", "lights", "Light"])
+    assert index.gloss_matches(["create"]) == {1}
+    assert index.gloss_matches(["light"]) == {3, 4}
+    print("✅ Lexicon glosses match inflected target words")
+
+
+def test_fallback_alignment_uses_lexicon():
+    path = Path(tempfile.mkdtemp()) / "alignment_lexicon.json"
+    path.write_text(json.dumps({"forms": {"lucem": ["light"], "vidit": ["see"]}, "stems": {}}))
+    original_path, original_lexicon = fallback_aligner.settings.ALIGNMENT_LEXICON_PATH, fallback_aligner._lexicon
+    fallback_aligner.settings.ALIGNMENT_LEXICON_PATH = str(path)
+    fallback_aligner._lexicon = None
+    try:
+        aligner = AdvancedWordAligner(load_model=False)
+        result = aligner._fallback_alignment("Et vidit Deus servum lucem", "And God saw the servant light", "latin")
+        by_word = {a.source_word: (a.target_words, a.confidence) for a in result["alignments"]}
+        assert by_word["lucem"] == (["light"], 0.7)
+        assert by_word["Deus"] == (["God"], 0.7)
+        assert by_word["servum"] == (["servant"], 0.7)  # cognates compare the spelling as written (v, not u)
+        assert result["method"] == "fallback_semantic"
+    finally:
+        fallback_aligner.settings.ALIGNMENT_LEXICON_PATH = original_path
+        fallback_aligner._lexicon = original_lexicon
+    print("✅ Fallback alignment matches words through the compiled lexicon")
+
+
+if __name__ == "__main__":
+    test_bounded_indel_distance()
+    test_cognates_match_sequence_matcher()
+    test_lexicon_glosses()
+    test_fallback_alignment_uses_lexicon()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for the macronization result cache
+Checks the memory and SQLite tiers and invalidation when the macronizer DB version changes.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services import macronization_cache  # noqa: E402
+from backend.app.services.macronization_cache import MacronizationCache  # noqa: E402
+from backend.app.utils.lru_cache import LRUCache  # noqa: E402
+
+
+def test_lru_cache():
+    """The least recently used entry is evicted first"""
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert stats["hits"] == 3 and stats["misses"] == 1
+    print("✅ LRU cache:", stats)
+
+
+def test_tiers_and_invalidation():
+    """Results survive a new cache instance and disappear when the DB version changes"""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    version = [1]
+    saved_interval = macronization_cache.VERSION_CHECK_INTERVAL
+    macronization_cache.VERSION_CHECK_INTERVAL = 0
+    try:
+        cache = MacronizationCache(path, lambda: version[0], memory_size=10)
+        cache.put("Arma virumque cano", "Arma virumque canō")
+        assert cache.get(" Arma virumque cano ") == "Arma virumque canō"
+        assert cache.get("Arma virumque cano", perform_utov=True) is None
+
+        # A fresh instance (e.g. after a restart) finds the result in SQLite
+        restarted = MacronizationCache(path, lambda: version[0], memory_size=10)
+        assert restarted.get("Arma virumque cano") == "Arma virumque canō"
+        assert restarted.get_stats()["sqlite_hits"] == 1
+
+        # Reinitializing macronizer.db bumps its version
+        version[0] = 2
+        assert restarted.get("Arma virumque cano") is None
+        assert restarted.get_stats()["sqlite_entries"] == 0
+        print("✅ Macronization cache tiers and invalidation")
+    finally:
+        macronization_cache.VERSION_CHECK_INTERVAL = saved_interval
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    test_lru_cache()
+    test_tiers_and_invalidation()
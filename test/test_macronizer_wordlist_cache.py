@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for the macronizer word list cache
+Checks that wordforms are loaded in bulk from macronizer.db and that the
+bounded LRU cache reloads evicted wordforms from the database.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# The vendored macronizer uses flat imports (postags, rftagger, ...)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend" / "app" / "services" / "latin-macronizer"))
+
+import macronizer  # noqa: E402
+
+ROWS = [
+    ("rosa", "n-s---fn-", "rosa", "rosa"),
+    ("rosa", "n-s---fb-", "rosa", "rosa_"),
+    ("est", "v3spia---", "sum", "est"),
+    ("puella", "n-s---fn-", "puella", "puella"),
+    ("xyzzy", None, None, None),
+]
+
+
+def make_database():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE morpheus(id INTEGER PRIMARY KEY, wordform TEXT NOT NULL, morphtag TEXT, "
+                 "lemma TEXT, accented TEXT, UNIQUE(wordform, morphtag, lemma, accented))")
+    conn.executemany("INSERT INTO morpheus (wordform, morphtag, lemma, accented) VALUES (?, ?, ?, ?)", ROWS)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_bulk_load_and_eviction():
+    """Words are fetched in chunks and evicted ones come back from the database"""
+    path = make_database()
+    saved = (macronizer.DB_NAME, macronizer.WORDFORM_CACHE_SIZE, macronizer.DB_IN_CHUNK)
+    macronizer.DB_NAME, macronizer.WORDFORM_CACHE_SIZE, macronizer.DB_IN_CHUNK = path, 2, 2
+    try:
+        wordlist = macronizer.Wordlist()
+        wordlist.loadwords({"rosa", "est", "puella", "xyzzy"})
+        assert wordlist.cachestats()["wordforms"]["size"] == 2
+
+        assert sorted(wordlist.accenteds("rosa")) == ["rosa", "rosa_"]
+        assert wordlist.lemmas("est") == ["sum"]
+        assert wordlist.taglemmaaccents("puella") == [("n-s---fn-", "puella", "puella")]
+        assert wordlist.isunknown("xyzzy")
+        assert not wordlist.isunknown("rosa")
+
+        stats = wordlist.cachestats()["wordforms"]
+        assert stats["size"] <= stats["maxsize"]
+        assert stats["misses"] > 0
+        print("✅ Bulk load and LRU eviction:", stats)
+    finally:
+        macronizer.DB_NAME, macronizer.WORDFORM_CACHE_SIZE, macronizer.DB_IN_CHUNK = saved
+        os.remove(path)
+
+
+def test_ranked_accents():
+    """The accented form whose tag matches best comes first, and repeated lookups are cached"""
+    path = make_database()
+    saved = macronizer.DB_NAME
+    macronizer.DB_NAME = path
+    try:
+        wordlist = macronizer.Wordlist()
+        wordlist.loadwords({"rosa"})
+        assert wordlist.rankedaccents("rosa", "n-s---fb-", "rosa", False) == ("rosa_", "rosa")
+        assert wordlist.rankedaccents("rosa", "n-s---fn-", "rosa", False) == ("rosa", "rosa_")
+        # Every lemma is lowercase, so a capitalized token still keeps all forms
+        assert wordlist.rankedaccents("rosa", "n-s---fn-", "rosa", True) == ("rosa", "rosa_")
+        wordlist.rankedaccents("rosa", "n-s---fn-", "rosa", False)
+        assert wordlist.cachestats()["rankings"]["hits"] == 1
+        print("✅ Ranked accents:", wordlist.cachestats()["rankings"])
+    finally:
+        macronizer.DB_NAME = saved
+        os.remove(path)
+
+
+def test_addlemmas_skips_non_words():
+    """Punctuation and spaces are never looked up in the word list (each miss would query the database)"""
+
+    class RecordingWordlist:
+        def __init__(self):
+            self.looked_up = []
+
+        def lemmas(self, wordform):
+            self.looked_up.append(wordform)
+            return []
+
+    tokenization = macronizer.Tokenization("Rosa, est puella.")
+    wordlist = RecordingWordlist()
+    tokenization.addlemmas(wordlist)
+    assert all(wordform.isalpha() for wordform in wordlist.looked_up), wordlist.looked_up
+    assert [token.lemma for token in tokenization.tokens if token.isword] == ["-", "sum", "puella"]
+    print("✅ addlemmas looked up only words:", wordlist.looked_up)
+
+
+if __name__ == "__main__":
+    test_bulk_load_and_eviction()
+    test_ranked_accents()
+    test_addlemmas_skips_non_words()
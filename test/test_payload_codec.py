@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for the cache payload codec
+Compact BLOBs and legacy JSON text must both decode, through EnhancedDictionary as well.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.db.payload_codec import PayloadCodec, get_payload_codec  # noqa: E402
+from backend.app.db.sqlite_pool import get_pool  # noqa: E402
+from backend.app.services.enhanced_dictionary import EnhancedDictionary  # noqa: E402
+
+ANALYSIS = {
+    "word_analysis": [{"word": "principio", "source_word": "principio", "target_indices": [1, 2], "confidence": 0.8}] * 20,
+    "translations": {"en": "In the beginning"},
+    "theological_layer": ["creation ex nihilo"],
+    "symbolic_layer": [],
+    "cosmological_layer": ["ordering of chaos"]
+}
+
+
+def temp_db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    return path
+
+
+def test_roundtrip():
+    """Compact payloads are smaller and decode to the same value; JSON text still decodes"""
+    path = temp_db()
+    try:
+        codec = PayloadCodec(get_pool(path), compact=True)
+        blob = codec.encode(ANALYSIS["word_analysis"])
+        text = codec.encode(ANALYSIS["word_analysis"], compact=False)
+        assert isinstance(blob, bytes) and codec.is_compact(blob) and len(blob) < len(text)
+        assert codec.decode(blob) == codec.decode(text) == ANALYSIS["word_analysis"]
+        assert codec.decode(memoryview(codec.encode({"a": 1}))) == {"a": 1}
+        assert codec.decode(None, []) == [] and codec.decode("", {}) == {}
+        print(f"✅ Codec round-trip: {len(text)} bytes of JSON -> {len(blob)} bytes ({codec.stats()})")
+    finally:
+        os.remove(path)
+
+
+def test_mixed_rows_through_dictionary():
+    """A verse analysis written compact reads back like one written as JSON"""
+    path = temp_db()
+    try:
+        dictionary = EnhancedDictionary(database_path=path)
+        codec = get_payload_codec(path)
+        dictionary.save_verse_analysis_to_cache("Gn 1:1", "In principio", ANALYSIS, "en")
+        codec.compact = True
+        try:
+            dictionary.save_verse_analysis_to_cache("Gn 1:2", "Terra autem", ANALYSIS, "en")
+        finally:
+            codec.compact = False
+        stored = dictionary.db.fetchall("SELECT word_analysis_json FROM verse_analysis_cache ORDER BY verse_reference")
+        assert isinstance(stored[0][0], str) and codec.is_compact(stored[1][0])
+        for reference in ("Gn 1:1", "Gn 1:2"):
+            cached = dictionary.get_verse_analysis_from_cache(reference, "en")
+            assert cached["word_analysis"] == ANALYSIS["word_analysis"]
+            assert cached["cosmological_layer"] == ANALYSIS["cosmological_layer"]
+        dictionary.close()
+        print("✅ JSON and compact rows read back identically")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    test_roundtrip()
+    test_mixed_rows_through_dictionary()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for the OpenAI token-bucket rate limiter
+Checks the request and token budgets, priority order and that waiting leaves the event loop free.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services.rate_limiter import TokenBucketRateLimiter, openai_priority  # noqa: E402
+
+
+def test_priority_order():
+    """Once the burst is spent, interactive waiters are served before batch ones"""
+    async def run():
+        limiter = TokenBucketRateLimiter(requests_per_minute=600, tokens_per_minute=10**6, burst_seconds=0.1)
+        await limiter.acquire()  # spend the burst
+        order = []
+
+        async def worker(name, priority):
+            await limiter.acquire(priority=priority)
+            order.append(name)
+
+        tasks = [asyncio.create_task(worker(f"batch{i}", "batch")) for i in range(3)]
+        await asyncio.sleep(0)
+        with openai_priority("interactive"):
+            tasks.append(asyncio.create_task(worker("interactive", None)))
+        await asyncio.sleep(0)
+        assert limiter.stats()["queue_depth_by_priority"] == {"interactive": 1, "analysis": 0, "batch": 3}
+        await asyncio.gather(*tasks)
+        return order
+
+    order = asyncio.run(run())
+    assert order[0] == "interactive", order
+    print("✅ Priority order:", order)
+
+
+def test_does_not_block_loop():
+    """The event loop keeps ticking while a caller waits for tokens"""
+    async def run():
+        limiter = TokenBucketRateLimiter(requests_per_minute=6000, tokens_per_minute=6000, burst_seconds=1)
+        await limiter.acquire(tokens=100)  # bucket now empty
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        tick_task = asyncio.create_task(ticker())
+        start = time.monotonic()
+        await limiter.acquire(tokens=30)  # 30 tokens at 100/s is ~0.3s
+        waited = time.monotonic() - start
+        tick_task.cancel()
+        return waited, ticks
+
+    waited, ticks = asyncio.run(run())
+    assert 0.2 < waited < 1.0, waited
+    assert ticks >= 10, ticks
+    print(f"✅ Waited {waited:.2f}s for tokens, loop ticked {ticks} times")
+
+
+if __name__ == "__main__":
+    test_priority_order()
+    test_does_not_block_loop()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for single-flight request coalescing
+Concurrent identical requests should share one upstream call.
+"""
+
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services.single_flight import SingleFlight  # noqa: E402
+
+
+def slow_translation(verse, calls):
+    calls.append(verse)
+    time.sleep(0.2)
+    return f"translated {verse}"
+
+
+def test_threads_share_one_call():
+    """Eight threads asking for the same verse trigger a single call"""
+    flight = SingleFlight()
+    calls = []
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: flight.do(("Gn 1:1", "en"), slow_translation, "Gn 1:1", calls), range(8)))
+    assert results == ["translated Gn 1:1"] * 8
+    assert calls == ["Gn 1:1"]
+    stats = flight.stats()
+    assert stats["upstream_calls"] == 1 and stats["coalesced"] == 7 and stats["in_flight"] == 0
+    print("✅ Threads coalesced:", stats)
+
+
+def test_coroutines_and_errors():
+    """Coroutines coalesce too, different keys do not, and followers see the leader's error"""
+    flight = SingleFlight()
+    calls = []
+
+    def failing():
+        time.sleep(0.1)
+        raise ValueError("quota exceeded")
+
+    async def run():
+        results = await asyncio.gather(
+            flight.ado("Jn 1:1", slow_translation, "Jn 1:1", calls),
+            flight.ado("Jn 1:1", slow_translation, "Jn 1:1", calls),
+            flight.ado("Jn 1:2", slow_translation, "Jn 1:2", calls),
+        )
+        errors = await asyncio.gather(flight.ado("bad", failing), flight.ado("bad", failing), return_exceptions=True)
+        return results, errors
+
+    results, errors = asyncio.run(run())
+    assert results == ["translated Jn 1:1", "translated Jn 1:1", "translated Jn 1:2"]
+    assert sorted(calls) == ["Jn 1:1", "Jn 1:2"]
+    assert all(isinstance(error, ValueError) for error in errors)
+    print("✅ Coroutines coalesced:", flight.stats())
+
+
+if __name__ == "__main__":
+    test_threads_share_one_call()
+    test_coroutines_and_errors()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for the normalized verse translation/alignment tables
+Round-trips the /dictionary/translate payload and the frontend alignment layout, and reads each
+layout back after the other one was written.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services.enhanced_dictionary import EnhancedDictionary  # noqa: E402
+from backend.app.services.verse_cache_store import get_verse_cache_store  # noqa: E402
+
+PAYLOAD = {
+    "translation": "In the beginning God created heaven and earth",
+    "literal": "In beginning created God heaven and earth",
+    "dynamic": "In the beginning God created the heavens and the earth",
+    "source_language": "latin",
+    "analysis": {"word_analysis": {"principio": {"lemma": "principium"}}},
+    "word_alignments": {
+        "literal": [{"source_word": "In", "source_index": 0, "target_words": ["In"], "target_indices": [0], "confidence": 0.9},
+                    {"source_word": "principio", "source_index": 1, "target_words": ["beginning"], "target_indices": [1], "confidence": 0.8}],
+        "dynamic": [{"source_word": "principio", "source_index": 1, "target_words": ["the", "beginning"], "target_indices": [1, 2], "confidence": 0.7}],
+        "method": "simalign",
+        "literal_confidence": 0.75,
+        "dynamic_confidence": 0.5,
+        "average_confidence": 0.625
+    }
+}
+
+# format_alignment_response output for SimAlign: one entry per source word, unaligned ones included
+SIMALIGN_PAYLOAD = {
+    "translation": "God created light",
+    "literal": "God created light",
+    "dynamic": "And God made the light",
+    "source_language": "latin",
+    "word_alignments": {
+        "literal": [{"source_word": "Et", "source_index": 0, "target_words": [], "target_indices": [], "confidence": 0.0},
+                    {"source_word": "fecit", "source_index": 1, "target_words": ["created"], "target_indices": [1], "confidence": 0.9},
+                    {"source_word": "lucem", "source_index": 2, "target_words": ["light"], "target_indices": [2], "confidence": 0.9}],
+        "dynamic": [{"source_word": "Et", "source_index": 0, "target_words": ["And"], "target_indices": [0], "confidence": 0.8},
+                    {"source_word": "fecit", "source_index": 1, "target_words": ["made"], "target_indices": [2], "confidence": 0.7},
+                    {"source_word": "lucem", "source_index": 2, "target_words": [], "target_indices": [], "confidence": 0.0}],
+        "method": "simalign",
+        "literal_confidence": 0.6,
+        "dynamic_confidence": 0.5,
+        "average_confidence": 0.55
+    }
+}
+
+
+def frontend_layout(word_alignments):
+    """What format_alignment_for_frontend builds from the same alignments"""
+    layout = {kind: [{key: alignment[key] for key in ("target_words", "target_indices", "confidence")}
+                     for alignment in word_alignments[kind]] for kind in ("literal", "dynamic")}
+    layout.update({key: word_alignments[key] for key in ("method", "literal_confidence", "dynamic_confidence")})
+    layout["average_confidence"] = (layout["literal_confidence"] + layout["dynamic_confidence"]) / 2
+    return layout
+
+
+def temp_db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    return path
+
+
+def test_translation_payload_roundtrip():
+    """EnhancedDictionary stores the payload in the verse tables and rebuilds it unchanged"""
+    path = temp_db()
+    try:
+        dictionary = EnhancedDictionary(database_path=path)
+        dictionary.save_translation_to_cache("Gn 1:1_en", PAYLOAD)
+        assert dictionary.get_translation_from_cache("Gn 1:1_en") == PAYLOAD
+
+        # Only the non-normalized fields stay in translation_cache
+        stored = dictionary.db.fetchone("SELECT translation_data FROM translation_cache WHERE cache_key = ?",
+                                        ("Gn 1:1_en",))[0]
+        assert "literal" not in stored and "principium" in stored
+
+        store = get_verse_cache_store(path)
+        assert store.get_translations("Gn 1:1", "en", ("dynamic",)) == {"dynamic": PAYLOAD["dynamic"], "source_language": "latin"}
+        assert list(store.get_alignments("Gn 1:1", "en", ("literal",))) == ["literal"]
+        dictionary.close()
+        print("✅ Translation payload round-trips through the normalized tables")
+    finally:
+        os.remove(path)
+
+
+def test_frontend_alignments_roundtrip():
+    """Position-indexed frontend alignments survive storage, including unaligned positions"""
+    path = temp_db()
+    try:
+        store = get_verse_cache_store(path)
+        frontend = {
+            "literal": [{"target_words": ["In"], "target_indices": [0], "confidence": 0.9},
+                        {"target_words": [], "target_indices": [], "confidence": 0.0},
+                        {"target_words": ["God"], "target_indices": [3], "confidence": 0.6}],
+            "dynamic": [{"target_words": [], "target_indices": [], "confidence": 0.0}],
+            "literal_confidence": 0.75,
+            "dynamic_confidence": 0.0,
+            "average_confidence": 0.375,
+            "method": "fallback"
+        }
+        store.save_frontend_alignments("Gn 1:1", "es", frontend)
+        assert store.get_frontend_alignments("Gn 1:1", "es") == frontend
+        assert store.get_frontend_alignments("Gn 1:2", "es") is None
+        print("✅ Frontend alignments round-trip")
+    finally:
+        os.remove(path)
+
+
+def test_unaligned_words_roundtrip():
+    """Source words SimAlign left unaligned are stored and come back with their word and confidence"""
+    path = temp_db()
+    try:
+        dictionary = EnhancedDictionary(database_path=path)
+        dictionary.save_translation_to_cache("Gn 1:3_en", SIMALIGN_PAYLOAD)
+        assert dictionary.get_translation_from_cache("Gn 1:3_en") == SIMALIGN_PAYLOAD
+        dictionary.close()
+        print("✅ Unaligned source words round-trip")
+    finally:
+        os.remove(path)
+
+
+def test_layouts_read_each_other():
+    """The /dictionary/translate and the frontend layout share rows: each reads what the other wrote"""
+    path = temp_db()
+    try:
+        dictionary = EnhancedDictionary(database_path=path)
+        store = get_verse_cache_store(path)
+        frontend = frontend_layout(SIMALIGN_PAYLOAD["word_alignments"])
+
+        # API layout written, frontend layout read: full-length arrays, same confidences
+        dictionary.save_translation_to_cache("Gn 1:3_en", SIMALIGN_PAYLOAD)
+        assert store.get_frontend_alignments("Gn 1:3", "en") == frontend
+
+        # Frontend layout written over it, API layout read: source words are kept
+        store.save_frontend_alignments("Gn 1:3", "en", frontend)
+        assert dictionary.get_translation_from_cache("Gn 1:3_en") == SIMALIGN_PAYLOAD
+
+        # Only literal alignments cached: the average is the literal confidence, the arrays span the verse
+        literal_only = dict(SIMALIGN_PAYLOAD, word_alignments=dict(SIMALIGN_PAYLOAD["word_alignments"], dynamic=[]))
+        dictionary.save_translation_to_cache("Gn 1:4_en", literal_only)
+        layout = store.get_frontend_alignments("Gn 1:4", "en")
+        assert len(layout["literal"]) == len(layout["dynamic"]) == 3
+        assert layout["average_confidence"] == 0.6
+        dictionary.close()
+        print("✅ Both alignment layouts read each other's rows")
+    finally:
+        os.remove(path)
+
+
+def test_cache_keys():
+    """translation_cache keys match the verse tables' (verse_reference, language); old keys still parse"""
+    key = EnhancedDictionary.translation_cache_key("Gn 1:1", "en")
+    assert key == "Gn 1:1_en"
+    assert EnhancedDictionary.split_translation_cache_key(key) == ("Gn 1:1", "en")
+    assert EnhancedDictionary.split_translation_cache_key("Gn 1:1_latin_en") == ("Gn 1:1", "en")
+    print("✅ Translation cache keys")
+
+
+if __name__ == "__main__":
+    test_translation_payload_roundtrip()
+    test_frontend_alignments_roundtrip()
+    test_unaligned_words_roundtrip()
+    test_layouts_read_each_other()
+    test_cache_keys()
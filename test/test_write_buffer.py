@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test script for the write-behind buffer
+Checks that a failed flush keeps its rows for a retry and drops them only after max_retries.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.db.sqlite_pool import get_pool  # noqa: E402
+from backend.app.db.write_buffer import WriteBehindBuffer  # noqa: E402
+
+INSERT_SQL = "INSERT OR REPLACE INTO words (word, value) VALUES (?, ?)"
+
+
+def temp_db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    return path
+
+
+def test_failed_flush_is_retried():
+    """Rows of a failed flush stay pending and are written by the next flush; newer rows win"""
+    path = temp_db()
+    try:
+        pool = get_pool(path)
+        buffer = WriteBehindBuffer(pool, max_delay=60, max_retries=2)
+        buffer.add(INSERT_SQL, ("lux", "old"), key="lux")
+        buffer.add(INSERT_SQL, ("deus", "god"), key="deus")
+        assert buffer.flush() == 0  # the table does not exist yet
+        assert buffer.stats()["pending_rows"] == 2 and buffer.stats()["rows_failed"] == 0
+        assert buffer.pending(INSERT_SQL, "lux") == ("lux", "old")
+
+        buffer.add(INSERT_SQL, ("lux", "light"), key="lux")
+        pool.execute("CREATE TABLE words (word TEXT PRIMARY KEY, value TEXT)")
+        assert buffer.flush() == 2
+        assert dict(pool.fetchall("SELECT word, value FROM words")) == {"lux": "light", "deus": "god"}
+        buffer.close()
+        print(f"✅ Failed flush retried: {buffer.stats()}")
+    finally:
+        os.remove(path)
+
+
+def test_rows_dropped_after_max_retries():
+    """After max_retries failed attempts in a row the rows are dropped and counted"""
+    path = temp_db()
+    try:
+        buffer = WriteBehindBuffer(get_pool(path), max_delay=60, max_retries=2)
+        buffer.add(INSERT_SQL, ("lux", "light"))
+        for _ in range(3):
+            assert buffer.flush() == 0
+        stats = buffer.stats()
+        assert stats["pending_rows"] == 0 and stats["rows_failed"] == 1 and stats["flush_retries"] == 2
+        buffer.close()
+        print(f"✅ Rows dropped after retries: {stats}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    test_failed_flush_is_retried()
+    test_rows_dropped_after_max_retries()
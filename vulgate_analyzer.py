@@ -18,6 +18,7 @@ from dataclasses import dataclass
 import openai
 from datetime import datetime
 from enhanced_dictionary import EnhancedDictionary
+from backend.app.services.rate_limiter import chat_completion
 
 @dataclass
 class GrammarItem:
@@ -233,7 +234,8 @@ class VulgateAnalyzer:
             - Particle and conjunction functions
             """
             
-            response = self.openai_client.chat.completions.create(
+            response = chat_completion(
+                self.openai_client,
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are a Latin scholar. Provide detailed, accurate grammatical analysis."},
@@ -324,7 +326,8 @@ class VulgateAnalyzer:
             For the symbolic layer, draw from Jung's archetypal psychology, Campbell's monomyth and comparative mythology, and cross-cultural mythological patterns. Focus on scholarly depth and psychological insight.
             """
             
-            response = self.openai_client.chat.completions.create(
+            response = chat_completion(
+                self.openai_client,
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are a biblical scholar expert in theology, Jungian depth psychology, Joseph Campbell's comparative mythology, archetypal symbolism, the Hero's Journey monomyth, cross-cultural mythological patterns, and ancient history. You excel at identifying archetypal symbols, mythological parallels, and psychological transformation themes in sacred texts."},